@@ -1,7 +1,10 @@
 import os
+import atexit
 from flask import Flask
 from config import config
 from services.scheduler_service import SchedulerService
+from services.json_provider import FastJSONProvider
+from services.compression_service import CompressionService
 from routes.main_routes import main_bp
 from routes.api_routes import api_bp
 
@@ -21,6 +24,9 @@ def create_app(config_name=None):
     # Load configuration
     app.config.from_object(config[config_name])
     
+    # orjson-backed encoding for API responses
+    app.json = FastJSONProvider(app)
+    
     # Ensure required directories exist
     os.makedirs(app.config['DATA_DIR'], exist_ok=True)
     os.makedirs(app.config['LOGS_DIR'], exist_ok=True)
@@ -29,28 +35,27 @@ def create_app(config_name=None):
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     
+    # gzip/brotli responses and fingerprinted, precompressed static files
+    CompressionService(app.config).init_app(app)
+    
     # Initialize scheduler service
     scheduler_service = SchedulerService(app.config)
     
     # Store scheduler service in app context for access in routes
     app.scheduler_service = scheduler_service
     
-    # Initialize scheduler immediately after app creation
-    try:
-        scheduler_service.start()
-        scheduler_service.run_initial_jobs()
-        app.logger.info("Scheduler initialized successfully")
-    except Exception as e:
-        app.logger.error(f"Failed to initialize scheduler: {str(e)}")
-    
-    @app.teardown_appcontext
-    def close_scheduler(exception):
-        """Clean up scheduler on app teardown"""
-        if hasattr(app, 'scheduler_service'):
-            try:
-                app.scheduler_service.stop()
-            except Exception as e:
-                app.logger.error(f"Error stopping scheduler: {str(e)}")
+    # Only the elected leader process runs scheduled jobs. Under gunicorn the
+    # request workers are recycled, so gunicorn.conf.py disables autostart and
+    # runs the scheduler in a dedicated process (scheduler.py).
+    if app.config['SCHEDULER_AUTOSTART']:
+        try:
+            scheduler_service.start_leader_election()
+            app.logger.info("Scheduler leader election started")
+        except Exception as e:
+            app.logger.error(f"Failed to start scheduler leader election: {str(e)}")
+    
+    # Release leadership when the process exits (not after each request)
+    atexit.register(scheduler_service.shutdown)
     
     return app
 
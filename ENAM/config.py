@@ -17,20 +17,72 @@ class Config:
         "host": os.environ.get('DB_HOST', "localhost"),
         "port": os.environ.get('DB_PORT', "5432")
     }
-    
+
+    # Connection Pool Configuration (per worker process)
+    DB_POOL_CONFIG = {
+        'min_connections': int(os.environ.get('DB_POOL_MIN', 1)),
+        'max_connections': int(os.environ.get('DB_POOL_MAX', 5)),
+        'wait_timeout': float(os.environ.get('DB_POOL_WAIT_TIMEOUT', 10)),         # seconds
+        'health_check_interval': int(os.environ.get('DB_POOL_HEALTH_CHECK', 30)),  # seconds idle before ping
+        'max_idle_time': int(os.environ.get('DB_POOL_MAX_IDLE', 300))              # seconds
+    }
+
+    # API Response Cache Configuration (per worker process)
+    API_CACHE_CONFIG = {
+        'max_entries': int(os.environ.get('API_CACHE_MAX_ENTRIES', 64)),
+        'max_body_bytes': int(os.environ.get('API_CACHE_MAX_BODY_BYTES', 2 * 1024 * 1024))  # larger bodies are streamed, not cached
+    }
+
+    # Streaming Response Configuration
+    API_STREAM_CONFIG = {
+        'itersize': int(os.environ.get('API_STREAM_ITERSIZE', 2000))  # rows per server-side cursor fetch
+    }
+
+    # Response Compression Configuration
+    COMPRESSION_CONFIG = {
+        'min_size': int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),            # bytes; smaller bodies are sent as-is
+        'gzip_level': int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+        'brotli_quality': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4)),   # dynamic responses; static files use 11
+        'static_max_age': int(os.environ.get('STATIC_MAX_AGE', 31536000)),        # seconds, for fingerprinted URLs
+        'static_exclude': ['assets/csv']                                          # regenerated by scrapers, never fingerprinted
+    }
+
     # Scheduler Configuration
     SCHEDULER_CONFIG = {
-        'data_refresh_interval': int(os.environ.get('DATA_REFRESH_INTERVAL', 180)),  # minutes
         'news_refresh_interval': int(os.environ.get('NEWS_REFRESH_INTERVAL', 10)),   # minutes
-        'initial_data_refresh_threshold': int(os.environ.get('DATA_THRESHOLD', 180)), # minutes
         'initial_news_refresh_threshold': int(os.environ.get('NEWS_THRESHOLD', 10))   # minutes
     }
     
+    # Exchange trading calendar; scheduled data refreshes run once per trading
+    # day when that session's exchange files are expected (IST), and not at
+    # all on weekends and holidays
+    TRADING_CALENDAR_CONFIG = {
+        'holidays_file': os.environ.get('TRADING_HOLIDAYS_FILE',
+                                        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extras', 'trading_holidays.txt')),
+        'files_ready_at': os.environ.get('DATA_FILES_READY_AT', '18:30')   # HH:MM exchange time
+    }
+    
+    # Scheduler Leader Election (one scheduler across all workers and hosts)
+    LEADER_CONFIG = {
+        'lock_key': int(os.environ.get('SCHEDULER_LOCK_KEY', 73620001)),             # pg advisory lock id
+        'retry_interval': int(os.environ.get('SCHEDULER_LEADER_RETRY', 15)),          # seconds between standby attempts
+        'heartbeat_interval': int(os.environ.get('SCHEDULER_LEADER_HEARTBEAT', 10)),  # seconds
+        'settings_sync_interval': int(os.environ.get('SCHEDULER_SETTINGS_SYNC', 30))  # seconds
+    }
+    SCHEDULER_AUTOSTART = os.environ.get('SCHEDULER_AUTOSTART', '1') == '1'  # gunicorn runs it in scheduler.py instead
+    
+    # Refresh Job Queue
+    JOB_CONFIG = {
+        'poll_interval': int(os.environ.get('JOB_POLL_INTERVAL', 5))  # seconds between leader checks for queued jobs
+    }
+    
     # File Paths
     SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
     DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
     LOGS_DIR = os.path.join(SCRIPT_DIR, 'logs')
     PYTHON_SCRIPTS_DIR = os.path.join(SCRIPT_DIR, 'python')
+    STATIC_DIR = os.path.join(SCRIPT_DIR, 'frontend', 'static')
+    STATIC_CACHE_DIR = os.path.join(DATA_DIR, 'static_cache')
     
     # News Script Configuration
     NEWS_SCRIPTS_WHITELIST = [
@@ -39,12 +91,107 @@ class Config:
         'investing.py', 'money_control.py', 'ndtvprofit.py'
     ]
     
-    # Data Scripts Configuration
-    DATA_SCRIPTS = [
-        'python/mutual_funds.py',
-        'python/corp_actions.py',
-        'python/volume_reports.py'
+    # News scripts that drive Chrome; the rest use plain HTTP requests
+    NEWS_SELENIUM_SCRIPTS = [
+        'business_line.py', 'business_std.py', 'cnbctv_18.py',
+        'econ_times.py', 'ft.py', 'investing.py', 'ndtvprofit.py'
+    ]
+    
+    # Source name each news script writes to news.source
+    NEWS_SOURCES = {
+        'business_line.py': 'Hindu Business Line',
+        'business_std.py': 'Business Standard',
+        'cnbctv_18.py': 'CNBC TV 18',
+        'econ_times.py': 'Economic Times',
+        'fin_exp.py': 'Financial Express',
+        'ft.py': 'Financial Times',
+        'investing.py': 'Investing.com',
+        'money_control.py': 'Money Control',
+        'ndtvprofit.py': 'NDTV Profit'
+    }
+    
+    # Adaptive per-source news polling; intervals are in minutes. Each run's
+    # new-article count feeds an EWMA and the source's interval is scaled
+    # towards target_yield new articles per run
+    NEWS_POLLING_CONFIG = {
+        'tick_minutes': 1,                                               # how often due sources are checked
+        'initial_interval': SCHEDULER_CONFIG['news_refresh_interval'],
+        'min_interval': int(os.environ.get('NEWS_MIN_INTERVAL', 5)),
+        'max_interval': int(os.environ.get('NEWS_MAX_INTERVAL', 240)),
+        'target_yield': float(os.environ.get('NEWS_TARGET_YIELD', 3)),  # new articles per run
+        'ewma_alpha': 0.3,
+        'backoff_limit': 2.0,        # at most double the interval per run
+        'speedup_limit': 0.5,        # at most halve it
+        'min_yield_estimate': 0.1    # avoids dividing by a zero yield
+    }
+    
+    # Concurrent news script limits (per scheduler leader)
+    NEWS_CONCURRENCY = {
+        'max_workers': int(os.environ.get('NEWS_MAX_WORKERS', 6)),
+        'selenium': int(os.environ.get('NEWS_SELENIUM_SLOTS', 3)),   # each holds a Chrome instance
+        'requests': int(os.environ.get('NEWS_REQUESTS_SLOTS', 4))
+    }
+    
+    # Script Runner: 'inprocess' runs scrapers in long-lived preloaded host
+    # processes; 'subprocess' starts a fresh interpreter per script. Preloaded
+    # modules from PYTHON_SCRIPTS_DIR (exchange_sessions) keep their state,
+    # such as exchange cookies, across the runs of a host
+    SCRIPT_RUNNER_CONFIG = {
+        'mode': os.environ.get('SCRIPT_RUNNER_MODE', 'inprocess'),
+        'hosts': int(os.environ.get('SCRIPT_RUNNER_HOSTS', 6)),                   # matches NEWS_CONCURRENCY max_workers
+        'timeout': int(os.environ.get('SCRIPT_TIMEOUT', 1800)),                   # seconds per script
+        'max_jobs_per_host': int(os.environ.get('SCRIPT_HOST_MAX_JOBS', 50)),     # recycle hosts after this many runs
+        'preload': ['pandas', 'bs4', 'lxml', 'requests', 'psycopg2', 'psycopg2.extras',
+                    'selenium.webdriver', 'dateutil.parser', 'exchange_sessions']
+    }
+    
+    # Streamed job logs: script output is buffered in a bounded ring and
+    # written to job_log_lines, which GET /api/jobs/<id>/stream relays as SSE
+    JOB_LOG_CONFIG = {
+        'ring_capacity': int(os.environ.get('JOB_LOG_RING_CAPACITY', 5000)),  # lines held before the oldest are dropped
+        'flush_interval': 1.0,                                                # seconds between writes to the database
+        'retention_days': int(os.environ.get('JOB_LOG_RETENTION_DAYS', 14)),
+        'stream_seconds': 20,        # each SSE response ends before gunicorn's 30s worker timeout
+        'stream_poll_interval': 1.0,
+        'stream_retry_ms': 2000
+    }
+    
+    # Per-script time budgets in seconds, by job step (pipeline stage or
+    # script file name); scripts not listed get SCRIPT_RUNNER_CONFIG['timeout']
+    SCRIPT_TIMEOUTS = {
+        'bulk_block': 900,
+        'company_data': 3600,
+        'mutual_funds': 900,
+        'corp_actions': 300,
+        'volume': 600,
+        'tagging': 1800,
+        'cleaner.py': 300,
+        **{script: 900 for script in NEWS_SCRIPTS_WHITELIST}
+    }
+    
+    # Watchdog run by the scheduler leader
+    WATCHDOG_CONFIG = {
+        'interval': int(os.environ.get('WATCHDOG_INTERVAL', 5)),                    # seconds between cancellation checks
+        'orphan_sweep_interval': int(os.environ.get('WATCHDOG_ORPHAN_SWEEP', 60))   # seconds between orphaned Chrome sweeps
+    }
+    
+    # Data Refresh Pipeline: stages run concurrently once every stage in
+    # 'after' has succeeded; scripts are relative to PYTHON_SCRIPTS_DIR and
+    # 'marks' names the last_updated key set when the stage succeeds.
+    # Each script process has its own exchange throttle, so the NSE stages
+    # are ordered instead of bursting at NSE side by side: company data (quote
+    # API) and the volume reports (bhavcopy archives) follow the deal fetch,
+    # as `scraper.py all` runs them; the two use different NSE hosts
+    DATA_PIPELINE = [
+        {'name': 'bulk_block', 'script': 'scraper.py', 'args': ['bulk_block'], 'resource': 'selenium'},
+        {'name': 'company_data', 'script': 'scraper.py', 'args': ['portfolio'], 'resource': 'selenium',
+         'after': ['bulk_block'], 'marks': 'company'},
+        {'name': 'mutual_funds', 'script': 'mutual_funds.py'},
+        {'name': 'corp_actions', 'script': 'corp_actions.py'},
+        {'name': 'volume', 'script': 'volume_reports.py', 'after': ['bulk_block']},
+        {'name': 'tagging', 'script': 'news/hbl_tag.py', 'resource': 'selenium'}
     ]
+    DATA_PIPELINE_CONCURRENCY = int(os.environ.get('DATA_PIPELINE_MAX_WORKERS', 4))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
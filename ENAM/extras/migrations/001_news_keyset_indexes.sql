@@ -0,0 +1,25 @@
+-- ======================================================
+-- News keyset pagination, filtering and search indexes
+-- ======================================================
+-- /api/news pages with ORDER BY time DESC, id DESC and a (time, id) cursor,
+-- optionally filtered by source, category and a headline substring.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_news_time_id
+    ON news (time DESC, id DESC)
+    WHERE headline IS NOT NULL AND time IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_news_source_time_id
+    ON news (source, time DESC, id DESC)
+    WHERE headline IS NOT NULL AND time IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_news_category_time_id
+    ON news (category, time DESC, id DESC)
+    WHERE headline IS NOT NULL AND time IS NOT NULL;
+
+-- Substring search (headline ILIKE '%term%')
+CREATE INDEX IF NOT EXISTS idx_news_headline_trgm
+    ON news USING gin (headline gin_trgm_ops);
+
+ANALYZE news;
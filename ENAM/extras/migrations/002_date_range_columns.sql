@@ -0,0 +1,70 @@
+-- ======================================================
+-- Real date/timestamp columns for date-range filtering
+-- ======================================================
+-- /api/announcements, /api/insider, /api/bulk_deals and /api/block_deals filter
+-- by date window in SQL, which needs comparable columns instead of TEXT.
+-- Values that do not match a known scraper format cannot be placed in a window
+-- and are converted to NULL (timestamps) or removed (deal dates are part of the
+-- primary key).
+
+BEGIN;
+
+-- announcements.time / insider_trading.time: 'YYYY-MM-DD HH24:MI:SS' as written by
+-- company_data.convert_nse_datetime, or the raw NSE 'DD-Mon-YYYY HH24:MI:SS' text
+-- when that conversion failed.
+ALTER TABLE announcements
+    ALTER COLUMN time TYPE TIMESTAMP
+    USING CASE
+        WHEN time ~ '^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$' THEN time::timestamp
+        WHEN time ~ '^\d{2}-[A-Za-z]{3}-\d{4} \d{2}:\d{2}:\d{2}$' THEN to_timestamp(time, 'DD-Mon-YYYY HH24:MI:SS')::timestamp
+        ELSE NULL
+    END;
+
+ALTER TABLE insider_trading
+    ALTER COLUMN time TYPE TIMESTAMP
+    USING CASE
+        WHEN time ~ '^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$' THEN time::timestamp
+        WHEN time ~ '^\d{2}-[A-Za-z]{3}-\d{4} \d{2}:\d{2}:\d{2}$' THEN to_timestamp(time, 'DD-Mon-YYYY HH24:MI:SS')::timestamp
+        ELSE NULL
+    END;
+
+-- bulk_deals.deal_date / block_deals.deal_date: 'DD/MM/YYYY' from both exchanges.
+DELETE FROM bulk_deals
+WHERE deal_date IS NULL
+   OR (deal_date !~ '^\d{2}/\d{2}/\d{4}$'
+       AND deal_date !~ '^\d{2}-[A-Za-z]{3}-\d{4}$'
+       AND deal_date !~ '^\d{4}-\d{2}-\d{2}$');
+
+ALTER TABLE bulk_deals
+    ALTER COLUMN deal_date TYPE DATE
+    USING CASE
+        WHEN deal_date ~ '^\d{2}/\d{2}/\d{4}$' THEN to_date(deal_date, 'DD/MM/YYYY')
+        WHEN deal_date ~ '^\d{2}-[A-Za-z]{3}-\d{4}$' THEN to_date(deal_date, 'DD-Mon-YYYY')
+        ELSE deal_date::date
+    END;
+
+DELETE FROM block_deals
+WHERE deal_date IS NULL
+   OR (deal_date !~ '^\d{2}/\d{2}/\d{4}$'
+       AND deal_date !~ '^\d{2}-[A-Za-z]{3}-\d{4}$'
+       AND deal_date !~ '^\d{4}-\d{2}-\d{2}$');
+
+ALTER TABLE block_deals
+    ALTER COLUMN deal_date TYPE DATE
+    USING CASE
+        WHEN deal_date ~ '^\d{2}/\d{2}/\d{4}$' THEN to_date(deal_date, 'DD/MM/YYYY')
+        WHEN deal_date ~ '^\d{2}-[A-Za-z]{3}-\d{4}$' THEN to_date(deal_date, 'DD-Mon-YYYY')
+        ELSE deal_date::date
+    END;
+
+CREATE INDEX IF NOT EXISTS idx_announcements_time ON announcements (time DESC);
+CREATE INDEX IF NOT EXISTS idx_insider_trading_time ON insider_trading (time DESC);
+CREATE INDEX IF NOT EXISTS idx_bulk_deals_deal_date ON bulk_deals (deal_date DESC);
+CREATE INDEX IF NOT EXISTS idx_block_deals_deal_date ON block_deals (deal_date DESC);
+
+COMMIT;
+
+ANALYZE announcements;
+ANALYZE insider_trading;
+ANALYZE bulk_deals;
+ANALYZE block_deals;
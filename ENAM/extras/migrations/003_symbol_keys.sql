@@ -0,0 +1,50 @@
+-- ======================================================
+-- Normalized, indexed symbol keys for portfolio joins
+-- ======================================================
+-- Read queries used to join on TRIM(x.col) = TRIM(s.symbol), which no index can
+-- serve. Each table now carries a stored symbol_key = UPPER(TRIM(col)) that
+-- Postgres maintains on every insert/update, so scrapers need no changes and
+-- joins become index lookups. Requires PostgreSQL 12+ (generated columns).
+
+BEGIN;
+
+ALTER TABLE symbols
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(symbol))) STORED;
+ALTER TABLE announcements
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(stock))) STORED;
+ALTER TABLE insider_trading
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(stock))) STORED;
+ALTER TABLE bulk_deals
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(security_name))) STORED;
+ALTER TABLE block_deals
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(security_name))) STORED;
+ALTER TABLE corp_actions
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(security_name))) STORED;
+ALTER TABLE vol_deviation
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(symbol))) STORED;
+ALTER TABLE deliv_deviation
+    ADD COLUMN IF NOT EXISTS symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(symbol))) STORED;
+
+-- Active portfolio members are a small slice of symbols
+CREATE INDEX IF NOT EXISTS idx_symbols_active_symbol_key ON symbols (symbol_key) WHERE status;
+CREATE INDEX IF NOT EXISTS idx_symbols_status ON symbols (status) WHERE status;
+
+-- Date-ordered reads per symbol (see 002_date_range_columns.sql)
+CREATE INDEX IF NOT EXISTS idx_announcements_symbol_key_time ON announcements (symbol_key, time DESC);
+CREATE INDEX IF NOT EXISTS idx_insider_trading_symbol_key_time ON insider_trading (symbol_key, time DESC);
+CREATE INDEX IF NOT EXISTS idx_bulk_deals_symbol_key_deal_date ON bulk_deals (symbol_key, deal_date DESC);
+CREATE INDEX IF NOT EXISTS idx_block_deals_symbol_key_deal_date ON block_deals (symbol_key, deal_date DESC);
+CREATE INDEX IF NOT EXISTS idx_corp_actions_symbol_key ON corp_actions (symbol_key);
+CREATE INDEX IF NOT EXISTS idx_vol_deviation_symbol_key ON vol_deviation (symbol_key);
+CREATE INDEX IF NOT EXISTS idx_deliv_deviation_symbol_key ON deliv_deviation (symbol_key);
+
+COMMIT;
+
+ANALYZE symbols;
+ANALYZE announcements;
+ANALYZE insider_trading;
+ANALYZE bulk_deals;
+ANALYZE block_deals;
+ANALYZE corp_actions;
+ANALYZE vol_deviation;
+ANALYZE deliv_deviation;
@@ -0,0 +1,85 @@
+-- ======================================================
+-- Typed quantities/prices and compact keys for deal tables
+-- ======================================================
+-- bulk_deals / block_deals stored every field as TEXT behind a 7-column TEXT
+-- primary key. Quantities become BIGINT, prices NUMERIC, and rows are identified
+-- by a BIGINT identity plus a 16-byte deal_key (md5 of the normalized deal) that
+-- the scrapers compute for ON CONFLICT deduplication. insider_trading gets typed
+-- amount/value columns. Deal dates and timestamps were converted in
+-- 002_date_range_columns.sql; symbol_key comes from 003_symbol_keys.sql.
+--
+-- The deal_key text must stay identical to bulk_block.deal_key() in Python:
+--   SOURCE|YYYY-MM-DD|SECURITY NAME|CLIENT NAME|DEAL TYPE|quantity|price(2dp)
+
+BEGIN;
+
+CREATE FUNCTION pg_temp.to_numeric_or_null(raw TEXT) RETURNS NUMERIC AS $$
+    SELECT CASE
+        WHEN regexp_replace(raw, '[,\s]', '', 'g') ~ '^-?\d+(\.\d+)?$'
+            THEN regexp_replace(raw, '[,\s]', '', 'g')::numeric
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- bulk_deals
+ALTER TABLE bulk_deals DROP CONSTRAINT IF EXISTS bulk_deals_pkey;
+ALTER TABLE bulk_deals
+    ALTER COLUMN quantity TYPE BIGINT USING round(pg_temp.to_numeric_or_null(quantity))::bigint,
+    ALTER COLUMN price TYPE NUMERIC(14, 2) USING pg_temp.to_numeric_or_null(price),
+    ADD COLUMN id BIGINT GENERATED ALWAYS AS IDENTITY,
+    ADD COLUMN deal_key UUID;
+
+UPDATE bulk_deals SET deal_key = md5(concat_ws('|',
+    coalesce(source, ''),
+    coalesce(to_char(deal_date, 'YYYY-MM-DD'), ''),
+    coalesce(UPPER(TRIM(security_name)), ''),
+    coalesce(UPPER(TRIM(client_name)), ''),
+    coalesce(UPPER(TRIM(deal_type)), ''),
+    coalesce(quantity::text, ''),
+    coalesce(price::text, '')
+))::uuid;
+
+-- Rows that only differed by number formatting are now duplicates
+DELETE FROM bulk_deals a USING bulk_deals b
+WHERE a.deal_key = b.deal_key AND a.id > b.id;
+
+ALTER TABLE bulk_deals
+    ALTER COLUMN deal_key SET NOT NULL,
+    ADD PRIMARY KEY (id),
+    ADD CONSTRAINT unique_bulk_deal UNIQUE (deal_key);
+
+-- block_deals
+ALTER TABLE block_deals DROP CONSTRAINT IF EXISTS block_deals_pkey;
+ALTER TABLE block_deals
+    ALTER COLUMN quantity TYPE BIGINT USING round(pg_temp.to_numeric_or_null(quantity))::bigint,
+    ALTER COLUMN trade_price TYPE NUMERIC(14, 2) USING pg_temp.to_numeric_or_null(trade_price),
+    ADD COLUMN id BIGINT GENERATED ALWAYS AS IDENTITY,
+    ADD COLUMN deal_key UUID;
+
+UPDATE block_deals SET deal_key = md5(concat_ws('|',
+    coalesce(source, ''),
+    coalesce(to_char(deal_date, 'YYYY-MM-DD'), ''),
+    coalesce(UPPER(TRIM(security_name)), ''),
+    coalesce(UPPER(TRIM(client_name)), ''),
+    coalesce(UPPER(TRIM(deal_type)), ''),
+    coalesce(quantity::text, ''),
+    coalesce(trade_price::text, '')
+))::uuid;
+
+DELETE FROM block_deals a USING block_deals b
+WHERE a.deal_key = b.deal_key AND a.id > b.id;
+
+ALTER TABLE block_deals
+    ALTER COLUMN deal_key SET NOT NULL,
+    ADD PRIMARY KEY (id),
+    ADD CONSTRAINT unique_block_deal UNIQUE (deal_key);
+
+-- insider_trading: number of securities and their value
+ALTER TABLE insider_trading
+    ALTER COLUMN amount TYPE BIGINT USING round(pg_temp.to_numeric_or_null(amount))::bigint,
+    ALTER COLUMN value TYPE NUMERIC(20, 2) USING pg_temp.to_numeric_or_null(value);
+
+COMMIT;
+
+ANALYZE bulk_deals;
+ANALYZE block_deals;
+ANALYZE insider_trading;
@@ -0,0 +1,12 @@
+-- ======================================================
+-- Shared scheduler settings for the elected leader
+-- ======================================================
+-- Only one process (the holder of the scheduler advisory lock) runs jobs, so
+-- the data/news enable toggles are stored here where every worker can write
+-- them and the leader picks them up.
+
+CREATE TABLE IF NOT EXISTS scheduler_settings (
+    key VARCHAR(50) PRIMARY KEY,
+    enabled BOOLEAN NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,29 @@
+-- ======================================================
+-- Refresh job queue
+-- ======================================================
+-- /api/refresh-data-sync and /api/refresh-news-sync enqueue a job here and
+-- return its id; the scheduler leader claims and runs queued jobs. The partial
+-- unique index allows one queued/running job per kind, so concurrent refresh
+-- requests join the job already in flight.
+
+CREATE TABLE IF NOT EXISTS refresh_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    requested_by VARCHAR(50),
+    owner TEXT,
+    steps JSONB NOT NULL DEFAULT '{}'::jsonb,
+    logs TEXT[] NOT NULL DEFAULT '{}',
+    error TEXT,
+    requested_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_refresh_jobs_active_kind
+    ON refresh_jobs (kind)
+    WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_refresh_jobs_queued
+    ON refresh_jobs (id)
+    WHERE status = 'queued';
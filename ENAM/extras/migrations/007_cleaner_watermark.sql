@@ -0,0 +1,11 @@
+-- ======================================================
+-- Incremental news cleaner watermark
+-- ======================================================
+-- python/cleaner.py only normalizes news rows with id above last_id and then
+-- advances it, instead of rescanning the whole table on every run.
+
+CREATE TABLE IF NOT EXISTS cleaner_state (
+    name VARCHAR(50) PRIMARY KEY,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,29 @@
+-- ======================================================
+-- Job run history
+-- ======================================================
+-- One row per stage/script of every refresh job, scheduled or manual, so
+-- pipeline latency and slow sources can be tracked over time. rows_inserted
+-- maps table name to rows inserted; bytes_downloaded counts requests bodies
+-- and Selenium page loads. Both are NULL for scripts killed before they exit.
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id BIGSERIAL PRIMARY KEY,
+    job_id BIGINT REFERENCES refresh_jobs(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL,
+    stage VARCHAR(100) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    returncode INTEGER,
+    runner_mode VARCHAR(20),
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duration_seconds NUMERIC(10, 3) NOT NULL,
+    startup_seconds NUMERIC(10, 3),
+    rows_inserted JSONB,
+    bytes_downloaded BIGINT
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_stage_started
+    ON job_runs (stage, started_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_job_id
+    ON job_runs (job_id);
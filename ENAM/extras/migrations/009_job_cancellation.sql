@@ -0,0 +1,9 @@
+-- ======================================================
+-- Refresh job cancellation
+-- ======================================================
+-- POST /api/jobs/<id>/cancel sets cancel_requested. A queued job is cancelled
+-- at once; for a running job the leader's watchdog kills the script in
+-- progress, skips the remaining steps and marks the job 'cancelled'.
+
+ALTER TABLE refresh_jobs
+    ADD COLUMN IF NOT EXISTS cancel_requested BOOLEAN NOT NULL DEFAULT FALSE;
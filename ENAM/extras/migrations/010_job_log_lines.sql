@@ -0,0 +1,17 @@
+-- ======================================================
+-- Streamed job logs
+-- ======================================================
+-- Script output is written here line by line while a refresh job runs, and
+-- GET /api/jobs/<id>/stream relays it over Server-Sent Events, using id as
+-- the event id for Last-Event-ID resumption. Lines of jobs finished more than
+-- JOB_LOG_CONFIG['retention_days'] ago are pruned by the scheduler leader.
+
+CREATE TABLE IF NOT EXISTS job_log_lines (
+    id BIGSERIAL PRIMARY KEY,
+    job_id BIGINT NOT NULL REFERENCES refresh_jobs(id) ON DELETE CASCADE,
+    line TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_log_lines_job_id
+    ON job_log_lines (job_id, id);
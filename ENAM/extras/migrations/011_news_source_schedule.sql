@@ -0,0 +1,20 @@
+-- ======================================================
+-- Adaptive per-source news polling
+-- ======================================================
+-- Each news script has its own polling interval. After every run the
+-- scheduler updates an exponentially weighted average of the new articles
+-- found per run (ewma_yield) and scales the interval towards
+-- NEWS_POLLING_CONFIG['target_yield'] within the configured bounds; scheduled
+-- news jobs only run the scripts whose next_run_at has passed.
+
+CREATE TABLE IF NOT EXISTS news_source_schedule (
+    script VARCHAR(100) PRIMARY KEY,
+    source VARCHAR(100),
+    interval_minutes NUMERIC(8, 2) NOT NULL,
+    ewma_yield NUMERIC(10, 3) NOT NULL DEFAULT 0,
+    last_yield INTEGER,
+    runs INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_run_at TIMESTAMP,
+    next_run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
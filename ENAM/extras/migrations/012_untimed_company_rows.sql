@@ -0,0 +1,29 @@
+-- ======================================================
+-- Remove repeated announcements / insider trades without a time
+-- ======================================================
+-- time is part of unique_announcement (stock, subject, time) and
+-- unique_insider_trade (stock, name, transaction, time). Rows whose NSE time
+-- did not parse were stored with a NULL time, which never conflicts, so the
+-- same row was inserted again on every scrape. The scrapers now skip such
+-- rows; this keeps the oldest copy of each one already stored.
+
+BEGIN;
+
+DELETE FROM announcements a
+USING announcements b
+WHERE a.time IS NULL
+  AND b.time IS NULL
+  AND a.stock IS NOT DISTINCT FROM b.stock
+  AND a.subject IS NOT DISTINCT FROM b.subject
+  AND a.id > b.id;
+
+DELETE FROM insider_trading a
+USING insider_trading b
+WHERE a.time IS NULL
+  AND b.time IS NULL
+  AND a.stock IS NOT DISTINCT FROM b.stock
+  AND a.name IS NOT DISTINCT FROM b.name
+  AND a.transaction IS NOT DISTINCT FROM b.transaction
+  AND a.id > b.id;
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- ======================================================
+-- Refresh job scope
+-- ======================================================
+-- Scheduled news jobs only poll the sources that are due, so a full refresh
+-- requested through the API must not join one. Each job now records its
+-- scope ('all' or 'due'), and the one-active-job index is per kind and scope.
+-- A request joins an active job only if that job's scope covers it.
+
+ALTER TABLE refresh_jobs
+    ADD COLUMN IF NOT EXISTS scope VARCHAR(10) NOT NULL DEFAULT 'all';
+
+UPDATE refresh_jobs SET scope = 'due'
+WHERE kind = 'news' AND requested_by = 'scheduler';
+
+DROP INDEX IF EXISTS idx_refresh_jobs_active_kind;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_refresh_jobs_active_scope
+    ON refresh_jobs (kind, scope)
+    WHERE status IN ('queued', 'running');
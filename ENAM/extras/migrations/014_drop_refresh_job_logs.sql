@@ -0,0 +1,9 @@
+-- ======================================================
+-- Job logs only in job_log_lines
+-- ======================================================
+-- Step summaries were written both to refresh_jobs.logs and to
+-- job_log_lines, so every job's log was stored twice and the array grew with
+-- each appended step. job_log_lines is now the only copy; GET /api/jobs/<id>
+-- returns its most recent lines.
+
+ALTER TABLE refresh_jobs DROP COLUMN IF EXISTS logs;
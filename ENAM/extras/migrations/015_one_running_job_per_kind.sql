@@ -0,0 +1,11 @@
+-- ======================================================
+-- At most one running refresh job per kind
+-- ======================================================
+-- claim_next skips a queued job while another job of its kind is running, but
+-- that check takes no lock: two leaders (or two dispatch passes) claiming at
+-- the same moment could both start a job of the same kind. The index makes
+-- the second claim fail, and claim_next treats the conflict as nothing to claim.
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_refresh_jobs_running_kind
+    ON refresh_jobs (kind)
+    WHERE status = 'running';
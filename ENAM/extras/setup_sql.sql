@@ -12,6 +12,12 @@ DROP TABLE IF EXISTS master;
 DROP TABLE IF EXISTS vol_deviation;
 DROP TABLE IF EXISTS tagging;
 DROP TABLE IF EXISTS last_updated;
+DROP TABLE IF EXISTS scheduler_settings;
+DROP TABLE IF EXISTS job_runs;
+DROP TABLE IF EXISTS job_log_lines;
+DROP TABLE IF EXISTS refresh_jobs;
+DROP TABLE IF EXISTS cleaner_state;
+DROP TABLE IF EXISTS news_source_schedule;
 DROP TABLE IF EXISTS news;
 DROP TABLE IF EXISTS symbols;
 DROP SEQUENCE IF EXISTS symbols_tag_id_seq;
@@ -32,9 +38,13 @@ CREATE TABLE symbols (
     Alias TEXT,
     Status BOOLEAN DEFAULT FALSE,
     last_scraped TIMESTAMP,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(Symbol))) STORED,
     CONSTRAINT unique_symbol UNIQUE (symbol)
 );
 
+CREATE INDEX idx_symbols_active_symbol_key ON symbols (symbol_key) WHERE status;
+CREATE INDEX idx_symbols_status ON symbols (status) WHERE status;
+
 CREATE OR REPLACE FUNCTION set_symbols_tag_id()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -57,36 +67,52 @@ CREATE TABLE announcements (
     Subject TEXT,
     Announcement TEXT,
     Attachment TEXT,
-    Time TEXT,
+    Time TIMESTAMP,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(Stock))) STORED,
     FOREIGN KEY (stock) REFERENCES symbols(symbol),
     CONSTRAINT unique_announcement UNIQUE (stock, subject, time)
 );
 
--- 2️⃣ block_deals (all TEXT)
+CREATE INDEX idx_announcements_time ON announcements (time DESC);
+CREATE INDEX idx_announcements_symbol_key_time ON announcements (symbol_key, time DESC);
+
+-- 2️⃣ block_deals (deal_key = md5 of the normalized deal, see bulk_block.deal_key)
 CREATE TABLE block_deals (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
     Source TEXT,
-    Deal_Date TEXT,
+    Deal_Date DATE,
     Security_Name TEXT,
     Client_Name TEXT,
     Deal_Type TEXT,
-    Quantity TEXT,
-    Trade_Price TEXT,
-    PRIMARY KEY (Source, Deal_Date, Security_Name, Client_Name, Deal_Type, Quantity, Trade_Price)
+    Quantity BIGINT,
+    Trade_Price NUMERIC(14, 2),
+    deal_key UUID NOT NULL,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(Security_Name))) STORED,
+    CONSTRAINT unique_block_deal UNIQUE (deal_key)
 );
 
--- 3️⃣ bulk_deals (all TEXT)
+CREATE INDEX idx_block_deals_deal_date ON block_deals (deal_date DESC);
+CREATE INDEX idx_block_deals_symbol_key_deal_date ON block_deals (symbol_key, deal_date DESC);
+
+-- 3️⃣ bulk_deals (deal_key = md5 of the normalized deal, see bulk_block.deal_key)
 CREATE TABLE bulk_deals (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
     Source TEXT,
-    Deal_Date TEXT,
+    Deal_Date DATE,
     Security_Name TEXT,
     Client_Name TEXT,
     Deal_Type TEXT,
-    Quantity TEXT,
-    Price TEXT,
-    PRIMARY KEY (Source, Deal_Date, Security_Name, Client_Name, Deal_Type, Quantity, Price)
+    Quantity BIGINT,
+    Price NUMERIC(14, 2),
+    deal_key UUID NOT NULL,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(Security_Name))) STORED,
+    CONSTRAINT unique_bulk_deal UNIQUE (deal_key)
 );
 
+CREATE INDEX idx_bulk_deals_deal_date ON bulk_deals (deal_date DESC);
+CREATE INDEX idx_bulk_deals_symbol_key_deal_date ON bulk_deals (symbol_key, deal_date DESC);
+
 -- 4️⃣ corp_actions (as before)
 CREATE TABLE corp_actions (
     Security_Code TEXT,
@@ -101,34 +127,44 @@ CREATE TABLE corp_actions (
     ND_End_Date DATE,
     Actual_Payment_Date DATE,
     BC_End_Date_2 DATE,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(Security_Name))) STORED,
     PRIMARY KEY (Security_Code, Security_Name, Company_Name, Ex_Date, Record_Date, Purpose)
 );
 
+CREATE INDEX idx_corp_actions_symbol_key ON corp_actions (symbol_key);
+
 -- 5️⃣ deliv_deviation (as before)
 CREATE TABLE deliv_deviation (
     SYMBOL TEXT PRIMARY KEY,
     AVG_DELIV_QTY NUMERIC,
     NEW_DELIV_QTY NUMERIC,
-    PCT_DEVIATION NUMERIC
+    PCT_DEVIATION NUMERIC,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(SYMBOL))) STORED
 );
 
--- 6️⃣ insider_trading (all TEXT)
+CREATE INDEX idx_deliv_deviation_symbol_key ON deliv_deviation (symbol_key);
+
+-- 6️⃣ insider_trading
 CREATE TABLE insider_trading (
     id SERIAL PRIMARY KEY,
     Stock VARCHAR(20) NOT NULL,
     Clause TEXT,
     Name TEXT,
     Type TEXT,
-    Amount TEXT,
-    Value TEXT,
+    Amount BIGINT,
+    Value NUMERIC(20, 2),
     Transaction TEXT,
     Attachment TEXT,
-    Time TEXT,
+    Time TIMESTAMP,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(Stock))) STORED,
     FOREIGN KEY (stock) REFERENCES symbols(symbol),
     CONSTRAINT unique_insider_trade UNIQUE (stock, name, transaction, time)
 );
 
+CREATE INDEX idx_insider_trading_time ON insider_trading (time DESC);
+CREATE INDEX idx_insider_trading_symbol_key_time ON insider_trading (symbol_key, time DESC);
+
 -- 7️⃣ master (as before)
 CREATE TABLE master (
     SYMBOL TEXT PRIMARY KEY,
@@ -143,9 +179,12 @@ CREATE TABLE vol_deviation (
     SYMBOL TEXT PRIMARY KEY,
     AVG_TTL_TRD_QNTY NUMERIC,
     NEW_TTL_TRD_QNTY NUMERIC,
-    PCT_DEVIATION NUMERIC
+    PCT_DEVIATION NUMERIC,
+    symbol_key TEXT GENERATED ALWAYS AS (UPPER(TRIM(SYMBOL))) STORED
 );
 
+CREATE INDEX idx_vol_deviation_symbol_key ON vol_deviation (symbol_key);
+
 CREATE TABLE news (
     id SERIAL PRIMARY KEY,
     source TEXT,
@@ -156,6 +195,12 @@ CREATE TABLE news (
     tag_status BOOLEAN NOT NULL DEFAULT FALSE
 );
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_news_time_id ON news (time DESC, id DESC) WHERE headline IS NOT NULL AND time IS NOT NULL;
+CREATE INDEX idx_news_source_time_id ON news (source, time DESC, id DESC) WHERE headline IS NOT NULL AND time IS NOT NULL;
+CREATE INDEX idx_news_category_time_id ON news (category, time DESC, id DESC) WHERE headline IS NOT NULL AND time IS NOT NULL;
+CREATE INDEX idx_news_headline_trgm ON news USING gin (headline gin_trgm_ops);
+
 CREATE TABLE tagging (
     id SERIAL PRIMARY KEY,
     news_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
@@ -170,4 +215,75 @@ CREATE TABLE IF NOT EXISTS last_updated (
 
 INSERT INTO last_updated (key, timestamp) VALUES
 ('data', NOW()),
-('news', NOW());
\ No newline at end of file
+('news', NOW());
+
+CREATE TABLE IF NOT EXISTS scheduler_settings (
+    key VARCHAR(50) PRIMARY KEY,
+    enabled BOOLEAN NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS refresh_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    scope VARCHAR(10) NOT NULL DEFAULT 'all',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    requested_by VARCHAR(50),
+    owner TEXT,
+    steps JSONB NOT NULL DEFAULT '{}'::jsonb,
+    error TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    requested_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE UNIQUE INDEX idx_refresh_jobs_active_scope ON refresh_jobs (kind, scope) WHERE status IN ('queued', 'running');
+CREATE UNIQUE INDEX idx_refresh_jobs_running_kind ON refresh_jobs (kind) WHERE status = 'running';
+CREATE INDEX idx_refresh_jobs_queued ON refresh_jobs (id) WHERE status = 'queued';
+
+CREATE TABLE IF NOT EXISTS cleaner_state (
+    name VARCHAR(50) PRIMARY KEY,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id BIGSERIAL PRIMARY KEY,
+    job_id BIGINT REFERENCES refresh_jobs(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL,
+    stage VARCHAR(100) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    returncode INTEGER,
+    runner_mode VARCHAR(20),
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duration_seconds NUMERIC(10, 3) NOT NULL,
+    startup_seconds NUMERIC(10, 3),
+    rows_inserted JSONB,
+    bytes_downloaded BIGINT
+);
+
+CREATE INDEX idx_job_runs_stage_started ON job_runs (stage, started_at DESC);
+CREATE INDEX idx_job_runs_job_id ON job_runs (job_id);
+
+CREATE TABLE IF NOT EXISTS job_log_lines (
+    id BIGSERIAL PRIMARY KEY,
+    job_id BIGINT NOT NULL REFERENCES refresh_jobs(id) ON DELETE CASCADE,
+    line TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_job_log_lines_job_id ON job_log_lines (job_id, id);
+
+CREATE TABLE IF NOT EXISTS news_source_schedule (
+    script VARCHAR(100) PRIMARY KEY,
+    source VARCHAR(100),
+    interval_minutes NUMERIC(8, 2) NOT NULL,
+    ewma_yield NUMERIC(10, 3) NOT NULL DEFAULT 0,
+    last_yield INTEGER,
+    runs INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_run_at TIMESTAMP,
+    next_run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
\ No newline at end of file
@@ -1,35 +1,24 @@
+import os
+import sys
 import requests
 import zipfile
 from io import BytesIO, StringIO
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python"))
+from exchange_sessions import get_session
+
 def main():
     # Config
     TARGET_DISPLAY_NAME = "CM-UDiFF Common Bhavcopy Final (zip)"
     NSE_API_URL = "https://www.nseindia.com/api/daily-reports"
-    NSE_HOME_URL = "https://www.nseindia.com"
-
-    HEADERS = {
-        'accept': '*/*',
-        'accept-language': 'en-US,en;q=0.9',
-        'referer': 'https://www.nseindia.com/all-reports',
-        'user-agent': (
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-            'AppleWebKit/537.36 (KHTML, like Gecko) '
-            'Chrome/114.0.0.0 Safari/537.36'
-        ),
-        'sec-ch-ua': '"Not.A/Brand";v="8", "Chromium";v="114", "Google Chrome";v="114"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"Windows"',
-    }
-
-    # Session with cookies
-    session = requests.Session()
 
-    try:
-        print("[INFO] Visiting NSE homepage to establish session...")
-        session.get(NSE_HOME_URL, headers=HEADERS, timeout=10)
+    HEADERS = {'referer': 'https://www.nseindia.com/all-reports'}
 
+    # Shared NSE session; it visits the homepage for cookies on first use
+    session = get_session("nse")
+
+    try:
         print("[INFO] Fetching report list JSON...")
         resp = session.get(NSE_API_URL, params={"key": "CM"}, headers=HEADERS, timeout=10)
         resp.raise_for_status()
@@ -9,34 +9,49 @@ document.addEventListener('DOMContentLoaded', () => {
   const paginationBottom = document.getElementById('paginationBottom');
   const scrollTopBtn = document.getElementById('scrollTopBtn');
 
-  let allData = [];
-  let filteredData = [];
+  // cursors[i] is the "before" cursor that fetches page i + 1
+  let cursors = [null];
+  let nextCursor = null;
   let currentPage = 1;
   let pageSize = parseInt(pageSizeSelect.value);
+  let requestSeq = 0;
+  let searchTimer = null;
 
-  fetch('/api/news')
+  fetch('/api/news/filters')
     .then(response => response.json())
-    .then(data => {
-      allData = data
-        .filter(r => r.time && r.headline)
-        .sort((a, b) => new Date(b.time) - new Date(a.time));
-      populateFilters();
-      applyFilters();
-    });
-
-  function populateFilters() {
-    const sources = new Set();
-    const categories = new Set();
+    .then(populateFilters)
+    .catch(err => console.error("[ERROR] Loading news filters:", err));
+
+  loadPage();
+
+  function buildQuery(cursor) {
+    const params = new URLSearchParams({ limit: pageSize });
+    const search = searchInput.value.trim();
+    if (sourceFilter.value) params.set('source', sourceFilter.value);
+    if (categoryFilter.value) params.set('category', categoryFilter.value);
+    if (search) params.set('q', search);
+    if (cursor) params.set('before', cursor);
+    return params.toString();
+  }
 
-    allData.forEach(item => {
-      if (item.source) sources.add(item.source.trim());
-      if (item.category) categories.add(item.category.trim());
-    });
+  function loadPage() {
+    const seq = ++requestSeq;
+    fetch(`/api/news?${buildQuery(cursors[currentPage - 1])}`)
+      .then(response => response.json())
+      .then(data => {
+        // Ignore responses that were overtaken by a newer filter or page change
+        if (seq !== requestSeq) return;
+        nextCursor = data.next_cursor || null;
+        renderTable(data.items || []);
+      })
+      .catch(err => console.error("[ERROR] Loading news:", err));
+  }
 
-    [...sources].sort().forEach(src => {
+  function populateFilters({ sources = [], categories = [] }) {
+    sources.forEach(src => {
       sourceFilter.innerHTML += `<option value="${src}">${src}</option>`;
     });
-    [...categories].sort().forEach(cat => {
+    categories.forEach(cat => {
       categoryFilter.innerHTML += `<option value="${cat}">${cat}</option>`;
     });
   }
@@ -57,16 +72,14 @@ document.addEventListener('DOMContentLoaded', () => {
     return map[category.toLowerCase()] || '#6c757d';
   }
 
-  function renderTable(data) {
+  function renderTable(pageData) {
     tbody.innerHTML = '';
-    if (data.length === 0) {
+    if (pageData.length === 0) {
       tbody.innerHTML = '<tr><td colspan="4" class="text-center">No records found.</td></tr>';
+      renderPaginationControls();
       return;
     }
 
-    const start = (currentPage - 1) * pageSize;
-    const end = start + pageSize;
-    const pageData = data.slice(start, end);
     const now = new Date();
 
     pageData.forEach(item => {
@@ -109,109 +122,67 @@ document.addEventListener('DOMContentLoaded', () => {
       tbody.appendChild(row);
     });
 
-    renderPaginationControls(data.length);
+    renderPaginationControls();
   }
 
-  function renderPaginationControls(totalItems) {
-    const totalPages = Math.ceil(totalItems / pageSize);
-    if (totalPages <= 1) {
+  function renderPaginationControls() {
+    if (currentPage === 1 && !nextCursor) {
       paginationTop.innerHTML = '';
       paginationBottom.innerHTML = '';
       return;
     }
 
-    const controlsHTML = generatePaginationHTML(totalPages);
+    const controlsHTML = generatePaginationHTML();
     paginationTop.innerHTML = controlsHTML;
     paginationBottom.innerHTML = controlsHTML;
 
-    document.querySelectorAll('.page-link').forEach(btn => {
+    document.querySelectorAll('.page-link[data-page]').forEach(btn => {
       btn.addEventListener('click', () => {
         const target = btn.dataset.page;
-        if (target === 'prev' && currentPage > 1) currentPage--;
-        else if (target === 'next' && currentPage < totalPages) currentPage++;
-        else if (!isNaN(target)) currentPage = parseInt(target);
-        renderTable(filteredData);
+        if (target === 'prev' && currentPage > 1) {
+          currentPage--;
+        } else if (target === 'next' && nextCursor) {
+          cursors[currentPage] = nextCursor;
+          currentPage++;
+        } else {
+          return;
+        }
+        loadPage();
         window.scrollTo({ top: 0, behavior: 'smooth' });
       });
     });
   }
 
-  function generatePaginationHTML(totalPages) {
-    let html = `<nav><ul class="pagination justify-content-center mb-0">`;
-
-    html += `<li class="page-item ${currentPage === 1 ? 'disabled' : ''}">
-              <button class="page-link" data-page="prev">&laquo;</button>
-            </li>`;
-
-    const pageButtons = [];
-    if (totalPages <= 7) {
-      for (let i = 1; i <= totalPages; i++) {
-        pageButtons.push(renderPageButton(i));
-      }
-    } else {
-      if (currentPage > 3) {
-        pageButtons.push(renderPageButton(1));
-        if (currentPage > 4) pageButtons.push(renderEllipsis());
-      }
-
-      const start = Math.max(1, currentPage - 2);
-      const end = Math.min(totalPages, currentPage + 2);
-
-      for (let i = start; i <= end; i++) {
-        pageButtons.push(renderPageButton(i));
-      }
-
-      if (currentPage < totalPages - 2) {
-        if (currentPage < totalPages - 3) pageButtons.push(renderEllipsis());
-        pageButtons.push(renderPageButton(totalPages));
-      }
-    }
-
-    html += pageButtons.join('');
-
-    html += `<li class="page-item ${currentPage === totalPages ? 'disabled' : ''}">
-              <button class="page-link" data-page="next">&raquo;</button>
-            </li>`;
-
-    html += `</ul></nav>`;
-    return html;
-  }
-
-  function renderPageButton(i) {
-    return `<li class="page-item ${i === currentPage ? 'active' : ''}">
-              <button class="page-link" data-page="${i}">${i}</button>
-            </li>`;
-  }
-
-  function renderEllipsis() {
-    return `<li class="page-item disabled">
-              <span class="page-link">...</span>
-            </li>`;
+  function generatePaginationHTML() {
+    return `<nav><ul class="pagination justify-content-center mb-0">
+              <li class="page-item ${currentPage === 1 ? 'disabled' : ''}">
+                <button class="page-link" data-page="prev">&laquo;</button>
+              </li>
+              <li class="page-item active">
+                <span class="page-link">${currentPage}</span>
+              </li>
+              <li class="page-item ${nextCursor ? '' : 'disabled'}">
+                <button class="page-link" data-page="next">&raquo;</button>
+              </li>
+            </ul></nav>`;
   }
 
   function applyFilters() {
-    const src = sourceFilter.value.toLowerCase();
-    const cat = categoryFilter.value.toLowerCase();
-    const search = searchInput.value.toLowerCase();
-
-    filteredData = allData.filter(item => {
-      const srcMatch = !src || item.source.toLowerCase() === src;
-      const catMatch = !cat || item.category.toLowerCase() === cat;
-      const searchMatch = !search || item.headline.toLowerCase().includes(search);
-      return srcMatch && catMatch && searchMatch;
-    });
-
+    cursors = [null];
+    nextCursor = null;
     currentPage = 1;
-    renderTable(filteredData);
+    loadPage();
   }
 
   sourceFilter.addEventListener('change', applyFilters);
   categoryFilter.addEventListener('change', applyFilters);
-  searchInput.addEventListener('input', applyFilters);
+  searchInput.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(applyFilters, 300);
+  });
   pageSizeSelect.addEventListener('change', () => {
     pageSize = parseInt(pageSizeSelect.value);
-    currentPage = 1;
-    renderTable(filteredData);
+    applyFilters();
   });
 
   resetBtn.addEventListener('click', () => {
@@ -220,7 +191,6 @@ document.addEventListener('DOMContentLoaded', () => {
     searchInput.value = '';
     pageSizeSelect.value = '50';
     pageSize = 50;
-    currentPage = 1;
     applyFilters();
   });
 
@@ -29,14 +29,45 @@ function loadLastUpdated() {
     .catch(err => console.error("[ERROR] Fetching last updated:", err));
 }
 
+// Poll a refresh job until it finishes; onProgress gets every intermediate snapshot
+function pollJob(jobId, onDone, onProgress, intervalMs = 3000) {
+  fetch(`/api/jobs/${jobId}`)
+    .then(res => res.json())
+    .then(job => {
+      if (job.error && !job.status) throw new Error(job.error);
+      if (['succeeded', 'failed', 'cancelled'].includes(job.status)) {
+        onDone(job);
+        return;
+      }
+      if (onProgress) onProgress(job);
+      setTimeout(() => pollJob(jobId, onDone, onProgress, intervalMs), intervalMs);
+    })
+    .catch(err => console.error(`[ERROR] Polling job ${jobId}:`, err));
+}
+
+// Follow a job's log lines live; the browser reconnects after each short
+// response and resumes from the last line it received
+function streamJobLogs(jobId, onLine = line => console.log(line)) {
+  const source = new EventSource(`/api/jobs/${jobId}/stream`);
+  source.onmessage = event => onLine(event.data);
+  source.addEventListener('done', () => source.close());
+  return source;
+}
+
 $(document).on("click", "#refreshBtn", function () {
   if (confirm("Run data refresh? This will fetch new data from sources.")) {
     fetch('/api/refresh-data-sync', { method: 'POST' })
       .then(res => res.json())
       .then(data => {
         alert(data.message);
-        const raw = data.last_updated || '';
-        $("#lastUpdated").text(timeAgo(raw));
+        $("#lastUpdated").text("Refreshing...");
+        streamJobLogs(data.job_id);
+        pollJob(data.job_id, job => {
+          console.log(`[INFO] Data refresh job ${job.id} ${job.status}:`, job.steps);
+          loadLastUpdated();
+        }, job => {
+          $("#lastUpdated").text(`Refreshing (${job.progress.done}/${job.progress.total})...`);
+        });
       })
       .catch(err => alert("Error triggering refresh: " + err));
   }
@@ -68,28 +99,10 @@ function loadDealsTable({ id, apiEndpoint, dateField, type }) {
     ]
   };
 
-  const parseDate = (str) => {
-    if (!str) return null;
-    if (str.includes("/")) {
-      const [d, m, y] = str.split("/");
-      return new Date(`${y}-${m}-${d}`);
-    }
-    return new Date(str);
-  };
-
   function filterData() {
-    const now = new Date();
-    let cutoff = new Date();
-    if (currentRange === "1day") cutoff.setDate(now.getDate() - 2);
-    else if (currentRange === "1week") cutoff.setDate(now.getDate() - 8);
-    else if (currentRange === "1month") cutoff.setMonth(now.getMonth() - 1);
-
-    return data.filter(row => {
-      const date = parseDate(row[dateField]);
-      const dateValid = currentRange === "all_time" || (date && date >= cutoff);
-      const exchangeValid = !selectedExchange || selectedExchange === "BOTH" || row["source"] === selectedExchange;
-      return dateValid && exchangeValid;
-    });
+    return data.filter(row =>
+      !selectedExchange || selectedExchange === "BOTH" || row["source"] === selectedExchange
+    );
   }
 
   function renderTable(data) {
@@ -136,7 +149,7 @@ function loadDealsTable({ id, apiEndpoint, dateField, type }) {
     dateButtons.find("button").removeClass("active");
     $(this).addClass("active");
     currentRange = $(this).data("range");
-    updateFiltered();
+    loadData();
   });
   $(id).before(dateButtons);
 
@@ -145,16 +158,25 @@ function loadDealsTable({ id, apiEndpoint, dateField, type }) {
     renderTable(filtered);
   }
 
-  fetch(apiEndpoint)
-    .then(res => res.json())
-    .then(json => {
-      if (!Array.isArray(json)) throw new Error("Invalid data format");
-      data = json.filter(row =>
-        Object.values(row).some(cell => (cell || "").toString().trim() !== "")
-      );
-      updateFiltered();
-    })
-    .catch(err => console.error("[ERROR] Loading deals:", err));
+  let requestSeq = 0;
+
+  function loadData() {
+    // The server filters rows to the selected date window
+    const seq = ++requestSeq;
+    fetch(`${apiEndpoint}?range=${encodeURIComponent(currentRange)}`)
+      .then(res => res.json())
+      .then(json => {
+        if (seq !== requestSeq) return;
+        if (!Array.isArray(json)) throw new Error("Invalid data format");
+        data = json.filter(row =>
+          Object.values(row).some(cell => (cell || "").toString().trim() !== "")
+        );
+        updateFiltered();
+      })
+      .catch(err => console.error("[ERROR] Loading deals:", err));
+  }
+
+  loadData();
 }
 
 document.addEventListener('DOMContentLoaded', () => {
@@ -2,40 +2,6 @@
 function loadTable(config) {
   const { id, controlsId, apiEndpoint, dateField, columnMap, nowrapColumns = [] } = config;
 
-  function parseDate(str) {
-    if (!str) return null;
-    try {
-      return new Date(
-        str.replace(/(\d{2})-([A-Za-z]{3})-(\d{4})/, (_, d, m, y) => {
-          const months = {
-            Jan: "01", Feb: "02", Mar: "03", Apr: "04", May: "05", Jun: "06",
-            Jul: "07", Aug: "08", Sep: "09", Oct: "10", Nov: "11", Dec: "12"
-          };
-          return `${y}-${months[m]}-${d}`;
-        })
-      );
-    } catch {
-      return null;
-    }
-  }
-
-  function filterData(data, range) {
-    const now = new Date();
-    const cutoff = new Date();
-
-    if (range === "1day") cutoff.setDate(now.getDate() - 1);
-    else if (range === "1week") cutoff.setDate(now.getDate() - 7);
-    else if (range === "1month") cutoff.setMonth(now.getMonth() - 1);
-
-    return data.filter((row) => {
-      if (range === "all_time") return true;
-
-      const date = parseDate(row[dateField]);
-      if (!(date instanceof Date) || isNaN(date)) return false;
-      return date >= cutoff;
-    });
-  }
-
   function renderDateButtons(onChange) {
     const btnGroup = $(
       `<div class="date-button-group mb-3 text-center">
@@ -56,15 +22,16 @@ function loadTable(config) {
     return btnGroup;
   }
 
-  async function fetchData() {
+  async function fetchData(range) {
     try {
-      const response = await fetch(apiEndpoint);
+      // Columnar payload: { columns: [...], rows: [[...], ...] }
+      const response = await fetch(`${apiEndpoint}?range=${encodeURIComponent(range)}&format=columns`);
       const data = await response.json();
-      console.log(`[INFO] Loaded data from ${apiEndpoint}:`, data);
+      console.log(`[INFO] Loaded ${data.rows.length} rows from ${apiEndpoint}`);
       return data;
     } catch (err) {
       console.error("[ERROR] Failed to fetch data:", err);
-      return [];
+      return { columns: [], rows: [] };
     }
   }
 
@@ -79,57 +46,38 @@ function loadTable(config) {
   }
 
   async function init() {
-    const originalData = await fetchData();
-
     let currentRange = "all_time";
+    let requestSeq = 0;
     $(controlsId).append(renderDateButtons((range) => {
       currentRange = range;
       update();
     }));
 
-    function update() {
-      const filtered = filterData(originalData, currentRange);
-
-      let displayData;
-      let columns;
-
-      if (columnMap && Object.keys(columnMap).length > 0) {
-        displayData = filtered.map(row => {
-          const newRow = {};
-          Object.keys(columnMap).forEach(key => {
-            newRow[columnMap[key]] = row[key];
-          });
-          return newRow;
-        });
-
-        columns = Object.values(columnMap).map(col => {
-          if (col === "Attachment") {
-            return {
-              title: col,
-              data: col,
-              className: "text-center",
-              render: renderAttachment
-            };
-          }
-          const cellClass = `text-center ${nowrapColumns.includes(col) ? 'nowrap-cell' : 'wrap-cell'}`;
-          return { title: col, data: col, className: cellClass };
-        });
-      } else {
-        displayData = [...filtered];
-        const csvHeaders = Object.keys(originalData[0]);
-        columns = csvHeaders.map(col => {
-          if (col === "Attachment") {
-            return {
-              title: col,
-              data: col,
-              className: "text-center",
-              render: renderAttachment
-            };
-          }
-          const cellClass = `text-center ${nowrapColumns.includes(col) ? 'nowrap-cell' : 'wrap-cell'}`;
-          return { title: col, data: col, className: cellClass };
-        });
-      }
+    async function update() {
+      // The server filters rows to the selected window
+      const seq = ++requestSeq;
+      const filtered = await fetchData(currentRange);
+      if (seq !== requestSeq) return;
+
+      // Rows stay as arrays in display order; DataTables reads cells by index
+      const hasColumnMap = columnMap && Object.keys(columnMap).length > 0;
+      const keys = hasColumnMap ? Object.keys(columnMap) : filtered.columns;
+      const titles = hasColumnMap ? keys.map(key => columnMap[key]) : keys;
+      const positions = keys.map(key => filtered.columns.indexOf(key));
+      const displayData = filtered.rows.map(row => positions.map(i => (i >= 0 ? row[i] : null)));
+
+      const columns = titles.map((col, index) => {
+        if (col === "Attachment") {
+          return {
+            title: col,
+            data: index,
+            className: "text-center",
+            render: renderAttachment
+          };
+        }
+        const cellClass = `text-center ${nowrapColumns.includes(col) ? 'nowrap-cell' : 'wrap-cell'}`;
+        return { title: col, data: index, className: cellClass };
+      });
 
       const timeIndex = columns.findIndex(c => c.title === "Time");
 
@@ -0,0 +1,66 @@
+import os
+import sys
+import subprocess
+import multiprocessing
+
+# Request workers never run the scheduler: they are recycled after max_requests,
+# which would kill the leader's running jobs. The arbiter starts scheduler.py as
+# a separate process instead (see when_ready).
+os.environ['SCHEDULER_AUTOSTART'] = '0'
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+backlog = 2048
+
+# Worker processes
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = 'sync'
+worker_connections = 1000
+timeout = 30
+keepalive = 2
+
+# Restart workers after this many requests, to prevent memory leaks
+max_requests = 1000
+max_requests_jitter = 50
+
+# Logging
+accesslog = 'logs/gunicorn_access.log'
+errorlog = 'logs/gunicorn_error.log'
+loglevel = 'info'
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+
+# Process naming
+proc_name = 'enam_app'
+
+# Server mechanics
+preload_app = True
+daemon = False
+pidfile = '/tmp/gunicorn.pid'
+user = None
+group = None
+tmp_upload_dir = None
+
+# SSL (uncomment if using HTTPS)
+# keyfile = '/path/to/keyfile'
+# certfile = '/path/to/certfile'
+
+# Server hooks
+scheduler_process = None
+
+def when_ready(server):
+    """Start the scheduler in its own process, outside the recycled workers"""
+    global scheduler_process
+    here = os.path.dirname(os.path.abspath(__file__))
+    scheduler_process = subprocess.Popen([sys.executable, os.path.join(here, 'scheduler.py')], cwd=here)
+    server.log.info(f"Started scheduler process {scheduler_process.pid}")
+
+def on_exit(server):
+    """Stop the scheduler process when gunicorn shuts down"""
+    if scheduler_process is None or scheduler_process.poll() is not None:
+        return
+    scheduler_process.terminate()
+    try:
+        scheduler_process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        server.log.warning("Scheduler process did not stop in time; killing it")
+        scheduler_process.kill()
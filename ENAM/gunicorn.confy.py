@@ -1,38 +0,0 @@
-import os
-import multiprocessing
-
-# Server socket
-bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
-backlog = 2048
-
-# Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
-worker_connections = 1000
-timeout = 30
-keepalive = 2
-
-# Restart workers after this many requests, to prevent memory leaks
-max_requests = 1000
-max_requests_jitter = 50
-
-# Logging
-accesslog = 'logs/gunicorn_access.log'
-errorlog = 'logs/gunicorn_error.log'
-loglevel = 'info'
-access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
-
-# Process naming
-proc_name = 'enam_app'
-
-# Server mechanics
-preload_app = True
-daemon = False
-pidfile = '/tmp/gunicorn.pid'
-user = None
-group = None
-tmp_upload_dir = None
-
-# SSL (uncomment if using HTTPS)
-# keyfile = '/path/to/keyfile'
-# certfile = '/path/to/certfile'
\ No newline at end of file
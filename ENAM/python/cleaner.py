@@ -1,5 +1,5 @@
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 from dateutil import parser
 from datetime import datetime, timedelta
 
@@ -10,6 +10,16 @@ DB_PASSWORD = "mathew"
 DB_HOST = "localhost"
 DB_PORT = 5432
 
+# === Incremental cleaning ===
+WATERMARK_NAME = "news"
+BATCH_SIZE = 2000
+RETENTION_DAYS = 14
+# Ids are assigned at insert but rows become visible at commit, so a scraper
+# transaction that commits late can land below the watermark; re-read this
+# many ids under it on every run (cleaning a clean row is a no-op)
+WATERMARK_OVERLAP = 5000
+NORMALIZED_TIME_PATTERN = r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$'
+
 # === Category Logic ===
 ALLOWED_CATEGORIES_PRIORITY = [
     'Stock', 'IPOs', 'Companies', 'Markets', 'Economy',
@@ -95,45 +105,94 @@ def is_recent_enough(time_str, days=14):
         print(f"[Warning] Could not parse time for filtering '{time_str}': {e}")
         return False
 
+def get_watermark(cursor):
+    cursor.execute("SELECT last_id FROM cleaner_state WHERE name = %s", (WATERMARK_NAME,))
+    row = cursor.fetchone()
+    return row['last_id'] if row else 0
+
+def set_watermark(cursor, last_id):
+    cursor.execute("""
+        INSERT INTO cleaner_state (name, last_id, updated_at)
+        VALUES (%s, %s, NOW())
+        ON CONFLICT (name) DO UPDATE SET last_id = EXCLUDED.last_id, updated_at = EXCLUDED.updated_at
+    """, (WATERMARK_NAME, last_id))
+
 def clean_news_table():
+    """Normalize rows inserted since the last run, then drop expired articles
+
+    Only rows with id above the stored watermark, less a small overlap for
+    late commits, are read. Updates and deletes are sent per batch as single
+    statements, and the watermark advances in the same transaction. Retention
+    is one DELETE comparing normalized times as timestamps, not as text.
+    """
     conn = psycopg2.connect(
         dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD,
         host=DB_HOST, port=DB_PORT
     )
     cursor = conn.cursor(cursor_factory=DictCursor)
 
-    cursor.execute("SELECT id, time, category FROM news")
-    rows = cursor.fetchall()
-
+    watermark = get_watermark(cursor)
+    last_id = start_id = max(watermark - WATERMARK_OVERLAP, 0)
     cleaned_count = 0
     deleted_count = 0
 
-    for row in rows:
-        row_id = row['id']
-        raw_time = row['time']
-        raw_cat = row['category']
-
-        cleaned_time = clean_time_string(raw_time)
-        if not cleaned_time or not is_recent_enough(cleaned_time):
-            print(f"[INFO] Deleting old or invalid article: {raw_time}")
-            cursor.execute("DELETE FROM news WHERE id = %s", (row_id,))
-            deleted_count += 1
-            continue
-
-        cleaned_category = clean_category_string(raw_cat)
-
-        if cleaned_time != raw_time or cleaned_category != raw_cat:
-            cursor.execute(
-                "UPDATE news SET time = %s, category = %s WHERE id = %s",
-                (cleaned_time, cleaned_category, row_id)
-            )
-            cleaned_count += 1
-
+    while True:
+        cursor.execute(
+            "SELECT id, time, category FROM news WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, BATCH_SIZE)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        updates = []
+        deletes = []
+        for row in rows:
+            row_id = row['id']
+            raw_time = row['time']
+            raw_cat = row['category']
+
+            cleaned_time = clean_time_string(raw_time)
+            if not cleaned_time or not is_recent_enough(cleaned_time, RETENTION_DAYS):
+                deletes.append(row_id)
+                continue
+
+            cleaned_category = clean_category_string(raw_cat)
+            if cleaned_time != raw_time or cleaned_category != raw_cat:
+                updates.append((row_id, cleaned_time, cleaned_category))
+
+        if updates:
+            execute_values(cursor, """
+                UPDATE news SET time = v.time, category = v.category
+                FROM (VALUES %s) AS v (id, time, category)
+                WHERE news.id = v.id
+            """, updates)
+        if deletes:
+            cursor.execute("DELETE FROM news WHERE id = ANY(%s)", (deletes,))
+
+        last_id = rows[-1]['id']
+        watermark = max(watermark, last_id)
+        set_watermark(cursor, watermark)
+        conn.commit()
+
+        cleaned_count += len(updates)
+        deleted_count += len(deletes)
+
+    # Articles cleaned on earlier runs that have since aged out
+    cutoff = datetime.now() - timedelta(days=RETENTION_DAYS)
+    cursor.execute("""
+        DELETE FROM news
+        WHERE id <= %s
+          AND (CASE WHEN time ~ %s THEN time::timestamp END) < %s
+    """, (watermark, NORMALIZED_TIME_PATTERN, cutoff))
+    expired_count = cursor.rowcount
     conn.commit()
+
     cursor.close()
     conn.close()
 
-    print(f"[DONE] Cleaned: {cleaned_count} rows | Deleted: {deleted_count} rows")
+    print(f"[DONE] Scanned ids {start_id + 1}..{watermark} | Cleaned: {cleaned_count} rows | "
+          f"Deleted: {deleted_count} invalid/old new rows, {expired_count} expired rows")
 
 if __name__ == "__main__":
     clean_news_table()
@@ -1,9 +1,9 @@
-import requests
 import pandas as pd
 import os
 import psycopg2
 import logging
 from datetime import datetime, timedelta
+from exchange_sessions import get_session
 
 # === LOGGING CONFIGURATION ===
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -57,17 +57,8 @@ def download_bse_csv(temp_file):
         "ddlcategorys": "E",
         "segment": "0"
     }
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/138.0.0.0 Safari/537.36"
-        ),
-        "Referer": "https://www.bseindia.com/"
-    }
-
     logging.info("Requesting CSV from BSE...")
-    response = requests.get(url, headers=headers, params=params)
+    response = get_session("bse").get(url, params=params, timeout=60)
     if response.ok:
         with open(temp_file, "wb") as f:
             f.write(response.content)
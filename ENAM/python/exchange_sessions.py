@@ -0,0 +1,132 @@
+import time
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/138.0.0.0 Safari/537.36"
+)
+
+# Per exchange: page visited for cookies (None if the exchange needs none),
+# default headers, and the minimum seconds between requests to each host
+EXCHANGES = {
+    "nse": {
+        "home_url": "https://www.nseindia.com/",
+        "headers": {
+            "accept": "*/*",
+            "accept-language": "en-GB,en;q=0.9",
+            "referer": "https://www.nseindia.com/",
+            "user-agent": USER_AGENT
+        },
+        "host_intervals": {"www.nseindia.com": 0.35, "nsearchives.nseindia.com": 0.2},
+        "default_interval": 0.35
+    },
+    "bse": {
+        "home_url": None,
+        "headers": {
+            "accept": "*/*",
+            "accept-language": "en-GB,en;q=0.9",
+            "referer": "https://www.bseindia.com/",
+            "user-agent": USER_AGENT
+        },
+        "host_intervals": {},
+        "default_interval": 0.2
+    }
+}
+
+
+class ExchangeSession:
+    """One keep-alive requests.Session per exchange, shared by every scraper in the process
+
+    Cookies come from a single home page visit, redone when they are older
+    than cookie_ttl or a request is answered 401/403. Requests to each host
+    are spaced at least the host's interval apart across all threads.
+    """
+
+    def __init__(self, name, home_url, headers, host_intervals, default_interval,
+                 cookie_ttl=1800, pool_maxsize=8):
+        self.name = name
+        self.home_url = home_url
+        self.host_intervals = host_intervals
+        self.default_interval = default_interval
+        self.cookie_ttl = cookie_ttl
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._warm_lock = threading.Lock()
+        self._warmed_at = None
+        self._rate_lock = threading.Lock()
+        self._next_slot = {}
+        self.warmups = 0
+
+    def warm_up(self, force=False):
+        """Visit the home page for cookies unless fresh ones are already held"""
+        if self.home_url is None:
+            return
+        with self._warm_lock:
+            fresh = self._warmed_at is not None and time.time() - self._warmed_at < self.cookie_ttl
+            if fresh and not force:
+                return
+            self._throttle(self.home_url)
+            self.session.get(self.home_url, timeout=10)
+            self._warmed_at = time.time()
+            self.warmups += 1
+
+    def _throttle(self, url):
+        host = urlparse(url).hostname
+        interval = self.host_intervals.get(host, self.default_interval)
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", 15)
+        try:
+            self.warm_up()
+        except requests.RequestException as e:
+            # Not every endpoint needs the cookies; let the request itself decide
+            print(f"[WARNING] {self.name.upper()} cookie warm-up failed: {str(e)[:100]}")
+        self._throttle(url)
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code in (401, 403) and self.home_url is not None:
+            # Cookies expired or were rejected; refresh them and retry once
+            try:
+                self.warm_up(force=True)
+            except requests.RequestException as e:
+                # Nothing to retry with; the caller sees the original rejection
+                print(f"[WARNING] {self.name.upper()} cookie refresh failed: {str(e)[:100]}")
+                return response
+            self._throttle(url)
+            response = self.session.request(method, url, **kwargs)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(exchange):
+    """The process-wide session for "nse" or "bse"
+
+    In script host processes it outlives single script runs, so later runs
+    reuse its cookies and open connections.
+    """
+    with _sessions_lock:
+        if exchange not in _sessions:
+            if exchange not in EXCHANGES:
+                raise ValueError(f"Unknown exchange: {exchange}")
+            _sessions[exchange] = ExchangeSession(exchange, **EXCHANGES[exchange])
+        return _sessions[exchange]
@@ -3,7 +3,7 @@ import psycopg2
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
-import pyahocorasick
+import ahocorasick as pyahocorasick  # installed as pyahocorasick
 
 # ----------------------------------------------------------------------------
 DB_HOST = "localhost"
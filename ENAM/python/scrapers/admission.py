@@ -0,0 +1,86 @@
+import gc
+import time
+import psutil
+from threading import Lock
+from datetime import datetime
+
+
+def log_admission(message):
+    timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
+    print(f"{timestamp} [ADMISSION] {message}")
+
+
+class AdmissionController:
+    """Admits new browser sessions only while CPU and memory have headroom
+
+    A session is admitted at once while no other browser is in use, so a run
+    can always make progress. Otherwise it waits until CPU and memory are
+    below their thresholds, and at least settle_seconds after the previous
+    admission so the last browser's load shows up in the readings before the
+    next one is let in. A session that would wait longer than max_wait
+    seconds is refused.
+    """
+
+    def __init__(self, cpu_threshold=80, mem_threshold=85, poll_interval=5, settle_seconds=3, max_wait=300):
+        self.cpu_threshold = cpu_threshold
+        self.mem_threshold = mem_threshold
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.max_wait = max_wait
+
+        self._lock = Lock()
+        self._last_admitted = 0.0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.refused = 0
+
+    def headroom(self):
+        """(has headroom, cpu %, memory %) right now"""
+        cpu_usage = psutil.cpu_percent(interval=1)
+        mem_usage = psutil.virtual_memory().percent
+        return cpu_usage < self.cpu_threshold and mem_usage < self.mem_threshold, cpu_usage, mem_usage
+
+    def admit(self, running):
+        """Block until a new session may start; running() is how many browsers are in use right now
+
+        Raises RuntimeError if there is still no headroom after max_wait seconds.
+        """
+        if running() == 0:
+            with self._lock:
+                self._last_admitted = time.time()
+            return
+        # One admission at a time, so waiting sessions are let in one by one
+        with self._lock:
+            started = time.time()
+            deadline = started + self.max_wait
+            waited = False
+            settle = self._last_admitted + self.settle_seconds - time.time()
+            if settle > 0:
+                time.sleep(settle)
+            try:
+                while True:
+                    ok, cpu_usage, mem_usage = self.headroom()
+                    if ok:
+                        break
+                    # Sessions finish while this one waits; re-read how many are left
+                    active = running()
+                    if active == 0:
+                        log_admission(f"Admitting session without headroom - CPU: {cpu_usage}%, "
+                                      f"Mem: {mem_usage}% - no other browser is running")
+                        break
+                    if time.time() >= deadline:
+                        self.refused += 1
+                        raise RuntimeError(
+                            f"No CPU/memory headroom for a new browser after {self.max_wait}s "
+                            f"(CPU: {cpu_usage}%, Mem: {mem_usage}%, {active} running)"
+                        )
+                    if not waited:
+                        log_admission(f"Holding new session - CPU: {cpu_usage}%, Mem: {mem_usage}% ({active} running)")
+                        waited = True
+                    gc.collect()
+                    time.sleep(min(self.poll_interval, max(deadline - time.time(), 0)))
+            finally:
+                if waited:
+                    self.waits += 1
+                    self.wait_seconds += time.time() - started
+            self._last_admitted = time.time()
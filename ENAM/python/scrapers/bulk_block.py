@@ -1,10 +1,12 @@
 import time
 import re
 import gc
-import requests
+import hashlib
+import uuid
 import psutil
 import traceback
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -14,6 +16,7 @@ from selenium.webdriver.support import expected_conditions as EC
 import concurrent.futures
 import psycopg2
 from psycopg2.extras import execute_values
+from exchange_sessions import get_session
 
 def get_db_connection():
     return psycopg2.connect(
@@ -28,6 +31,54 @@ def log_debug(message):
     timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
     print(f"{timestamp} {message}")
 
+def parse_deal_date(raw):
+    for fmt in ("%d/%m/%Y", "%d-%b-%Y", "%d %b %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(raw.strip(), fmt).date()
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+NUMBER_PATTERN = re.compile(r"^-?\d+(\.\d+)?$")
+
+def parse_number(raw):
+    # Exchange feeds format numbers as "1,23,456.50" strings or plain JSON numbers
+    if raw is None:
+        return None
+    cleaned = re.sub(r"[,\s]", "", str(raw))
+    if not NUMBER_PATTERN.match(cleaned):
+        return None
+    return Decimal(cleaned)
+
+def deal_key(source, deal_date, security_name, client_name, deal_type, quantity, price):
+    # Must match the md5 key built in extras/migrations/004_typed_deals_and_insider.sql
+    parts = [
+        source or "",
+        deal_date.isoformat() if deal_date else "",
+        (security_name or "").strip(" ").upper(),
+        (client_name or "").strip(" ").upper(),
+        (deal_type or "").strip(" ").upper(),
+        str(quantity) if quantity is not None else "",
+        f"{price:.2f}" if price is not None else ""
+    ]
+    return str(uuid.UUID(hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()))
+
+def normalize_deal_row(row):
+    source, deal_date, security_name, client_name, deal_type, quantity, price = [
+        None if isinstance(x, str) and not x.strip() else x
+        for x in row
+    ]
+    quantity = parse_number(quantity)
+    if quantity is not None:
+        quantity = int(quantity.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    price = parse_number(price)
+    if price is not None:
+        price = price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return [
+        source, deal_date, security_name, client_name, deal_type, quantity, price,
+        deal_key(source, deal_date, security_name, client_name, deal_type, quantity, price)
+    ]
+
 def check_system_resources():
     cpu_threshold = 80
     mem_threshold = 85
@@ -57,25 +108,19 @@ def append_unique_rows(table, rows):
             if table == "bulk_deals":
                 query = """
                     INSERT INTO bulk_deals
-                    (source, deal_date, security_name, client_name, deal_type, quantity, price)
-                    VALUES %s ON CONFLICT (source, deal_date, security_name, client_name, deal_type, quantity, price) DO NOTHING
+                    (source, deal_date, security_name, client_name, deal_type, quantity, price, deal_key)
+                    VALUES %s ON CONFLICT (deal_key) DO NOTHING
                 """
             elif table == "block_deals":
                 query = """
                     INSERT INTO block_deals
-                    (source, deal_date, security_name, client_name, deal_type, quantity, trade_price)
-                    VALUES %s ON CONFLICT (source, deal_date, security_name, client_name, deal_type, quantity, trade_price) DO NOTHING
+                    (source, deal_date, security_name, client_name, deal_type, quantity, trade_price, deal_key)
+                    VALUES %s ON CONFLICT (deal_key) DO NOTHING
                 """
             else:
                 raise ValueError(f"Unknown table: {table}")
             
-            processed_rows = []
-            for row in rows:
-                processed_row = [
-                    None if isinstance(x, str) and not x.strip() else x 
-                    for x in row
-                ]
-                processed_rows.append(processed_row)
+            processed_rows = [normalize_deal_row(row) for row in rows]
             
             execute_values(cur, query, processed_rows)
             conn.commit()
@@ -83,6 +128,9 @@ def append_unique_rows(table, rows):
         print(f"Database error inserting into {table}: {str(e)[:200]}")
         if conn:
             conn.rollback()
+    finally:
+        if conn:
+            conn.close()
 
 def create_driver():
     options = Options()
@@ -101,77 +149,100 @@ def create_driver():
     driver.set_page_load_timeout(30)
     return driver
 
-def scrape_bse_bulk():
-    for attempt in range(3):
-        try:
-            # check_system_resources()
-            driver = create_driver()
-            bulk_url = "https://www.bseindia.com/markets/equity/EQReports/bulk_deals.aspx"
-            driver.get(bulk_url)
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "span[name*='notedate']"))
-            )
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            date_string = soup.find('span', attrs={'name': re.compile(r'notedate')}).get_text(strip=True)
-            table = soup.find('table', attrs={'name': re.compile(r'bulkdeals')})
-            bulks = []
-            body = table.find('tbody')
-            rows = body.find_all('tr')
-            for row in rows:
-                cells = [cell.get_text(strip=True) for cell in row.find_all('td')]
-                if len(cells) >= 1:
-                    if cells[4] == "B":
-                        cells[4] = "BUY"
-                    elif cells[4] == "S":
-                        cells[4] = "SELL"
-                    bulks.append(["BSE"] + [cells[0]] + cells[2:])
-            append_unique_rows("bulk_deals", bulks)
-            print(f"BSE Bulk Deals extracted ({date_string})")
-            return
-        except Exception as e:
-            print(f"BSE Bulk attempt {attempt+1}/3 failed: {str(e)[:100]}")
-            time.sleep(2 ** attempt)
-        finally:
+# === BSE ===
+# The deal pages are fetched over plain HTTP on the shared BSE session;
+# Chrome is only started if the table can't be read from the served HTML
+BSE_DEAL_PAGES = {
+    "bulk": {
+        "url": "https://www.bseindia.com/markets/equity/EQReports/bulk_deals.aspx",
+        "date_span": r'notedate',
+        "table": r'bulkdeals',
+        "sides": {"B": "BUY", "S": "SELL"}
+    },
+    "block": {
+        "url": "https://www.bseindia.com/markets/equity/EQReports/block_deals.aspx",
+        "date_span": r'note',
+        "table": r'block',
+        "sides": {"B": "Buy", "S": "Sell"}
+    }
+}
+
+def parse_bse_deals(html, kind):
+    page = BSE_DEAL_PAGES[kind]
+    soup = BeautifulSoup(html, "html.parser")
+    date_span = soup.find('span', attrs={'name': re.compile(page["date_span"])})
+    table = soup.find('table', attrs={'name': re.compile(page["table"])})
+    if date_span is None or table is None or table.find('tbody') is None:
+        raise ValueError(f"BSE {kind} deals table not found in page")
+    deals = []
+    for row in table.find('tbody').find_all('tr'):
+        cells = [cell.get_text(strip=True) for cell in row.find_all('td')]
+        # Date, code, security, client, side, quantity, price; "no records"
+        # and other short rows are not deals
+        if len(cells) < 7:
+            continue
+        cells[4] = page["sides"].get(cells[4], cells[4])
+        deal_date = parse_deal_date(cells[0])
+        if deal_date is None:
+            continue
+        deals.append(["BSE", deal_date] + cells[2:7])
+    return date_span.get_text(strip=True), deals
+
+def fetch_bse_deals_http(kind):
+    response = get_session("bse").get(
+        BSE_DEAL_PAGES[kind]["url"],
+        headers={'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'}
+    )
+    response.raise_for_status()
+    return parse_bse_deals(response.text, kind)
+
+def fetch_bse_deals_selenium(kind):
+    page = BSE_DEAL_PAGES[kind]
+    driver = None
+    try:
+        driver = create_driver()
+        driver.get(page["url"])
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f"span[name*='{page['date_span']}']"))
+        )
+        return parse_bse_deals(driver.page_source, kind)
+    finally:
+        if driver:
             try:
                 driver.quit()
             except:
                 pass
 
-def scrape_bse_block():
+def scrape_bse_deals(kind):
+    label = f"BSE {kind.capitalize()}"
     for attempt in range(3):
         try:
             # check_system_resources()
-            driver = create_driver()
-            block_bse_url = "https://www.bseindia.com/markets/equity/EQReports/block_deals.aspx"
-            driver.get(block_bse_url)
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "span[name*='note']"))
-            )
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            date_string = soup.find('span', attrs={'name': re.compile(r'note')}).get_text(strip=True)
-            table = soup.find('table', attrs={'name': re.compile(r'block')})
-            bse_blocks = []
-            body = table.find('tbody')
-            rows = body.find_all('tr')
-            for row in rows:
-                cells = [cell.get_text(strip=True) for cell in row.find_all('td')]
-                if len(cells) >= 1:
-                    if cells[4] == "B":
-                        cells[4] = "Buy"
-                    elif cells[4] == "S":
-                        cells[4] = "Sell"
-                    bse_blocks.append(["BSE"] + [cells[0]] + cells[2:])
-            append_unique_rows("block_deals", bse_blocks)
-            print(f"BSE Block Deals extracted ({date_string})")
+            try:
+                date_string, deals = fetch_bse_deals_http(kind)
+            except Exception as e:
+                print(f"{label} HTTP fetch failed, falling back to Chrome: {str(e)[:100]}")
+                date_string, deals = fetch_bse_deals_selenium(kind)
+            append_unique_rows(f"{kind}_deals", deals)
+            print(f"{label} Deals extracted ({date_string})")
             return
         except Exception as e:
-            print(f"BSE Block attempt {attempt+1}/3 failed: {str(e)[:100]}")
+            print(f"{label} attempt {attempt+1}/3 failed: {str(e)[:100]}")
             time.sleep(2 ** attempt)
-        finally:
-            try:
-                driver.quit()
-            except:
-                pass
+
+def scrape_bse_bulk():
+    scrape_bse_deals("bulk")
+
+def scrape_bse_block():
+    scrape_bse_deals("block")
+
+# === NSE ===
+NSE_DEALS_HEADERS = {
+    'referer': 'https://www.nseindia.com/report-detail/display-bulk-and-block-deals',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'same-origin'
+}
 
 def scrape_nse_bulk():
     for attempt in range(3):
@@ -183,34 +254,17 @@ def scrape_nse_bulk():
 
             log_debug(f"[NSE BULK] Attempt {attempt+1}: from={from_date} to={to_date}")
 
-            headers = {
-                'accept': '*/*',
-                'accept-language': 'en-GB,en;q=0.5',
-                'priority': 'u=1, i',
-                'referer': 'https://www.nseindia.com/report-detail/display-bulk-and-block-deals',
-                'sec-ch-ua': '"Brave";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"windows"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-origin',
-                'sec-gpc': '1',
-                'user-agent': 'Mozilla/5.0'
-            }
             params = {
                 'optionType': 'bulk_deals',
                 'from': from_date,
                 'to': to_date,
             }
 
-            session = requests.Session()
-            homepage_resp = session.get('https://www.nseindia.com/', headers=headers, timeout=10)
-            log_debug(f"[NSE BULK] Homepage GET status={homepage_resp.status_code}")
-
-            response = session.get(
+            # Cookies come from the shared session's one warm-up, not a homepage visit per attempt
+            response = get_session("nse").get(
                 'https://www.nseindia.com/api/historicalOR/bulk-block-short-deals',
                 params=params,
-                headers=headers,
+                headers=NSE_DEALS_HEADERS,
                 timeout=15
             )
             log_debug(f"[NSE BULK] API GET status={response.status_code}")
@@ -227,12 +281,10 @@ def scrape_nse_bulk():
 
             nse_bulk = []
             for record in data.get('data', []):
-                original_date = record['BD_DT_DATE']
-                dt = datetime.strptime(original_date, "%d-%b-%Y")
-                formatted_date = dt.strftime("%d/%m/%Y")
+                deal_date = datetime.strptime(record['BD_DT_DATE'], "%d-%b-%Y").date()
                 nse_bulk.append([
                     'NSE',
-                    formatted_date,
+                    deal_date,
                     record['BD_SYMBOL'],
                     record['BD_CLIENT_NAME'],
                     record['BD_BUY_SELL'],
@@ -257,34 +309,17 @@ def scrape_nse_block():
 
             log_debug(f"[NSE BLOCK] Attempt {attempt+1}: from={from_date} to={to_date}")
 
-            headers = {
-                'accept': '*/*',
-                'accept-language': 'en-GB,en;q=0.5',
-                'priority': 'u=1, i',
-                'referer': 'https://www.nseindia.com/report-detail/display-bulk-and-block-deals',
-                'sec-ch-ua': '"Brave";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"windows"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-origin',
-                'sec-gpc': '1',
-                'user-agent': 'Mozilla/5.0'
-            }
             params = {
                 'optionType': 'block_deals',
                 'from': from_date,
                 'to': to_date,
             }
 
-            session = requests.Session()
-            homepage_resp = session.get('https://www.nseindia.com/', headers=headers, timeout=10)
-            log_debug(f"[NSE BLOCK] Homepage GET status={homepage_resp.status_code}")
-
-            response = session.get(
+            # Cookies come from the shared session's one warm-up, not a homepage visit per attempt
+            response = get_session("nse").get(
                 'https://www.nseindia.com/api/historicalOR/bulk-block-short-deals',
                 params=params,
-                headers=headers,
+                headers=NSE_DEALS_HEADERS,
                 timeout=15
             )
             log_debug(f"[NSE BLOCK] API GET status={response.status_code}")
@@ -301,12 +336,10 @@ def scrape_nse_block():
 
             nse_block = []
             for record in data.get('data', []):
-                original_date = record['BD_DT_DATE']
-                dt = datetime.strptime(original_date, "%d-%b-%Y")
-                formatted_date = dt.strftime("%d/%m/%Y")
+                deal_date = datetime.strptime(record['BD_DT_DATE'], "%d-%b-%Y").date()
                 nse_block.append([
                     'NSE',
-                    formatted_date,
+                    deal_date,
                     record['BD_SYMBOL'],
                     record['BD_CLIENT_NAME'],
                     record['BD_BUY_SELL'],
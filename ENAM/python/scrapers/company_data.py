@@ -1,7 +1,6 @@
 import os
+import re
 import time
-import gc
-import psutil
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -10,9 +9,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import concurrent.futures
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 import psycopg2
 from psycopg2.extras import execute_values
-from threading import Lock
+from threading import Lock, BoundedSemaphore
+from scrapers.driver_pool import DriverPool
+from scrapers.admission import AdmissionController
+from scrapers.nse_client import NSEQuoteClient, parse_nse_datetime
 
 INSIDER_HEADERS = [
     "Stock", "Clause", "Name", "Type", "Amount", "Value", "Transaction", "Attachment", "Time"
@@ -25,34 +28,62 @@ ANNOUNCEMENTS_HEADERS = [
 # === PATH CONFIGURATION ===
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# === SCRAPE MODE ===
+SCRAPE_MODE = os.environ.get("COMPANY_SCRAPE_MODE", "api")    # "api": NSE JSON, Selenium fallback per symbol; "selenium"
+NSE_CLIENT_MODE = os.environ.get("NSE_CLIENT_MODE", "live")   # "record" saves API responses as fixtures, "replay" reads them
+
+# === DRIVER POOL CONFIGURATION ===
+DRIVER_MAX_PAGES = 25     # quit and restart a browser after this many companies
+DRIVER_MAX_RSS_MB = 1024  # ... or once chromedriver + Chrome use this much memory
+
+# === CONCURRENCY CONFIGURATION ===
+MAX_SCRAPE_WORKERS = int(os.environ.get("COMPANY_SCRAPE_WORKERS", 4))  # upper bound on parallel browsers
+CPU_THRESHOLD = 80  # % - a new browser session is only admitted below these
+MEM_THRESHOLD = 85  # %
+
+# === DB POOL CONFIGURATION ===
+DB_POOL_SIZE = MAX_SCRAPE_WORKERS + 1  # one connection per scraping thread, plus the runner's
+DB_POOL_TIMEOUT = 60  # seconds to wait for a connection when all are in use
+
 _db_lock = Lock()
+_db_slots = BoundedSemaphore(DB_POOL_SIZE)
 _db_conn_pool = []
 
+def connect_db():
+    return psycopg2.connect(
+        dbname="enam",
+        user="postgres",
+        password="mathew",
+        host="localhost",
+        port="5432"
+    )
+
 def init_db_pool():
     global _db_conn_pool
     with _db_lock:
         if not _db_conn_pool:
-            for _ in range(5):  # Initial pool size
-                conn = psycopg2.connect(
-                    dbname="enam",
-                    user="postgres",
-                    password="mathew",
-                    host="localhost",
-                    port="5432"
-                )
-                _db_conn_pool.append(conn)
+            for _ in range(DB_POOL_SIZE):
+                _db_conn_pool.append(connect_db())
 
 def get_db_connection():
     global _db_conn_pool
-    with _db_lock:
-        if not _db_conn_pool:
-            init_db_pool()
-        return _db_conn_pool.pop()
+    # At most DB_POOL_SIZE connections are out at once; callers wait for a free one
+    if not _db_slots.acquire(timeout=DB_POOL_TIMEOUT):
+        raise RuntimeError(f"No database connection free after {DB_POOL_TIMEOUT}s")
+    try:
+        with _db_lock:
+            if _db_conn_pool:
+                return _db_conn_pool.pop()
+        return connect_db()
+    except Exception:
+        _db_slots.release()
+        raise
 
 def return_db_connection(conn):
     global _db_conn_pool
     with _db_lock:
         _db_conn_pool.append(conn)
+    _db_slots.release()
 
 def close_all_connections():
     global _db_conn_pool
@@ -88,7 +119,16 @@ def load_portfolio_symbols(only_new=False):
         if conn:
             return_db_connection(conn)
 
+def drop_untimed_rows(table, rows):
+    # time is part of both tables' unique keys and NULLs never conflict, so a
+    # row whose time did not parse would be inserted again on every run
+    kept = [row for row in rows if row[-1] is not None]
+    if len(kept) < len(rows):
+        log_debug(f"[WARN] Skipped {len(rows) - len(kept)} {table} row(s) without a parseable time")
+    return kept
+
 def append_unique_rows(table, rows):
+    rows = drop_untimed_rows(table, rows)
     if not rows:
         return
         
@@ -118,6 +158,8 @@ def append_unique_rows(table, rows):
                     None if isinstance(x, str) and not x.strip() else x 
                     for x in row
                 ]
+                if table == "insider_trading":
+                    processed_row = normalize_insider_row(processed_row)
                 processed_rows.append(processed_row)
             
             execute_values(cur, query, processed_rows)
@@ -130,30 +172,25 @@ def append_unique_rows(table, rows):
         if conn:
             return_db_connection(conn)
 
-def check_system_resources():
-    cpu_threshold = 80
-    mem_threshold = 85
-    wait_time = 5
-    max_attempts = 5
-
-    attempt = 0
-    while attempt < max_attempts:
-        cpu_usage = psutil.cpu_percent(interval=1)
-        mem_usage = psutil.virtual_memory().percent
-        if cpu_usage < cpu_threshold and mem_usage < mem_threshold:
-            return
-        print(f"[WARN] High usage - CPU: {cpu_usage}%, Mem: {mem_usage}% - GC Attempt {attempt+1}")
-        gc.collect()
-        attempt += 1
-        time.sleep(wait_time)
-    raise Exception("Resources too constrained after attempts.")
-
 def convert_nse_datetime(raw):
-    try:
-        dt = datetime.strptime(raw.strip(), "%d-%b-%Y %H:%M:%S")
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except:
-        return raw
+    # Same formats as the API path, so both store the same time for a filing
+    # and ON CONFLICT dedupes them
+    return parse_nse_datetime(raw)
+
+def parse_number(raw):
+    # NSE renders amounts as "1,23,456" text; anything else is stored as NULL
+    cleaned = re.sub(r"[,\s]", "", str(raw or ""))
+    if not re.match(r"^-?\d+(\.\d+)?$", cleaned):
+        return None
+    return Decimal(cleaned)
+
+def normalize_insider_row(row):
+    amount = parse_number(row[4])
+    value = parse_number(row[5])
+    row = list(row)
+    row[4] = int(amount.quantize(Decimal(1), rounding=ROUND_HALF_UP)) if amount is not None else None
+    row[5] = value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) if value is not None else None
+    return row
 
 # === WebDriver ===
 def create_driver():
@@ -182,14 +219,62 @@ def log_error(company, error, driver=None):
         print(driver.page_source)
         print(f"{'='*40}\n")
 
+# === Quote page tables ===
+def parse_announcements_table(company, html):
+    """Rows of the quote page's announcements table, or None if the table is missing"""
+    soup = BeautifulSoup(html, "html.parser")
+    div = soup.find('div', id="corpAnnouncementTable")
+    if not div or not div.find('tbody'):
+        return None
+    anns = []
+    for row in div.find('tbody').find_all('tr'):
+        tds = row.find_all("td")
+        if len(tds) < 4:
+            continue
+        ann = [company]
+        ann.append(tds[0].get_text(strip=True))
+        span = tds[1].find("span")
+        ann.append(span.get_text(strip=True) if span else tds[1].get_text(strip=True))
+        a_tag = tds[2].find("a")
+        ann.append(a_tag.get("href") if a_tag else None)
+        for d in tds[3].find_all("div"):
+            d.extract()
+        time_val = tds[3].get_text(strip=True)
+        ann.append(convert_nse_datetime(time_val))
+        anns.append(ann)
+    return anns
+
+def parse_insider_table(company, html):
+    """Rows of the quote page's insider trading table, or None if the table is missing"""
+    soup = BeautifulSoup(html, "html.parser")
+    div = soup.find('div', id="corpInsiderTradingTable")
+    if not div or not div.find('tbody'):
+        return None
+    its = []
+    for row in div.find('tbody').find_all('tr'):
+        tds = row.find_all('td')
+        if len(tds) != 8:
+            continue
+        it = [company]
+        for n in range(8):
+            if n == 6 and tds[n].find('a'):
+                it.append(tds[n].find('a').get("href"))
+            elif n == 7:
+                it.append(convert_nse_datetime(tds[n].get_text(strip=True)))
+            else:
+                it.append(tds[n].get_text(strip=True))
+        its.append(it)
+    return its
+
 # === Scraper ===
-def scrape_company_data(company):
+def scrape_company_data(company, pool):
+    """Scrape one company, retrying on a fresh browser; returns False if every attempt failed"""
     for attempt in range(3):
         driver = None
+        failed = False
         try:
             print(f"Starting scrape for: {company}")
-            # check_system_resources()
-            driver = create_driver()
+            driver = pool.acquire()
             driver.get(f"https://www.nseindia.com/get-quotes/equity?symbol={company}")
             wait = WebDriverWait(driver, 20)
 
@@ -220,26 +305,8 @@ def scrape_company_data(company):
                     except:
                         continue
 
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                div = soup.find('div', id="corpAnnouncementTable")
-                anns = []
-                if div and div.find('tbody'):
-                    for row in div.find('tbody').find_all('tr'):
-                        tds = row.find_all("td")
-                        if len(tds) < 4:
-                            continue
-                        ann = [company]
-                        ann.append(tds[0].get_text(strip=True))
-                        span = tds[1].find("span")
-                        ann.append(span.get_text(strip=True) if span else tds[1].get_text(strip=True))
-                        a_tag = tds[2].find("a")
-                        ann.append(a_tag.get("href") if a_tag else None)
-                        for d in tds[3].find_all("div"):
-                            d.extract()
-                        time_val = tds[3].get_text(strip=True)
-                        ann.append(convert_nse_datetime(time_val))
-                        anns.append(ann)
-
+                anns = parse_announcements_table(company, driver.page_source)
+                if anns is not None:
                     if anns:
                         append_unique_rows("announcements", anns)
                         print(f"[{company}] Announcements extracted: {len(anns)} records")
@@ -262,24 +329,8 @@ def scrape_company_data(company):
                 time.sleep(2)
 
                 wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '#corpInsiderTradingTable tbody')))
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                div = soup.find('div', id="corpInsiderTradingTable")
-                its = []
-                if div and div.find('tbody'):
-                    for row in div.find('tbody').find_all('tr'):
-                        tds = row.find_all('td')
-                        if len(tds) != 8:
-                            continue
-                        it = [company]
-                        for n in range(8):
-                            if n == 6 and tds[n].find('a'):
-                                it.append(tds[n].find('a').get("href"))
-                            elif n == 7:
-                                it.append(convert_nse_datetime(tds[n].get_text(strip=True)))
-                            else:
-                                it.append(tds[n].get_text(strip=True))
-                        its.append(it)
-
+                its = parse_insider_table(company, driver.page_source)
+                if its is not None:
                     if its:
                         append_unique_rows("insider_trading", its)
                         print(f"[{company}] Insider Trading extracted: {len(its)} records")
@@ -289,37 +340,102 @@ def scrape_company_data(company):
                     print(f"[{company}] Insider Trading table missing")
             except Exception as e:
                 print(f"[{company}] Insider Trading error: {str(e)[:150]}")
-            return
+            return True
         except Exception as e:
+            failed = True
             print(f"{company} attempt {attempt+1}/3 failed: {str(e)[:100]}")
-            time.sleep(2 ** attempt)
         finally:
+            # A failed attempt retries on a fresh browser
             if driver:
-                driver.quit()
+                pool.release(driver, discard=failed)
+        time.sleep(2 ** attempt)
+    return False
+
+def scrape_companies_api(companies):
+    """Fetch announcements and insider trades over NSE's JSON API; returns the companies that failed"""
+    client = NSEQuoteClient(mode=NSE_CLIENT_MODE)
+    failed = []
+    for company, anns, its, error in client.fetch_many(companies):
+        if error is not None:
+            print(f"[{company}] API fetch failed: {str(error)[:150]}")
+            failed.append(company)
+            continue
+        if anns:
+            append_unique_rows("announcements", anns)
+            print(f"[{company}] Announcements extracted: {len(anns)} records")
+        else:
+            print(f"[{company}] No announcements found")
+        if its:
+            append_unique_rows("insider_trading", its)
+            print(f"[{company}] Insider Trading extracted: {len(its)} records")
+        else:
+            print(f"[{company}] No insider trading data found")
+    return failed
 
 # === Runner ===
 def run_company_scrapers(only_new=False):
+    """Scrape the active portfolio symbols; returns the companies that could not be scraped"""
     # Initialize connection pool on import
     init_db_pool()
 
-    start_time = time.time()
     companies = load_portfolio_symbols(only_new)
     if not companies:
         print("[WARN] No active companies found in symbols table")
-        return
+        return []
 
-    # Limit workers based on system resources
-    cpu_count = os.cpu_count() or 1
-    max_workers = min(1, cpu_count, len(companies))
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(scrape_company_data, c): c for c in companies}
-        for future in concurrent.futures.as_completed(futures):
-            company = futures[future]
-            try:
-                future.result()
-            except Exception as e:
-                print(f"[ERROR] Thread failed for {company}: {str(e)[:100]}")
+    return scrape_companies(companies)
+
+def scrape_companies(companies):
+    """Scrape the given symbols, over NSE's API first and with Selenium for the rest
+
+    Opens and closes its own database connections and browsers, so it can
+    also be called from outside a scraper script. Returns the companies that
+    could not be scraped, e.g. because no browser was admitted in time.
+    """
+    init_db_pool()
+    start_time = time.time()
+    failed = []
+    try:
+        if SCRAPE_MODE == "api":
+            companies = scrape_companies_api(companies)
+            if companies:
+                print(f"[WARN] Falling back to Selenium for {len(companies)} companies")
+        if companies:
+            failed = scrape_companies_selenium(companies)
+    finally:
+        close_all_connections()
 
     print(f"Company scraping completed in {time.time() - start_time:.2f} seconds")
-    close_all_connections()
\ No newline at end of file
+    if failed:
+        print(f"[ERROR] {len(failed)} companies could not be scraped: {', '.join(sorted(failed))}")
+    return failed
+
+def scrape_companies_selenium(companies):
+    """Scrape companies in parallel browsers; returns the companies that failed"""
+    # Up to one browser per core; the admission controller holds back extra
+    # sessions while the box is short on CPU or memory
+    cpu_count = os.cpu_count() or 1
+    max_workers = max(1, min(MAX_SCRAPE_WORKERS, cpu_count, len(companies)))
+    print(f"Scraping {len(companies)} companies with up to {max_workers} browser(s)")
+    
+    # Browsers are reused across companies instead of launched per company
+    admission = AdmissionController(cpu_threshold=CPU_THRESHOLD, mem_threshold=MEM_THRESHOLD)
+    pool = DriverPool(
+        create_driver, size=max_workers, max_pages=DRIVER_MAX_PAGES,
+        max_rss_mb=DRIVER_MAX_RSS_MB, admission=admission
+    )
+    failed = []
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(scrape_company_data, c, pool): c for c in companies}
+            for future in concurrent.futures.as_completed(futures):
+                company = futures[future]
+                try:
+                    if not future.result():
+                        failed.append(company)
+                except Exception as e:
+                    print(f"[ERROR] Thread failed for {company}: {str(e)[:100]}")
+                    failed.append(company)
+    finally:
+        pool.close()
+    return failed
\ No newline at end of file
@@ -0,0 +1,179 @@
+import time
+import psutil
+from threading import Lock, BoundedSemaphore
+from datetime import datetime
+
+
+def log_pool(message):
+    timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
+    print(f"{timestamp} [DRIVER POOL] {message}")
+
+
+class PooledDriver:
+    def __init__(self, driver, startup_seconds):
+        self.driver = driver
+        self.startup_seconds = startup_seconds
+        self.pages = 0
+        self.borrowed_at = None
+
+
+class DriverPool:
+    """Long-lived WebDriver instances shared across scrapes
+
+    Drivers are reset (cookies, storage, blank page) after every use, health
+    checked before reuse, and recycled after max_pages uses or once Chrome's
+    process tree grows past max_rss_mb. At most size drivers exist at once,
+    and with an admission controller a new browser is only started once
+    there is CPU and memory headroom; reusing an idle one needs no admission.
+    """
+
+    def __init__(self, create_driver, size=1, max_pages=25, max_rss_mb=1024, admission=None):
+        self.create_driver = create_driver
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.admission = admission
+
+        self._idle = []
+        self._in_use = {}
+        self._lock = Lock()
+        self._slots = BoundedSemaphore(size)
+        self.metrics = {
+            "drivers_started": 0,
+            "startup_seconds": 0.0,
+            "pages": 0,
+            "scrape_seconds": 0.0,
+            "recycled": {"pages": 0, "rss": 0, "unhealthy": 0, "error": 0}
+        }
+
+    def acquire(self):
+        """Borrow a driver, starting one if none is idle; blocks while size drivers are in use"""
+        self._slots.acquire()
+        try:
+            pooled = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        pooled.borrowed_at = time.time()
+        with self._lock:
+            self._in_use[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def release(self, driver, discard=False):
+        """Return a borrowed driver; discard it if its scrape failed"""
+        with self._lock:
+            pooled = self._in_use.pop(id(driver))
+        try:
+            self._count("scrape_seconds", time.time() - pooled.borrowed_at)
+            if discard:
+                self._retire(pooled, "error")
+                return
+            self._count("pages", 1)
+            pooled.pages += 1
+            self._checkin(pooled)
+        finally:
+            self._slots.release()
+
+    def in_use(self):
+        """How many drivers are borrowed right now"""
+        with self._lock:
+            return len(self._in_use)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                if self.admission:
+                    self.admission.admit(self.in_use)
+                return self._start()
+            if self._healthy(pooled):
+                return pooled
+            self._retire(pooled, "unhealthy")
+
+    def _checkin(self, pooled):
+        if pooled.pages >= self.max_pages:
+            self._retire(pooled, "pages")
+            return
+        if self.max_rss_mb and self._rss_mb(pooled) > self.max_rss_mb:
+            self._retire(pooled, "rss")
+            return
+        try:
+            self._reset(pooled.driver)
+        except Exception:
+            self._retire(pooled, "unhealthy")
+            return
+        with self._lock:
+            self._idle.append(pooled)
+
+    def _start(self):
+        started = time.time()
+        driver = self.create_driver()
+        seconds = time.time() - started
+        with self._lock:
+            self.metrics["drivers_started"] += 1
+            self.metrics["startup_seconds"] += seconds
+        return PooledDriver(driver, seconds)
+
+    def _reset(self, driver):
+        # Each scrape starts as a fresh incognito session would
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get("about:blank")
+
+    def _healthy(self, pooled):
+        try:
+            return pooled.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _rss_mb(self, pooled):
+        """Resident memory of chromedriver and the browsers it started"""
+        try:
+            process = psutil.Process(pooled.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+        except Exception:
+            return 0
+        rss = 0
+        for proc in processes:
+            try:
+                rss += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / (1024 * 1024)
+
+    def _retire(self, pooled, reason):
+        with self._lock:
+            self.metrics["recycled"][reason] += 1
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _count(self, key, amount):
+        with self._lock:
+            self.metrics[key] += amount
+
+    def close(self):
+        """Quit every idle driver and log where the time went; borrowed ones must be released first"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            try:
+                pooled.driver.quit()
+            except Exception:
+                pass
+        self.log_metrics()
+
+    def log_metrics(self):
+        m = self.metrics
+        recycled = ", ".join(f"{reason} {count}" for reason, count in m["recycled"].items() if count) or "none"
+        log_pool(
+            f"{m['drivers_started']} driver(s) started in {m['startup_seconds']:.2f}s; "
+            f"{m['pages']} page(s) scraped in {m['scrape_seconds']:.2f}s; recycled: {recycled}"
+        )
+        if self.admission and (self.admission.waits or self.admission.refused):
+            log_pool(
+                f"{self.admission.waits} session(s) held for resources, "
+                f"{self.admission.wait_seconds:.2f}s in total; {self.admission.refused} refused"
+            )
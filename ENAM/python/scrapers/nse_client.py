@@ -0,0 +1,133 @@
+import os
+import json
+from datetime import datetime, timedelta
+from exchange_sessions import get_session
+
+BASE_URL = "https://www.nseindia.com"
+ANNOUNCEMENTS_URL = f"{BASE_URL}/api/corporate-announcements"
+INSIDER_TRADING_URL = f"{BASE_URL}/api/corporates-pit"
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "nse")
+
+HEADERS = {
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'same-origin'
+}
+
+NSE_DATETIME_FORMATS = ("%d-%b-%Y %H:%M:%S", "%d-%b-%Y %H:%M", "%Y-%m-%d %H:%M:%S")
+
+
+class NSEClientError(Exception):
+    pass
+
+
+def parse_nse_datetime(raw):
+    for fmt in NSE_DATETIME_FORMATS:
+        try:
+            return datetime.strptime(str(raw).strip(), fmt)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def announcement_row(symbol, record):
+    """[Stock, Subject, Announcement, Attachment, Time] as the quote page's announcements table shows them"""
+    return [
+        symbol,
+        record.get("desc"),
+        record.get("attchmntText"),
+        record.get("attchmntFile"),
+        parse_nse_datetime(record.get("an_dt") or record.get("sort_date"))
+    ]
+
+
+def insider_row(symbol, record):
+    """[Stock, Clause, Name, Type, Amount, Value, Transaction, Attachment, Time] as the insider trading table shows them"""
+    return [
+        symbol,
+        record.get("anex"),
+        record.get("acqName"),
+        record.get("personCategory"),
+        record.get("secAcq"),
+        record.get("secVal"),
+        record.get("tdpTransactionType"),
+        record.get("xbrl"),
+        parse_nse_datetime(record.get("date"))
+    ]
+
+
+class NSEQuoteClient:
+    """Fetches a symbol's corporate announcements and insider trades from NSE's JSON API
+
+    The same data the get-quotes/equity page renders, without a browser: the
+    page's own API calls are made directly on the shared NSE session, which
+    holds the cookies and paces requests. mode is "live", "record" (live,
+    saving every response under fixtures_dir) or "replay" (served from
+    fixtures_dir, no network), so parsing can be checked offline.
+    """
+
+    def __init__(self, mode="live", fixtures_dir=DEFAULT_FIXTURES_DIR, lookback_days=180, timeout=15):
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"Unknown NSE client mode: {mode}")
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.lookback_days = lookback_days  # the quote page's 6M filter
+        self.timeout = timeout
+
+    def _fixture_path(self, name, symbol):
+        return os.path.join(self.fixtures_dir, f"{name}_{symbol}.json")
+
+    def _get_json(self, name, url, symbol):
+        path = self._fixture_path(name, symbol)
+        if self.mode == "replay":
+            try:
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                raise NSEClientError(f"No recorded {name} fixture for {symbol}: {path}")
+
+        today = datetime.today()
+        params = {
+            "index": "equities",
+            "symbol": symbol,
+            "from_date": (today - timedelta(days=self.lookback_days)).strftime("%d-%m-%Y"),
+            "to_date": today.strftime("%d-%m-%Y")
+        }
+        headers = dict(HEADERS, referer=f"{BASE_URL}/get-quotes/equity?symbol={symbol}")
+        response = get_session("nse").get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code != 200:
+            raise NSEClientError(f"{name} for {symbol}: HTTP {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError:
+            raise NSEClientError(f"{name} for {symbol}: response is not JSON")
+
+        if self.mode == "record":
+            os.makedirs(self.fixtures_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        return data
+
+    def announcements(self, symbol):
+        data = self._get_json("announcements", ANNOUNCEMENTS_URL, symbol)
+        records = data if isinstance(data, list) else data.get("data", [])
+        return [announcement_row(symbol, record) for record in records]
+
+    def insider_trading(self, symbol):
+        data = self._get_json("insider_trading", INSIDER_TRADING_URL, symbol)
+        records = data.get("data", []) if isinstance(data, dict) else data
+        return [insider_row(symbol, record) for record in records]
+
+    def fetch(self, symbol):
+        """(announcement rows, insider trading rows) for one symbol"""
+        return self.announcements(symbol), self.insider_trading(symbol)
+
+    def fetch_many(self, symbols):
+        """Yield (symbol, announcement rows, insider trading rows, error) for each symbol"""
+        for symbol in symbols:
+            try:
+                announcements, insider = self.fetch(symbol)
+                yield symbol, announcements, insider, None
+            except Exception as e:
+                yield symbol, None, None, e
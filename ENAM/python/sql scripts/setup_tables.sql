@@ -15,23 +15,23 @@ CREATE TABLE announcements (
 -- block_deals
 CREATE TABLE block_deals (
     Source TEXT,
-    Deal_Date TEXT,
+    Deal_Date DATE,
     Security_Name TEXT,
     Client_Name TEXT,
     Deal_Type TEXT,
-    Quantity TEXT,
-    Trade_Price TEXT
+    Quantity BIGINT,
+    Trade_Price NUMERIC(14, 2)
 );
 
 -- bulk_deals
 CREATE TABLE bulk_deals (
     Source TEXT,
-    Deal_Date TEXT,
+    Deal_Date DATE,
     Security_Name TEXT,
     Client_Name TEXT,
     Deal_Type TEXT,
-    Quantity TEXT,
-    Price TEXT
+    Quantity BIGINT,
+    Price NUMERIC(14, 2)
 );
 
 -- actions (as before)
@@ -63,11 +63,11 @@ CREATE TABLE insider_trading (
     Clause TEXT,
     Name TEXT,
     Type TEXT,
-    Amount TEXT,
-    Value TEXT,
+    Amount BIGINT,
+    Value NUMERIC(20, 2),
     Transaction TEXT,
     Attachment TEXT,
-    Time TEXT
+    Time TIMESTAMP
 );
 
 -- master (as before)
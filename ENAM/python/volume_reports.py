@@ -1,10 +1,13 @@
 import os
-import requests
-from datetime import datetime, timedelta
+import sys
 import pandas as pd
 import psycopg2
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.trading_calendar import TradingCalendar, DEFAULT_HOLIDAYS_FILE
+from exchange_sessions import get_session
+
 # === CONFIGURE LOGGING ===
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -38,14 +41,15 @@ def truncate_table(table_name):
         conn.commit()
 
 # === DOWNLOAD AND CLEAN ===
-def get_last_11_weekdays():
-    dates = []
-    current = datetime.now() - timedelta(days=1)
-    while len(dates) < 11:
-        if current.weekday() < 5:
-            dates.append(current.strftime("%d%m%Y"))
-        current -= timedelta(days=1)
-    logging.info(f"Last 11 weekdays: {dates}")
+def get_last_11_trading_days():
+    # Holidays have no bhavcopy, so only sessions whose files should already
+    # be published are requested
+    calendar = TradingCalendar(
+        os.environ.get("TRADING_HOLIDAYS_FILE", DEFAULT_HOLIDAYS_FILE),
+        os.environ.get("DATA_FILES_READY_AT", "18:30")
+    )
+    dates = [day.strftime("%d%m%Y") for day in calendar.latest_sessions(11)]
+    logging.info(f"Last 11 trading days: {dates}")
     return dates
 
 def filter_eq_series_df(df):
@@ -55,6 +59,7 @@ def download_and_prepare_files(dates, save_dir):
     base_url = "https://nsearchives.nseindia.com/products/content/"
     os.makedirs(save_dir, exist_ok=True)
     downloaded = []
+    session = get_session("nse")
 
     for date in dates:
         filename = f"sec_bhavdata_full_{date}.csv"
@@ -66,14 +71,8 @@ def download_and_prepare_files(dates, save_dir):
             downloaded.append(local_path)
             continue
 
-        headers = {
-            "User-Agent": "Mozilla/5.0",
-            "Referer": "https://www.nseindia.com/",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-
         logging.info(f"Downloading: {url}")
-        response = requests.get(url, headers=headers)
+        response = session.get(url, timeout=30)
         if response.status_code == 200:
             with open(local_path, "wb") as f:
                 f.write(response.content)
@@ -203,7 +202,7 @@ if __name__ == "__main__":
     VOLUME_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, "volume_data_pg"))
     os.makedirs(VOLUME_DIR, exist_ok=True)
 
-    last_11_dates = get_last_11_weekdays()
+    last_11_dates = get_last_11_trading_days()
 
     try:
         downloaded_files = download_and_prepare_files(last_11_dates, VOLUME_DIR)
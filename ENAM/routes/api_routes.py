@@ -1,13 +1,190 @@
-from flask import Blueprint, request, jsonify, current_app
+import time
+import datetime
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from services.portfolio_service import PortfolioService
 from services.data_service import DataService
 from services.scheduler_service import SchedulerService
+from services.job_service import JobService
 
 api_bp = Blueprint('api', __name__)
 
 # Initialize services
 portfolio_service = PortfolioService()
 data_service = DataService()
+job_service = JobService()
+
+# === Response Cache ===
+# Dataset responses only change when a scheduler run bumps last_updated or the
+# portfolio membership changes, so bodies are cached per dataset and query string
+# and validated against those last_updated versions on every request.
+DATASET_VERSION_KEYS = {
+    'corp_actions': ('data', 'portfolio'),
+    'announcements': ('data', 'company', 'portfolio'),
+    'insider': ('data', 'company', 'portfolio'),
+    'block_deals': ('data', 'portfolio'),
+    'bulk_deals': ('data', 'portfolio'),
+    'volume': ('data', 'portfolio'),
+    'delivery': ('data', 'portfolio'),
+    'news': ('news',),
+    'news_filters': ('news',)
+}
+
+RESPONSE_FORMATS = ('rows', 'columns')
+
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _cached_dataset_response(dataset, loader, scope="", stream=False):
+    """Serve a dataset from the response cache, honouring If-None-Match
+
+    scope distinguishes responses that also depend on something outside the
+    query string, such as the current date for relative date ranges. With
+    stream=True the loader returns an iterator of rows, and a cache miss is
+    written out as a JSON array while the rows are read from the database.
+
+    ?format=columns returns {"columns": [...], "rows": [[...], ...]} instead of
+    a list of objects, so column names are not repeated in every row.
+    """
+    response_format = request.args.get("format", "rows")
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(RESPONSE_FORMATS)}")
+
+    version = data_service.get_cache_version(DATASET_VERSION_KEYS[dataset])
+    query = tuple(sorted(request.args.items(multi=True))) + (scope,)
+    etag = hashlib.sha1(f"{dataset}|{query}|{version}".encode()).hexdigest()
+
+    # Weak comparison: compressed responses carry a weak form of the same ETag
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        cache_key = (dataset, query)
+        with _response_cache_lock:
+            entry = _response_cache.get(cache_key)
+            if entry:
+                _response_cache.move_to_end(cache_key)
+
+        if entry and entry[0] == etag:
+            body = entry[1]
+        elif stream:
+            body = stream_with_context(
+                _stream_json_array(loader(), cache_key, etag, response_format == 'columns')
+            )
+        else:
+            payload = loader()
+            if response_format == 'columns':
+                payload = _to_columns(payload)
+            body = current_app.json.dumps(payload)
+            _store_response(cache_key, etag, body)
+
+        response = current_app.response_class(body, mimetype='application/json')
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _store_response(cache_key, etag, body):
+    """Keep a response body in the LRU cache unless it is too large to hold"""
+    cache_config = current_app.config['API_CACHE_CONFIG']
+    if len(body) > cache_config['max_body_bytes']:
+        return
+    with _response_cache_lock:
+        _response_cache[cache_key] = (etag, body)
+        _response_cache.move_to_end(cache_key)
+        while len(_response_cache) > cache_config['max_entries']:
+            _response_cache.popitem(last=False)
+
+def _to_columns(payload):
+    """Convert a list of row dicts, or a page with an items list, to columnar form"""
+    if isinstance(payload, dict) and "items" in payload:
+        page = {key: value for key, value in payload.items() if key != "items"}
+        page.update(_to_columns(payload["items"]))
+        return page
+    if not isinstance(payload, list):
+        return payload
+    columns = list(payload[0].keys()) if payload else []
+    return {"columns": columns, "rows": [list(row.values()) for row in payload]}
+
+def _stream_json_array(rows, cache_key, etag, columnar=False):
+    """Encode rows as a JSON array in chunks, so a worker never holds the whole body
+
+    The first row is fetched before anything is sent so query errors still
+    surface as a 500. Bodies that stay under max_body_bytes are also cached.
+    With columnar=True the rows are written as arrays under a columns header.
+
+    A failure after the status line has gone out ends the body with an
+    {"error": ...} object: on its own if no chunk was sent yet, otherwise
+    after the partial array, so the body never parses as a complete result.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+
+    def generate():
+        dumps = current_app.json.dumps
+        encode = (lambda row: dumps(list(row.values()))) if columnar else dumps
+        chunk_rows = current_app.config['API_STREAM_CONFIG']['itersize']
+        max_bytes = current_app.config['API_CACHE_CONFIG']['max_body_bytes']
+        kept, kept_size = [], 0
+        sent = complete = False
+        if columnar:
+            columns = list(first.keys()) if first is not None else []
+            buffer = ['{"columns":' + dumps(columns) + ',"rows":[']
+        else:
+            buffer = ["["]
+        try:
+            if first is not None:
+                buffer.append(encode(first))
+                for row in rows:
+                    buffer.append("," + encode(row))
+                    if len(buffer) >= chunk_rows:
+                        chunk = "".join(buffer)
+                        buffer = []
+                        if kept is not None:
+                            kept.append(chunk)
+                            kept_size += len(chunk)
+                            if kept_size > max_bytes:
+                                kept = None
+                        sent = True
+                        yield chunk
+            buffer.append("]}" if columnar else "]")
+            chunk = "".join(buffer)
+            sent = True
+            yield chunk
+            complete = True
+            if kept is not None:
+                kept.append(chunk)
+                _store_response(cache_key, etag, "".join(kept))
+        except Exception as e:
+            current_app.logger.exception("Streaming %s failed", cache_key[0])
+            if complete:
+                return
+            error = dumps({"error": f"Streaming {cache_key[0]} failed: {str(e)}"})
+            yield ("\n" + error) if sent else error
+        finally:
+            if hasattr(rows, "close"):
+                rows.close()
+
+    return generate()
+
+def _date_range_response(dataset, loader):
+    """Serve a dataset restricted to the range or from/to query parameters"""
+    start, end = data_service.resolve_date_range(
+        request.args.get("range"),
+        request.args.get("from"),
+        request.args.get("to")
+    )
+    # Named ranges are relative to today, so their cached bodies expire at midnight
+    scope = datetime.date.today().isoformat() if request.args.get("range") else ""
+    return _cached_dataset_response(
+        dataset, lambda: loader(start=start, end=end, stream=True), scope, stream=True
+    )
+
+def invalidate_response_cache():
+    """Drop every cached dataset response held by this worker"""
+    with _response_cache_lock:
+        _response_cache.clear()
 
 # === Portfolio Management APIs ===
 
@@ -31,6 +208,7 @@ def add_portfolio():
             return jsonify({"error": "Symbol required"}), 400
         
         result = portfolio_service.add_symbol(symbol)
+        invalidate_response_cache()
         return jsonify(result), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
@@ -48,6 +226,7 @@ def remove_portfolio():
             return jsonify({"error": "Symbol required"}), 400
         
         result = portfolio_service.remove_symbol(symbol)
+        invalidate_response_cache()
         return jsonify(result), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
@@ -81,50 +260,66 @@ def get_scraper_status():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@api_bp.route("/db/pool", methods=["GET"])
+def get_db_pool_status():
+    """Get database connection pool metrics for this worker"""
+    try:
+        status = data_service.get_pool_status()
+        return jsonify(status)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # === Data Retrieval APIs ===
 
 @api_bp.route('/corp_actions')
 def get_corp_actions():
     """Get corporate actions for portfolio symbols"""
     try:
-        data = data_service.get_corp_actions()
-        return jsonify(data)
+        return _cached_dataset_response(
+            'corp_actions', lambda: data_service.get_corp_actions(stream=True), stream=True
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/announcements')
 def get_announcements():
-    """Get announcements for portfolio symbols"""
+    """Get announcements for portfolio symbols, optionally limited to a date range"""
     try:
-        data = data_service.get_announcements()
-        return jsonify(data)
+        return _date_range_response('announcements', data_service.get_announcements)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/insider')
 def get_insider_trading():
-    """Get insider trading data for portfolio symbols"""
+    """Get insider trading data for portfolio symbols, optionally limited to a date range"""
     try:
-        data = data_service.get_insider_trading()
-        return jsonify(data)
+        return _date_range_response('insider', data_service.get_insider_trading)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/block_deals')
 def get_block_deals_data():
-    """Get block deals data for portfolio symbols"""
+    """Get block deals data for portfolio symbols, optionally limited to a date range"""
     try:
-        data = data_service.get_block_deals()
-        return jsonify(data)
+        return _date_range_response('block_deals', data_service.get_block_deals)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/bulk_deals')
 def get_bulk_deals_data():
-    """Get bulk deals data for portfolio symbols"""
+    """Get bulk deals data for portfolio symbols, optionally limited to a date range"""
     try:
-        data = data_service.get_bulk_deals()
-        return jsonify(data)
+        return _date_range_response('bulk_deals', data_service.get_bulk_deals)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -132,8 +327,11 @@ def get_bulk_deals_data():
 def get_vol_deviation():
     """Get volume deviation data for portfolio symbols"""
     try:
-        data = data_service.get_volume_deviation()
-        return jsonify(data)
+        return _cached_dataset_response(
+            'volume', lambda: data_service.get_volume_deviation(stream=True), stream=True
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -141,17 +339,38 @@ def get_vol_deviation():
 def get_deliv_deviation():
     """Get delivery deviation data for portfolio symbols"""
     try:
-        data = data_service.get_delivery_deviation()
-        return jsonify(data)
+        return _cached_dataset_response(
+            'delivery', lambda: data_service.get_delivery_deviation(stream=True), stream=True
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/news')
 def get_news():
-    """Get latest news data"""
+    """Get a page of latest news, filtered by source, category and headline search"""
+    try:
+        params = {
+            "source": request.args.get("source") or None,
+            "category": request.args.get("category") or None,
+            "q": (request.args.get("q") or "").strip() or None,
+            "before": request.args.get("before") or None,
+            "limit": request.args.get("limit", type=int)
+        }
+        if "limit" in request.args and params["limit"] is None:
+            return jsonify({"error": "limit must be an integer"}), 400
+        return _cached_dataset_response('news', lambda: data_service.get_news(**params))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/news/filters')
+def get_news_filters():
+    """Get available news sources and categories"""
     try:
-        data = data_service.get_news()
-        return jsonify(data)
+        return _cached_dataset_response('news_filters', data_service.get_news_filters)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -159,21 +378,139 @@ def get_news():
 
 @api_bp.route('/refresh-data-sync', methods=['POST'])
 def refresh_data_sync():
-    """Trigger synchronous data refresh"""
+    """Queue a data refresh job (or join the active one) and return its job ID"""
     try:
         scheduler_service = current_app.scheduler_service
-        result = scheduler_service.refresh_data_sync()
-        return jsonify(result)
+        result = scheduler_service.request_refresh("data")
+        return jsonify(result), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route('/refresh-news-sync', methods=['POST'])
 def refresh_news_sync():
-    """Trigger synchronous news refresh"""
+    """Queue a news refresh job (or join the active one) and return its job ID"""
     try:
         scheduler_service = current_app.scheduler_service
-        result = scheduler_service.refresh_news_sync()
-        return jsonify(result)
+        result = scheduler_service.request_refresh("news")
+        return jsonify(result), 202
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get refresh job status, per-script progress and logs"""
+    try:
+        job = job_service.get_job(job_id)
+        if job is None:
+            return jsonify({"error": f"Job {job_id} not found"}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running refresh job"""
+    try:
+        scheduler_service = current_app.scheduler_service
+        job = scheduler_service.cancel_job(job_id)
+        if job is None:
+            existing = job_service.get_job(job_id)
+            if existing is None:
+                return jsonify({"error": f"Job {job_id} not found"}), 404
+            return jsonify({"error": f"Job {job_id} already {existing['status']}"}), 409
+        message = "Job cancelled." if job["status"] == "cancelled" else "Cancellation requested."
+        return jsonify({"job_id": job["id"], "status": job["status"], "message": message}), 202
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/jobs/<int:job_id>/stream', methods=['GET'])
+def stream_job_logs(job_id):
+    """Stream a job's log lines as Server-Sent Events while it runs
+    
+    Each response lasts at most JOB_LOG_CONFIG['stream_seconds']; EventSource
+    reconnects with Last-Event-ID and the stream resumes after that line. A
+    final 'done' event carries the job status.
+    """
+    try:
+        after_id = int(request.headers.get("Last-Event-ID") or request.args.get("after") or 0)
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+    try:
+        if job_service.get_job_status(job_id) is None:
+            return jsonify({"error": f"Job {job_id} not found"}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    config = current_app.config['JOB_LOG_CONFIG']
+    dumps = current_app.json.dumps
+    
+    def sse(lines):
+        return "".join(
+            f"id: {line_id}\n" + "".join(f"data: {part}\n" for part in line.split("\n")) + "\n"
+            for line_id, line in lines
+        )
+    
+    def generate():
+        last_id = after_id
+        deadline = time.time() + config['stream_seconds']
+        yield f"retry: {config['stream_retry_ms']}\n\n"
+        while time.time() < deadline:
+            lines = job_service.get_log_lines(job_id, last_id)
+            if lines:
+                last_id = lines[-1][0]
+                yield sse(lines)
+                continue
+            status = job_service.get_job_status(job_id)
+            if status not in JobService.ACTIVE_STATUSES:
+                # Lines are stored before a job is marked finished; send any that
+                # arrived between the two queries, then say the job is done
+                lines = job_service.get_log_lines(job_id, last_id)
+                while lines:
+                    last_id = lines[-1][0]
+                    yield sse(lines)
+                    lines = job_service.get_log_lines(job_id, last_id)
+                yield f"event: done\ndata: {dumps({'job_id': job_id, 'status': status})}\n\n"
+                return
+            yield ": keepalive\n\n"
+            time.sleep(config['stream_poll_interval'])
+    
+    response = current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # let nginx pass events through unbuffered
+    return response
+
+@api_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Get recent refresh jobs with their durations, newest first"""
+    try:
+        kind = request.args.get("kind") or None
+        limit = min(request.args.get("limit", 50, type=int), 500)
+        return jsonify(job_service.get_jobs(kind=kind, limit=limit))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/job-runs', methods=['GET'])
+def list_job_runs():
+    """Get per-stage run history with durations, row counts and bytes downloaded"""
+    try:
+        runs = job_service.get_runs(
+            job_id=request.args.get("job_id", type=int),
+            kind=request.args.get("kind") or None,
+            stage=request.args.get("stage") or None,
+            status=request.args.get("status") or None,
+            days=request.args.get("days", 7, type=int),
+            limit=min(request.args.get("limit", 200, type=int), 2000)
+        )
+        return jsonify(runs)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route('/job-runs/summary', methods=['GET'])
+def job_runs_summary():
+    """Get per-stage duration percentiles and failure counts, slowest first"""
+    try:
+        days = request.args.get("days", 30, type=int)
+        return jsonify(job_service.get_run_summary(days=days))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -207,6 +544,29 @@ def get_scheduler_status():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@api_bp.route("/scheduler/runner", methods=["GET"])
+def get_script_runner_metrics():
+    """Get script runner mode, average per-script startup time and host details
+    
+    Scripts run on the scheduler leader, so other workers report no runs.
+    """
+    try:
+        scheduler_service = current_app.scheduler_service
+        metrics = scheduler_service.script_runner.get_metrics()
+        metrics["is_leader"] = scheduler_service.is_leader()
+        return jsonify(metrics)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@api_bp.route("/scheduler/news-sources", methods=["GET"])
+def get_news_polling_schedule():
+    """Get each news source's adaptive polling interval, yield estimate and next run"""
+    try:
+        scheduler_service = current_app.scheduler_service
+        return jsonify(scheduler_service.news_polling.get_schedule())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @api_bp.route("/scheduler", methods=["POST"])
 def toggle_scheduler():
     """Toggle scheduler for data or news"""
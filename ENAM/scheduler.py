@@ -0,0 +1,34 @@
+import os
+import signal
+import threading
+
+# This process is the scheduler; it campaigns for leadership itself
+os.environ['SCHEDULER_AUTOSTART'] = '1'
+
+from app import create_app
+
+
+def main():
+    """Run scheduled and queued jobs in a dedicated, long-lived process
+
+    Request workers are recycled (max_requests, timeouts), which would kill the
+    leader's running jobs; this process only exits when the server stops.
+    """
+    application = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+    stopping = threading.Event()
+
+    def handle_signal(signum, frame):
+        print(f"[INFO] Scheduler process received signal {signum}; shutting down")
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    print(f"[INFO] Scheduler process {os.getpid()} started")
+    while not stopping.wait(1):
+        pass
+    application.scheduler_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,34 @@ Services package for Flask application.
 This package contains all business logic services:
 - DataService: Data processing and scraping operations
 - FileService: File I/O operations
+- JobService: Refresh job queue
 - PortfolioService: Portfolio management operations
 - SchedulerService: Background job scheduling
 """
 
-from .data_service import DataService
-from .file_service import FileService
-from .portfolio_service import PortfolioService
-from .scheduler_service import SchedulerService
+import importlib
+
+# Services are imported on first use, so scripts can import a light module
+# such as services.trading_calendar without pulling in the web app's
+# database and scheduler dependencies
+_SERVICE_MODULES = {
+    'DataService': '.data_service',
+    'FileService': '.file_service',
+    'JobService': '.job_service',
+    'PortfolioService': '.portfolio_service',
+    'SchedulerService': '.scheduler_service'
+}
 
 __all__ = [
     'DataService',
     'FileService',
+    'JobService',
     'SchedulerService',
     'PortfolioService'
 ]
+
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        return getattr(importlib.import_module(_SERVICE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,215 @@
+import os
+import gzip
+import zlib
+import hashlib
+import mimetypes
+from flask import current_app, request, send_file
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# text/event-stream is left out: a compressor holds back small SSE events
+# until it has a full block, which defeats live streaming
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/css',
+    'text/html',
+    'text/plain',
+    'text/csv',
+    'image/svg+xml'
+}
+
+PRECOMPRESS_EXTENSIONS = {'.js', '.css', '.svg', '.ico', '.html', '.json', '.txt', '.csv'}
+
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class StaticAsset:
+    """A fingerprinted static file and its precompressed variants"""
+
+    def __init__(self, path, digest, mimetype, variants):
+        self.path = path
+        self.digest = digest
+        self.mimetype = mimetype
+        self.variants = variants  # encoding -> path of the precompressed copy
+
+
+class CompressionService:
+    """Content-negotiated compression for responses and precompressed static assets"""
+
+    def __init__(self, config=None):
+        self.config = (config or {}).get('COMPRESSION_CONFIG', Config.COMPRESSION_CONFIG)
+        self.static_dir = (config or {}).get('STATIC_DIR', Config.STATIC_DIR)
+        self.cache_dir = (config or {}).get('STATIC_CACHE_DIR', Config.STATIC_CACHE_DIR)
+        self.assets = {}
+
+    def init_app(self, app):
+        """Build the static manifest and hook compression into the app"""
+        self.build_static()
+        app.view_functions['static'] = self.serve_static
+        app.url_defaults(self.add_fingerprint)
+        app.after_request(self.compress_response)
+        app.compression_service = self
+
+    # === Static Assets ===
+
+    def build_static(self):
+        """Fingerprint static files and write .gz/.br copies of compressible ones
+
+        Copies are keyed by content digest, so unchanged files are not recompressed
+        on restart and stale copies are never served.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        excluded = tuple(os.path.join(self.static_dir, d) + os.sep for d in self.config['static_exclude'])
+        assets = {}
+
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if path.startswith(excluded):
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+
+                digest = hashlib.md5(data).hexdigest()[:12]
+                extension = os.path.splitext(name)[1].lower()
+                variants = {}
+                if extension in PRECOMPRESS_EXTENSIONS:
+                    for encoding in self._available_encodings():
+                        target = os.path.join(self.cache_dir, digest + extension + ENCODING_SUFFIXES[encoding])
+                        if not os.path.exists(target):
+                            compressed = self._compress(data, encoding, static=True)
+                            if len(compressed) >= len(data):
+                                continue
+                            self._write_atomic(target, compressed)
+                        variants[encoding] = target
+
+                filename = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                assets[filename] = StaticAsset(path, digest, mimetype, variants)
+
+        self.assets = assets
+        print(f"[INFO] Prepared {len(assets)} static assets "
+              f"({sum(len(a.variants) for a in assets.values())} precompressed copies)")
+        return assets
+
+    def add_fingerprint(self, endpoint, values):
+        """Append ?v=<digest> to url_for('static', ...) URLs"""
+        if endpoint == 'static' and 'v' not in values:
+            asset = self.assets.get(values.get('filename'))
+            if asset:
+                values['v'] = asset.digest
+
+    def serve_static(self, filename):
+        """Serve a static file, preferring a precompressed copy the client accepts"""
+        asset = self.assets.get(filename)
+        if asset is None:
+            response = current_app.send_static_file(filename)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        encoding = self.negotiate(asset.variants)
+        if encoding:
+            response = send_file(
+                asset.variants[encoding],
+                mimetype=asset.mimetype,
+                conditional=True,
+                etag=f"{asset.digest}-{encoding}"
+            )
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = send_file(asset.path, mimetype=asset.mimetype, conditional=True, etag=asset.digest)
+
+        response.vary.add('Accept-Encoding')
+        if request.args.get('v') == asset.digest:
+            response.headers['Cache-Control'] = f"public, max-age={self.config['static_max_age']}, immutable"
+        else:
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    # === Dynamic Responses ===
+
+    def compress_response(self, response):
+        """Compress JSON/text responses above min_size, including streamed ones"""
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if not response.is_streamed and response.calculate_content_length() < self.config['min_size']:
+            return response
+
+        encoding = self.negotiate(self._available_encodings())
+        if not encoding:
+            return response
+
+        if response.is_streamed:
+            response.response = self._compress_stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(self._compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+
+        # The encoded bytes differ from the identity body, so the validator becomes weak
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def negotiate(self, encodings):
+        """Pick the best encoding from those offered that the client accepts"""
+        accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for encoding in ('br', 'gzip'):
+            if encoding in encodings and accepted[encoding] > best_quality:
+                best, best_quality = encoding, accepted[encoding]
+        return best
+
+    def _available_encodings(self):
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def _compress(self, data, encoding, static=False):
+        if encoding == 'br':
+            quality = 11 if static else self.config['brotli_quality']
+            return brotli.compress(data, quality=quality)
+        level = 9 if static else self.config['gzip_level']
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def _compress_stream(self, chunks, encoding):
+        """Compress an iterable body chunk by chunk"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.config['brotli_quality'])
+            process, finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.config['gzip_level'], zlib.DEFLATED, 31)
+            process, finish = compressor.compress, compressor.flush
+
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                data = process(chunk)
+                if data:
+                    yield data
+            yield finish()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    # Build step: python -m services.compression_service
+    CompressionService().build_static()
@@ -1,172 +1,290 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import base64
 import datetime
+from psycopg2.extras import RealDictCursor
 from config import Config
+from services.db_pool import get_pool
 
 class DataService:
     """Service for handling database operations and data retrieval"""
     
+    NEWS_DEFAULT_LIMIT = 50
+    NEWS_MAX_LIMIT = 200
+    
+    # Named windows used by the 1 Day / 1 Week / 1 Month table filters
+    DATE_RANGES = {
+        '1day': datetime.timedelta(days=1),
+        '1week': datetime.timedelta(days=7),
+        '1month': datetime.timedelta(days=30)
+    }
+    
     def __init__(self):
         self.db_config = Config.DB_CONFIG
+        self.stream_itersize = Config.API_STREAM_CONFIG['itersize']
     
     def get_db_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(**self.db_config)
+        """Check out a pooled database connection (use as a context manager)"""
+        return get_pool().connection()
+    
+    def get_pool_status(self):
+        """Get connection pool metrics for the current worker"""
+        return get_pool().get_metrics()
     
     def set_last_updated(self, key):
         """Set last updated timestamp for a given key"""
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn, conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO last_updated (key, timestamp)
-                    VALUES (%s, %s)
-                    ON CONFLICT (key) DO UPDATE SET timestamp = EXCLUDED.timestamp;
-                """, (key, datetime.datetime.now()))
-        finally:
-            conn.close()
+                self._touch_last_updated(cur, key)
+    
+    def _touch_last_updated(self, cur, key):
+        """Bump the last updated timestamp for a key within an open transaction"""
+        cur.execute("""
+            INSERT INTO last_updated (key, timestamp)
+            VALUES (%s, %s)
+            ON CONFLICT (key) DO UPDATE SET timestamp = EXCLUDED.timestamp;
+        """, (key, datetime.datetime.now()))
     
     def get_last_updated(self, key):
         """Get last updated timestamp for a given key"""
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT timestamp FROM last_updated WHERE key = %s;", (key,))
                 result = cur.fetchone()
             return result[0].strftime("%Y-%m-%d %H:%M:%S") if result else None
-        finally:
-            conn.close()
     
-    def get_corp_actions(self):
-        """Get corporate actions for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT ca.*
-                    FROM corp_actions ca
-                    JOIN symbols s ON TRIM(ca.security_name) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
-                """)
-                return cur.fetchall()
-        finally:
-            conn.close()
+    def get_cache_version(self, keys):
+        """Get a version string for cached responses built from last updated keys"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT key, timestamp FROM last_updated WHERE key = ANY(%s);",
+                    (list(keys),)
+                )
+                stamps = dict(cur.fetchall())
+        return ";".join(
+            f"{key}={stamps[key].isoformat() if key in stamps else ''}" for key in keys
+        )
     
-    def get_announcements(self):
-        """Get announcements for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT a.*
-                    FROM announcements a
-                    JOIN symbols s ON TRIM(a.stock) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
-                """)
-                return cur.fetchall()
-        finally:
-            conn.close()
+    def resolve_date_range(self, range_key=None, date_from=None, date_to=None):
+        """Resolve a named range or explicit from/to dates into an inclusive (start, end) window"""
+        if date_from or date_to:
+            try:
+                start = datetime.date.fromisoformat(date_from) if date_from else None
+                end = datetime.date.fromisoformat(date_to) if date_to else None
+            except ValueError:
+                raise ValueError("from/to must be dates in YYYY-MM-DD format")
+            if start and end and start > end:
+                raise ValueError("from must not be after to")
+            return start, end
+        
+        if not range_key or range_key == 'all_time':
+            return None, None
+        if range_key not in self.DATE_RANGES:
+            raise ValueError(f"Invalid range '{range_key}'")
+        return datetime.date.today() - self.DATE_RANGES[range_key], None
     
-    def get_insider_trading(self):
-        """Get insider trading data for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT i.*
-                    FROM insider_trading i
-                    JOIN symbols s ON TRIM(i.stock) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
-                """)
-                return cur.fetchall()
-        finally:
-            conn.close()
+    def _date_window(self, column, start, end):
+        """Build SQL conditions restricting a date or timestamp column to a window"""
+        conditions, params = [], []
+        if start:
+            conditions.append(f"{column} >= %s")
+            params.append(start)
+        if end:
+            conditions.append(f"{column} < %s")
+            params.append(end + datetime.timedelta(days=1))
+        return conditions, params
     
-    def get_block_deals(self):
-        """Get block deals data for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
+    def _fetch_rows(self, query, params=None, stream=False):
+        """Run a read query, returning every row or a lazy iterator over the rows"""
+        if stream:
+            return self._stream_rows(query, params)
+        with self.get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT 
-                        b.source,
-                        b.deal_date,
-                        b.security_name,
-                        b.client_name,
-                        b.deal_type,
-                        b.quantity,
-                        b.trade_price
-                    FROM block_deals b
-                    JOIN symbols s ON TRIM(b.security_name) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
-                """)
+                cur.execute(query, params)
                 return cur.fetchall()
-        finally:
-            conn.close()
     
-    def get_bulk_deals(self):
-        """Get bulk deals data for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT 
-                        b.source,
-                        b.deal_date,
-                        b.security_name,
-                        b.client_name,
-                        b.deal_type,
-                        b.quantity,
-                        b.price
-                    FROM bulk_deals b
-                    JOIN symbols s ON TRIM(b.security_name) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
-                """)
-                return cur.fetchall()
-        finally:
-            conn.close()
+    def _stream_rows(self, query, params=None):
+        """Yield rows from a named server-side cursor, itersize rows per round trip
+        
+        The pooled connection stays checked out until the generator is exhausted
+        or closed, so callers must always consume or close it.
+        """
+        with self.get_db_connection() as conn:
+            with conn.cursor(name="dataset_stream", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = self.stream_itersize
+                cur.execute(query, params)
+                for row in cur:
+                    yield row
+    
+    def get_corp_actions(self, stream=False):
+        """Get corporate actions for active portfolio symbols"""
+        return self._fetch_rows("""
+            SELECT ca.*
+            FROM corp_actions ca
+            JOIN symbols s ON s.symbol_key = ca.symbol_key
+            WHERE s.status = TRUE
+        """, stream=stream)
+    
+    def get_announcements(self, start=None, end=None, stream=False):
+        """Get announcements for active portfolio symbols within an optional date window"""
+        conditions, params = self._date_window("a.time", start, end)
+        return self._fetch_rows(f"""
+            SELECT
+                a.id,
+                a.stock,
+                a.subject,
+                a.announcement,
+                a.attachment,
+                to_char(a.time, 'YYYY-MM-DD HH24:MI:SS') AS time,
+                a.scraped_at
+            FROM announcements a
+            JOIN symbols s ON s.symbol_key = a.symbol_key
+            WHERE {" AND ".join(["s.status = TRUE"] + conditions)}
+            ORDER BY a.time DESC NULLS LAST
+        """, params, stream)
+    
+    def get_insider_trading(self, start=None, end=None, stream=False):
+        """Get insider trading data for active portfolio symbols within an optional date window"""
+        conditions, params = self._date_window("i.time", start, end)
+        return self._fetch_rows(f"""
+            SELECT
+                i.id,
+                i.stock,
+                i.clause,
+                i.name,
+                i.type,
+                i.amount,
+                i.value,
+                i.transaction,
+                i.attachment,
+                to_char(i.time, 'YYYY-MM-DD HH24:MI:SS') AS time,
+                i.scraped_at
+            FROM insider_trading i
+            JOIN symbols s ON s.symbol_key = i.symbol_key
+            WHERE {" AND ".join(["s.status = TRUE"] + conditions)}
+            ORDER BY i.time DESC NULLS LAST
+        """, params, stream)
     
-    def get_volume_deviation(self):
+    def get_block_deals(self, start=None, end=None, stream=False):
+        """Get block deals data for active portfolio symbols within an optional date window"""
+        conditions, params = self._date_window("b.deal_date", start, end)
+        return self._fetch_rows(f"""
+            SELECT 
+                b.source,
+                to_char(b.deal_date, 'DD/MM/YYYY') AS deal_date,
+                b.security_name,
+                b.client_name,
+                b.deal_type,
+                b.quantity,
+                b.trade_price
+            FROM block_deals b
+            JOIN symbols s ON s.symbol_key = b.symbol_key
+            WHERE {" AND ".join(["s.status = TRUE"] + conditions)}
+            ORDER BY b.deal_date DESC
+        """, params, stream)
+    
+    def get_bulk_deals(self, start=None, end=None, stream=False):
+        """Get bulk deals data for active portfolio symbols within an optional date window"""
+        conditions, params = self._date_window("b.deal_date", start, end)
+        return self._fetch_rows(f"""
+            SELECT 
+                b.source,
+                to_char(b.deal_date, 'DD/MM/YYYY') AS deal_date,
+                b.security_name,
+                b.client_name,
+                b.deal_type,
+                b.quantity,
+                b.price
+            FROM bulk_deals b
+            JOIN symbols s ON s.symbol_key = b.symbol_key
+            WHERE {" AND ".join(["s.status = TRUE"] + conditions)}
+            ORDER BY b.deal_date DESC
+        """, params, stream)
+    
+    def get_volume_deviation(self, stream=False):
         """Get volume deviation data for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT v.*
-                    FROM vol_deviation v
-                    JOIN symbols s ON TRIM(v.symbol) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
-                """)
-                return cur.fetchall()
-        finally:
-            conn.close()
+        return self._fetch_rows("""
+            SELECT v.*
+            FROM vol_deviation v
+            JOIN symbols s ON s.symbol_key = v.symbol_key
+            WHERE s.status = TRUE
+        """, stream=stream)
     
-    def get_delivery_deviation(self):
+    def get_delivery_deviation(self, stream=False):
         """Get delivery deviation data for active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
+        return self._fetch_rows("""
+            SELECT d.*
+            FROM deliv_deviation d
+            JOIN symbols s ON s.symbol_key = d.symbol_key
+            WHERE s.status = TRUE
+        """, stream=stream)
+    
+    def get_news(self, source=None, category=None, q=None, before=None, limit=None):
+        """Get a page of latest news, newest first, using keyset pagination"""
+        limit = self.NEWS_DEFAULT_LIMIT if limit is None else limit
+        if not 1 <= limit <= self.NEWS_MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {self.NEWS_MAX_LIMIT}")
+        
+        conditions = ["headline IS NOT NULL", "time IS NOT NULL"]
+        params = []
+        if source:
+            conditions.append("source = %s")
+            params.append(source)
+        if category:
+            conditions.append("category = %s")
+            params.append(category)
+        if q:
+            escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("headline ILIKE %s")
+            params.append(f"%{escaped}%")
+        if before:
+            conditions.append("(time, id) < (%s, %s)")
+            params.extend(self._decode_news_cursor(before))
+        
+        with self.get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(f"""
+                    SELECT id, source, headline, link, category, time
+                    FROM news
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY time DESC, id DESC
+                    LIMIT %s
+                """, params + [limit + 1])
+                rows = cur.fetchall()
+        
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self._encode_news_cursor(items[-1]["time"], items[-1]["id"])
+        return {"items": items, "next_cursor": next_cursor}
+    
+    def get_news_filters(self):
+        """Get the distinct news sources and categories for filter controls"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute("""
-                    SELECT d.*
-                    FROM deliv_deviation d
-                    JOIN symbols s ON TRIM(d.symbol) = TRIM(s.symbol)
-                    WHERE s.status = TRUE;
+                    SELECT DISTINCT source FROM news
+                    WHERE source IS NOT NULL AND headline IS NOT NULL AND time IS NOT NULL
+                    ORDER BY source
                 """)
-                return cur.fetchall()
-        finally:
-            conn.close()
-    
-    def get_news(self):
-        """Get latest news data"""
-        conn = self.get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                sources = [row[0] for row in cur.fetchall()]
                 cur.execute("""
-                    SELECT source, headline, link, category, time 
-                    FROM news
-                    WHERE headline IS NOT NULL AND time IS NOT NULL
-                    ORDER BY time DESC
+                    SELECT DISTINCT category FROM news
+                    WHERE category IS NOT NULL AND headline IS NOT NULL AND time IS NOT NULL
+                    ORDER BY category
                 """)
-                return cur.fetchall()
-        finally:
-            conn.close()
\ No newline at end of file
+                categories = [row[0] for row in cur.fetchall()]
+        return {"sources": sources, "categories": categories}
+    
+    def _encode_news_cursor(self, time_value, row_id):
+        """Encode the (time, id) position of the last row on a page"""
+        raw = f"{time_value}|{row_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    
+    def _decode_news_cursor(self, cursor):
+        """Decode a news cursor back into its (time, id) position"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            time_value, row_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+            return time_value, int(row_id)
+        except ValueError:
+            raise ValueError("Invalid news cursor")
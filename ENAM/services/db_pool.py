@@ -0,0 +1,199 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from config import Config
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool with health checks and metrics"""
+
+    def __init__(self, db_config, min_connections=1, max_connections=5,
+                 wait_timeout=10, health_check_interval=30, max_idle_time=300):
+        self.db_config = db_config
+        self.min_connections = min_connections
+        self.max_connections = max(max_connections, 1)
+        self.wait_timeout = wait_timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle_time = max_idle_time
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+        self._total = 0  # idle + checked out + being opened
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "discarded": 0
+        }
+
+    def getconn(self):
+        """Check out a healthy connection, waiting while the pool is exhausted"""
+        start = time.monotonic()
+        waited = False
+
+        while True:
+            candidate = None
+            with self._cond:
+                while not self._idle and self._total >= self.max_connections:
+                    remaining = self.wait_timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {self.wait_timeout}s "
+                            f"(max_connections={self.max_connections})"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                else:
+                    self._total += 1
+
+            if candidate is None:
+                break
+
+            conn, last_used = candidate
+            if self._is_healthy(conn, last_used):
+                self._record_checkout("hits", waited, start)
+                return conn
+            self._discard(conn)
+
+        try:
+            conn = psycopg2.connect(**self.db_config)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+        self._record_checkout("misses", waited, start)
+        return conn
+
+    def putconn(self, conn):
+        """Return a connection to the pool, rolling back any open transaction"""
+        if conn.closed:
+            self._discard(conn)
+            return
+
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except psycopg2.Error:
+            self._discard(conn)
+            return
+
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            self._idle.append((conn, now))
+            # Shed connections idle for too long, keeping at least min_connections around
+            while len(self._idle) > self.min_connections and \
+                    now - self._idle[0][1] > self.max_idle_time:
+                expired.append(self._idle.pop(0)[0])
+            self._cond.notify()
+
+        for stale in expired:
+            self._discard(stale)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks out a connection and always returns it"""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        """Close every idle connection held by the pool"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def get_metrics(self):
+        """Get pool sizing and hit/miss/wait counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            idle = len(self._idle)
+            total = self._total
+
+        checkouts = stats["hits"] + stats["misses"]
+        stats["wait_time"] = round(stats["wait_time"], 4)
+        stats.update({
+            "pid": self.pid,
+            "max_connections": self.max_connections,
+            "open_connections": total,
+            "idle_connections": idle,
+            "in_use_connections": total - idle,
+            "hit_ratio": round(stats["hits"] / checkouts, 4) if checkouts else None
+        })
+        return stats
+
+    def _is_healthy(self, conn, last_used):
+        """Check a pooled connection, pinging it if it sat idle for a while"""
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            with self._cond:
+                self._stats["health_check_failures"] += 1
+            return False
+
+    def _discard(self, conn):
+        """Close a connection and release its slot"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._total -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def _record_checkout(self, kind, waited, start):
+        with self._cond:
+            self._stats[kind] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += time.monotonic() - start
+
+
+_pool = None
+_pool_lock = threading.Lock()
+# Pools created before a fork (e.g. gunicorn preload_app) share sockets with the
+# parent; keep them referenced so garbage collection never closes them from here.
+_inherited_pools = []
+
+
+def get_pool():
+    """Get the connection pool for the current process, creating it after fork"""
+    global _pool
+    pid = os.getpid()
+    if _pool is not None and _pool.pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool.pid != pid:
+            if _pool is not None:
+                _inherited_pools.append(_pool)
+            _pool = ConnectionPool(Config.DB_CONFIG, **Config.DB_POOL_CONFIG)
+        return _pool
@@ -0,0 +1,89 @@
+import threading
+from collections import deque, Counter
+
+
+class JobLogWriter:
+    """Buffers job log lines in a bounded ring and writes them to job_log_lines in batches
+
+    Scripts can print faster than the database takes inserts; when the ring is
+    full the oldest unwritten lines are dropped and a warning saying how many
+    is written in their place, so memory stays bounded whatever a script prints.
+    """
+
+    def __init__(self, job_service, capacity=5000, flush_interval=1.0, batch_size=500):
+        self.job_service = job_service
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._ring = deque()
+        self._dropped = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self, job_id, line):
+        with self._lock:
+            if len(self._ring) >= self.capacity:
+                dropped_job_id, _ = self._ring.popleft()
+                self._dropped[dropped_job_id] += 1
+            self._ring.append((job_id, line))
+
+    def write_lines(self, job_id, lines):
+        for line in lines:
+            if line:
+                self.write(job_id, line)
+
+    def start(self):
+        """Start flushing in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write every buffered line; called before a job is marked finished"""
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._ring.popleft() for _ in range(min(self.batch_size, len(self._ring)))]
+                    dropped, self._dropped = self._dropped, Counter()
+                rows = [
+                    (job_id, f"[WARNING] {count} log line(s) dropped; the log buffer was full")
+                    for job_id, count in dropped.items()
+                ] + batch
+                if not rows:
+                    return
+                try:
+                    self.job_service.append_log_lines(rows)
+                except Exception as e:
+                    print(f"[ERROR] Could not write {len(rows)} job log line(s): {str(e)}")
+                    self._requeue(batch, dropped)
+                    return
+
+    def _requeue(self, batch, dropped):
+        """Put an unwritten batch back in front of newer lines, within capacity
+
+        As in write, the oldest lines give way when the ring is full and are
+        counted as dropped.
+        """
+        with self._lock:
+            self._dropped.update(dropped)
+            room = max(self.capacity - len(self._ring), 0)
+            overflow = len(batch) - room
+            if overflow > 0:
+                self._dropped.update(job_id for job_id, _ in batch[:overflow])
+                batch = batch[overflow:]
+            self._ring.extendleft(reversed(batch))
@@ -0,0 +1,346 @@
+import json
+from psycopg2 import errors
+from psycopg2.extras import RealDictCursor, execute_values
+from services.data_service import DataService
+
+class JobService(DataService):
+    """Service for the refresh job queue shared by all workers"""
+
+    JOB_KINDS = ('data', 'news')
+    ACTIVE_STATUSES = ('queued', 'running')
+    FINISHED_STEP_STATUSES = ('succeeded', 'failed', 'timed_out', 'cancelled', 'skipped')
+    # Active job scopes that already cover a request of each scope
+    SCOPE_COVERED_BY = {'all': ('all',), 'due': ('all', 'due')}
+    LOG_TAIL_LINES = 200
+
+    def enqueue(self, kind, requested_by="api", scope="all"):
+        """Queue a refresh job, or return an active job of the same kind that covers scope
+
+        A "due" request (scheduled news: only the sources that are due) joins
+        any active job of its kind; an "all" request only joins another "all"
+        job. Returns (job, coalesced) where coalesced is True if no new job
+        was created.
+        """
+        if kind not in self.JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        if scope not in self.SCOPE_COVERED_BY:
+            raise ValueError(f"Unknown job scope '{scope}'")
+
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT id, kind, scope, status, requested_at
+                    FROM refresh_jobs
+                    WHERE kind = %s AND scope = ANY(%s) AND status IN ('queued', 'running')
+                    ORDER BY id
+                    LIMIT 1;
+                """, (kind, list(self.SCOPE_COVERED_BY[scope])))
+                job = cur.fetchone()
+                if job:
+                    return job, True
+
+                # At most one active job per kind and scope (partial unique index)
+                cur.execute("""
+                    INSERT INTO refresh_jobs (kind, scope, status, requested_by)
+                    VALUES (%s, %s, 'queued', %s)
+                    ON CONFLICT (kind, scope) WHERE status IN ('queued', 'running') DO NOTHING
+                    RETURNING id, kind, scope, status, requested_at;
+                """, (kind, scope, requested_by))
+                job = cur.fetchone()
+
+        if job is None:
+            # Another request queued the same job between the two statements
+            return self.enqueue(kind, requested_by, scope)
+        return job, False
+
+    def claim_next(self, owner):
+        """Mark the oldest queued job as running and return it, or None
+
+        A job waits while another job of its kind is running, so a full
+        refresh queued behind a scheduled one does not run alongside it. The
+        NOT EXISTS check alone is racy; a concurrent claim of the same kind
+        fails on idx_refresh_jobs_running_kind and counts as nothing to claim.
+        """
+        with self.get_db_connection() as conn:
+            try:
+                with conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute("""
+                        UPDATE refresh_jobs
+                        SET status = 'running', started_at = NOW(), owner = %s
+                        WHERE id = (
+                            SELECT id FROM refresh_jobs q
+                            WHERE status = 'queued'
+                              AND NOT EXISTS (
+                                  SELECT 1 FROM refresh_jobs r
+                                  WHERE r.kind = q.kind AND r.status = 'running'
+                              )
+                            ORDER BY id
+                            LIMIT 1
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING id, kind, scope, requested_by;
+                    """, (owner,))
+                    return cur.fetchone()
+            except errors.UniqueViolation:
+                return None
+
+    def fail_orphaned(self, reason):
+        """Fail running jobs left behind by a previous leader"""
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE refresh_jobs
+                    SET status = 'failed', finished_at = NOW(), error = %s
+                    WHERE status = 'running';
+                """, (reason,))
+                return cur.rowcount
+
+    def set_steps(self, job_id, steps):
+        """Record the planned steps of a job, all pending"""
+        state = {step: {"status": "pending"} for step in steps}
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE refresh_jobs SET steps = %s::jsonb WHERE id = %s;",
+                    (json.dumps(state), job_id)
+                )
+
+    def update_step(self, job_id, step, status, details=None):
+        """Set the status of one step, stamping when it started or finished
+
+        details, such as the step's duration, are merged into the step.
+        """
+        stamp = "started_at" if status == "running" else "finished_at"
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE refresh_jobs
+                    SET steps = jsonb_set(
+                        steps, ARRAY[%s],
+                        coalesce(steps -> %s, '{}'::jsonb)
+                            || jsonb_build_object('status', %s::text, %s::text, to_char(NOW(), 'YYYY-MM-DD HH24:MI:SS'))
+                            || %s::jsonb
+                    )
+                    WHERE id = %s;
+                """, (step, step, status, stamp, json.dumps(details or {}), job_id))
+
+    def request_cancel(self, job_id):
+        """Flag a queued or running job for cancellation
+
+        A queued job is cancelled at once. Returns the job's id and status, or
+        None if there is no such job or it has already finished.
+        """
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    UPDATE refresh_jobs
+                    SET cancel_requested = TRUE,
+                        status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                        finished_at = CASE WHEN status = 'queued' THEN NOW() ELSE finished_at END,
+                        error = CASE WHEN status = 'queued' THEN 'Cancelled by request' ELSE error END
+                    WHERE id = %s AND status IN ('queued', 'running')
+                    RETURNING id, status;
+                """, (job_id,))
+                return cur.fetchone()
+
+    def get_cancel_requests(self, owner):
+        """Get ids of running jobs owned by owner that have been asked to cancel"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id FROM refresh_jobs
+                    WHERE status = 'running' AND cancel_requested AND owner = %s;
+                """, (owner,))
+                return [row[0] for row in cur.fetchall()]
+
+    def get_job_status(self, job_id):
+        """Get just the status of a job, or None if there is no such job"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT status FROM refresh_jobs WHERE id = %s;", (job_id,))
+                row = cur.fetchone()
+        return row[0] if row else None
+
+    def get_unsuccessful_steps(self, job_id):
+        """Get {step: status} for the steps of a job that did not succeed"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT key, value ->> 'status'
+                    FROM refresh_jobs, jsonb_each(steps)
+                    WHERE id = %s AND value ->> 'status' IS DISTINCT FROM 'succeeded'
+                    ORDER BY key;
+                """, (job_id,))
+                return dict(cur.fetchall())
+
+    def finish(self, job_id, status, error=None):
+        """Mark a job as succeeded, failed or cancelled"""
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE refresh_jobs
+                    SET status = %s, finished_at = NOW(), error = %s
+                    WHERE id = %s;
+                """, (status, error, job_id))
+
+    def get_job(self, job_id):
+        """Get a job with its step statuses, progress and most recent log lines
+
+        The full log is in job_log_lines (see get_log_lines).
+        """
+        with self.get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        id, kind, scope, status, requested_by, owner, error, cancel_requested, steps,
+                        to_char(requested_at, 'YYYY-MM-DD HH24:MI:SS') AS requested_at,
+                        to_char(started_at, 'YYYY-MM-DD HH24:MI:SS') AS started_at,
+                        to_char(finished_at, 'YYYY-MM-DD HH24:MI:SS') AS finished_at
+                    FROM refresh_jobs
+                    WHERE id = %s;
+                """, (job_id,))
+                job = cur.fetchone()
+
+        if job is None:
+            return None
+        steps = job["steps"] or {}
+        done = sum(1 for step in steps.values() if step.get("status") in self.FINISHED_STEP_STATUSES)
+        job["progress"] = {"done": done, "total": len(steps)}
+        job["logs"] = self.get_log_tail(job_id)
+        return job
+
+    # === Streamed Logs ===
+
+    def append_log_lines(self, rows):
+        """Insert (job_id, line) rows into job_log_lines"""
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                execute_values(cur, "INSERT INTO job_log_lines (job_id, line) VALUES %s", rows)
+
+    def get_log_lines(self, job_id, after_id=0, limit=500):
+        """Get a job's log lines with ids above after_id, oldest first"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT id, line FROM job_log_lines
+                    WHERE job_id = %s AND id > %s
+                    ORDER BY id
+                    LIMIT %s;
+                """, (job_id, after_id, limit))
+                return cur.fetchall()
+
+    def get_log_tail(self, job_id, limit=LOG_TAIL_LINES):
+        """Get a job's last limit log lines, oldest first"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT line FROM (
+                        SELECT id, line FROM job_log_lines
+                        WHERE job_id = %s
+                        ORDER BY id DESC
+                        LIMIT %s
+                    ) tail
+                    ORDER BY id;
+                """, (job_id, limit))
+                return [row[0] for row in cur.fetchall()]
+
+    def prune_log_lines(self, days):
+        """Delete the streamed logs of jobs that finished more than days ago"""
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM job_log_lines
+                    WHERE job_id IN (
+                        SELECT id FROM refresh_jobs
+                        WHERE finished_at < NOW() - %s * INTERVAL '1 day'
+                    );
+                """, (days,))
+                return cur.rowcount
+
+    # === Run History ===
+
+    def record_run(self, job_id, stage, status, duration_seconds, metrics=None):
+        """Record one finished stage of a job in job_runs"""
+        metrics = metrics or {}
+        rows_inserted = metrics.get("rows_inserted")
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO job_runs (
+                        job_id, kind, stage, status, returncode, runner_mode,
+                        started_at, duration_seconds, startup_seconds, rows_inserted, bytes_downloaded
+                    )
+                    SELECT id, kind, %s, %s, %s, %s,
+                           NOW() - %s * INTERVAL '1 second', %s, %s, %s::jsonb, %s
+                    FROM refresh_jobs
+                    WHERE id = %s;
+                """, (
+                    stage, status, metrics.get("returncode"), metrics.get("mode"),
+                    duration_seconds, duration_seconds, metrics.get("startup_seconds"),
+                    json.dumps(rows_inserted) if rows_inserted is not None else None,
+                    metrics.get("bytes_downloaded"), job_id
+                ))
+
+    def get_jobs(self, kind=None, limit=50):
+        """Get the most recent jobs with their durations, newest first"""
+        with self.get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        id, kind, scope, status, requested_by, owner, error,
+                        to_char(requested_at, 'YYYY-MM-DD HH24:MI:SS') AS requested_at,
+                        to_char(started_at, 'YYYY-MM-DD HH24:MI:SS') AS started_at,
+                        to_char(finished_at, 'YYYY-MM-DD HH24:MI:SS') AS finished_at,
+                        round(extract(epoch FROM finished_at - started_at)::numeric, 3)::float AS duration_seconds
+                    FROM refresh_jobs
+                    WHERE %(kind)s::text IS NULL OR kind = %(kind)s
+                    ORDER BY id DESC
+                    LIMIT %(limit)s;
+                """, {"kind": kind, "limit": limit})
+                return cur.fetchall()
+
+    def get_runs(self, job_id=None, kind=None, stage=None, status=None, days=7, limit=200):
+        """Get stage runs, newest first, optionally filtered"""
+        with self.get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        id, job_id, kind, stage, status, returncode, runner_mode,
+                        to_char(started_at, 'YYYY-MM-DD HH24:MI:SS') AS started_at,
+                        to_char(finished_at, 'YYYY-MM-DD HH24:MI:SS') AS finished_at,
+                        duration_seconds::float AS duration_seconds,
+                        startup_seconds::float AS startup_seconds,
+                        rows_inserted, bytes_downloaded
+                    FROM job_runs
+                    WHERE started_at >= NOW() - %(days)s * INTERVAL '1 day'
+                      AND (%(job_id)s::bigint IS NULL OR job_id = %(job_id)s)
+                      AND (%(kind)s::text IS NULL OR kind = %(kind)s)
+                      AND (%(stage)s::text IS NULL OR stage = %(stage)s)
+                      AND (%(status)s::text IS NULL OR status = %(status)s)
+                    ORDER BY id DESC
+                    LIMIT %(limit)s;
+                """, {"job_id": job_id, "kind": kind, "stage": stage, "status": status,
+                      "days": days, "limit": limit})
+                return cur.fetchall()
+
+    def get_run_summary(self, days=30):
+        """Get per-stage run counts, failure counts and duration percentiles"""
+        with self.get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        kind, stage,
+                        count(*) AS runs,
+                        count(*) FILTER (WHERE status <> 'succeeded') AS unsuccessful,
+                        count(*) FILTER (WHERE status = 'timed_out') AS timed_out,
+                        round(avg(duration_seconds), 3)::float AS avg_seconds,
+                        round(percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_seconds)::numeric, 3)::float AS p50_seconds,
+                        round(percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_seconds)::numeric, 3)::float AS p95_seconds,
+                        round(avg(bytes_downloaded))::bigint AS avg_bytes_downloaded,
+                        to_char(max(started_at), 'YYYY-MM-DD HH24:MI:SS') AS last_run_at
+                    FROM job_runs
+                    WHERE started_at >= NOW() - %s * INTERVAL '1 day'
+                    GROUP BY kind, stage
+                    ORDER BY p95_seconds DESC;
+                """, (days,))
+                return cur.fetchall()
@@ -0,0 +1,119 @@
+import os
+import socket
+import threading
+import psycopg2
+from config import Config
+
+
+class LeaderElector:
+    """Elects one process, across workers and hosts, using a Postgres advisory lock
+
+    The lock is held by a dedicated session, so it is released by the server as
+    soon as the leader's connection drops (process exit, crash or network loss)
+    and a standby takes over on its next attempt.
+    """
+
+    def __init__(self, lock_key, on_elected, on_demoted, retry_interval=15,
+                 heartbeat_interval=10, db_config=None):
+        self.lock_key = lock_key
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.retry_interval = retry_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.db_config = db_config or Config.DB_CONFIG
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.is_leader = False
+        self._conn = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start campaigning for leadership in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="leader-elector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Step down and stop campaigning"""
+        self._stop.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.heartbeat_interval + 5)
+        self._demote()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.is_leader:
+                if not self._heartbeat():
+                    print(f"[ERROR] Leader {self.identity} lost its lock session; stepping down")
+                    self._demote()
+                    continue
+                self._stop.wait(self.heartbeat_interval)
+            else:
+                if self._try_acquire():
+                    self._promote()
+                    continue
+                self._stop.wait(self.retry_interval)
+
+    def _connect(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(
+                **self.db_config,
+                application_name=f"enam-leader-{self.identity}",
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=3
+            )
+            self._conn.autocommit = True
+        return self._conn
+
+    def _try_acquire(self):
+        try:
+            with self._connect().cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s);", (self.lock_key,))
+                return cur.fetchone()[0]
+        except psycopg2.Error as e:
+            print(f"[ERROR] Leader election attempt failed: {str(e)}")
+            self._close()
+            return False
+
+    def _heartbeat(self):
+        # A session-level advisory lock lives exactly as long as its session
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            return True
+        except (psycopg2.Error, AttributeError):
+            return False
+
+    def _promote(self):
+        self.is_leader = True
+        print(f"[INFO] {self.identity} elected scheduler leader")
+        try:
+            self.on_elected()
+        except Exception as e:
+            print(f"[ERROR] Failed to start as leader: {str(e)}")
+            self._demote()
+            self._stop.wait(self.retry_interval)
+
+    def _demote(self):
+        was_leader, self.is_leader = self.is_leader, False
+        if was_leader:
+            try:
+                self.on_demoted()
+            except Exception as e:
+                print(f"[ERROR] Failed to stop as leader: {str(e)}")
+            print(f"[INFO] {self.identity} is no longer scheduler leader")
+        # Closing the session releases the advisory lock
+        self._close()
+
+    def _close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
@@ -0,0 +1,113 @@
+from psycopg2.extras import RealDictCursor
+from services.data_service import DataService
+from config import Config
+
+
+def next_interval(interval, ewma_yield, config):
+    """Scale a source's polling interval so a run finds about target_yield new articles
+
+    Each step changes the interval by at most backoff_limit (slower) or
+    speedup_limit (faster), and the result stays within min/max_interval.
+    """
+    factor = config['target_yield'] / max(ewma_yield, config['min_yield_estimate'])
+    factor = min(max(factor, config['speedup_limit']), config['backoff_limit'])
+    return min(max(interval * factor, config['min_interval']), config['max_interval'])
+
+
+class NewsPollingService(DataService):
+    """Per-source news polling intervals that adapt to how many new articles each run finds"""
+
+    def __init__(self, config=None):
+        super().__init__()
+        self.polling_config = (config or {}).get('NEWS_POLLING_CONFIG', Config.NEWS_POLLING_CONFIG)
+
+    def get_due_scripts(self, scripts):
+        """Get the scripts whose next run is due, including ones never run"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT script FROM news_source_schedule
+                    WHERE script = ANY(%s) AND next_run_at > NOW();
+                """, (list(scripts),))
+                not_due = {row[0] for row in cur.fetchall()}
+        return [script for script in scripts if script not in not_due]
+
+    def max_news_id(self):
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT coalesce(max(id), 0) FROM news;")
+                return cur.fetchone()[0]
+
+    def count_new_articles(self, source, after_id):
+        """Count articles of a source inserted after after_id"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT count(*) FROM news WHERE source = %s AND id > %s;", (source, after_id))
+                return cur.fetchone()[0]
+
+    def record_run(self, script, source, new_articles, succeeded=True):
+        """Update a source's yield estimate and schedule its next run
+
+        Failed runs say nothing about yield, so they keep the current interval.
+        """
+        config = self.polling_config
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT interval_minutes, ewma_yield, runs
+                    FROM news_source_schedule
+                    WHERE script = %s
+                    FOR UPDATE;
+                """, (script,))
+                current = cur.fetchone()
+
+                interval = float(current["interval_minutes"]) if current else float(config['initial_interval'])
+                ewma_yield = float(current["ewma_yield"]) if current and current["runs"] else None
+                if succeeded:
+                    alpha = config['ewma_alpha']
+                    ewma_yield = new_articles if ewma_yield is None else alpha * new_articles + (1 - alpha) * ewma_yield
+                    interval = next_interval(interval, ewma_yield, config)
+
+                cur.execute("""
+                    INSERT INTO news_source_schedule (
+                        script, source, interval_minutes, ewma_yield, last_yield,
+                        runs, failures, last_run_at, next_run_at
+                    )
+                    VALUES (%(script)s, %(source)s, %(interval)s, %(ewma)s, %(yield)s,
+                            %(runs)s, %(failures)s, NOW(), NOW() + %(interval)s * INTERVAL '1 minute')
+                    ON CONFLICT (script) DO UPDATE SET
+                        source = EXCLUDED.source,
+                        interval_minutes = EXCLUDED.interval_minutes,
+                        ewma_yield = EXCLUDED.ewma_yield,
+                        last_yield = coalesce(EXCLUDED.last_yield, news_source_schedule.last_yield),
+                        runs = news_source_schedule.runs + EXCLUDED.runs,
+                        failures = news_source_schedule.failures + EXCLUDED.failures,
+                        last_run_at = EXCLUDED.last_run_at,
+                        next_run_at = EXCLUDED.next_run_at;
+                """, {
+                    "script": script,
+                    "source": source,
+                    "interval": round(interval, 2),
+                    "ewma": round(ewma_yield or 0.0, 3),
+                    "yield": new_articles if succeeded else None,
+                    "runs": int(succeeded),
+                    "failures": int(not succeeded)
+                })
+        return {"interval_minutes": round(interval, 2), "ewma_yield": round(ewma_yield or 0.0, 3)}
+
+    def get_schedule(self):
+        """Get every source's interval, yield estimate and next run, soonest first"""
+        with self.get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        script, source,
+                        interval_minutes::float AS interval_minutes,
+                        ewma_yield::float AS ewma_yield,
+                        last_yield, runs, failures,
+                        to_char(last_run_at, 'YYYY-MM-DD HH24:MI:SS') AS last_run_at,
+                        to_char(next_run_at, 'YYYY-MM-DD HH24:MI:SS') AS next_run_at
+                    FROM news_source_schedule
+                    ORDER BY next_run_at;
+                """)
+                return cur.fetchall()
@@ -0,0 +1,102 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+def logs_failed(logs):
+    """A step failed if any of its log lines is an error"""
+    return any(line.startswith("[ERROR]") for line in logs if line)
+
+
+class PipelineStage:
+    """One stage of a pipeline and the stages it must run after"""
+
+    def __init__(self, name, script, args=None, after=None, resource="requests", marks=None):
+        self.name = name
+        self.script = script
+        self.args = list(args or [])
+        self.after = list(after or [])
+        self.resource = resource  # "selenium" or "requests" slot
+        self.marks = marks        # last_updated key to set when the stage succeeds
+
+    @classmethod
+    def from_config(cls, entry):
+        return cls(**entry)
+
+
+class Pipeline:
+    """A DAG of stages; each stage starts as soon as everything it runs after has succeeded"""
+
+    def __init__(self, stages):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Pipeline stage names must be unique")
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_config(cls, entries):
+        return cls([PipelineStage.from_config(entry) for entry in entries])
+
+    def _topological_order(self):
+        for stage in self.stages.values():
+            unknown = [name for name in stage.after if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' runs after unknown stage(s): {', '.join(unknown)}")
+
+        order, placed = [], set()
+        remaining = list(self.stages.values())
+        while remaining:
+            ready = [stage for stage in remaining if placed.issuperset(stage.after)]
+            if not ready:
+                raise ValueError(f"Pipeline has a cycle among: {', '.join(s.name for s in remaining)}")
+            for stage in ready:
+                order.append(stage)
+                placed.add(stage.name)
+                remaining.remove(stage)
+        return order
+
+    def run(self, execute, max_workers=4, on_skipped=None):
+        """Run every stage with execute(stage) -> log lines
+
+        Stages after a failed or skipped stage are skipped, reported through
+        on_skipped(stage, reason). Returns (logs, results) where results maps
+        stage name to {"status", "seconds"}.
+        """
+        logs, results = [], {}
+
+        def timed(stage):
+            started = time.time()
+            stage_logs = execute(stage)
+            return stage_logs, time.time() - started
+
+        pending = list(self.order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-stage") as pool:
+            while pending or running:
+                for stage in list(pending):
+                    statuses = [results.get(name, {}).get("status") for name in stage.after]
+                    if any(status in ("failed", "skipped") for status in statuses):
+                        pending.remove(stage)
+                        reason = f"{stage.name} skipped: an earlier stage did not succeed"
+                        results[stage.name] = {"status": "skipped", "seconds": 0.0}
+                        logs.append(f"[WARNING] {reason}")
+                        if on_skipped:
+                            on_skipped(stage, reason)
+                    elif all(status == "succeeded" for status in statuses):
+                        pending.remove(stage)
+                        running[pool.submit(timed, stage)] = stage
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        stage_logs, seconds = future.result()
+                    except Exception as e:
+                        stage_logs, seconds = [f"[ERROR] {stage.name} failed: {str(e)}"], 0.0
+                    logs.extend(stage_logs)
+                    results[stage.name] = {
+                        "status": "failed" if logs_failed(stage_logs) else "succeeded",
+                        "seconds": round(seconds, 3)
+                    }
+        return logs, results
@@ -1,5 +1,7 @@
+import sys
 import threading
 from psycopg2.extras import RealDictCursor
+from config import Config
 from services.data_service import DataService
 
 class PortfolioService(DataService):
@@ -11,8 +13,7 @@ class PortfolioService(DataService):
     
     def get_active_symbols(self):
         """Get all active portfolio symbols"""
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT Symbol AS symbol, Name AS name
@@ -20,13 +21,10 @@ class PortfolioService(DataService):
                     WHERE Status = TRUE;
                 """)
                 return cur.fetchall()
-        finally:
-            conn.close()
     
     def get_available_symbols(self):
         """Get all available symbols not in portfolio"""
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT Symbol AS symbol, Name AS name
@@ -34,15 +32,12 @@ class PortfolioService(DataService):
                     WHERE Status = FALSE;
                 """)
                 return cur.fetchall()
-        finally:
-            conn.close()
     
     def add_symbol(self, symbol):
         """Add symbol to portfolio"""
         symbol_upper = symbol.upper()
         
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn, conn.cursor() as cur:
                 # Find the first record with this symbol
                 cur.execute("""
@@ -63,19 +58,16 @@ class PortfolioService(DataService):
                     SET Status = TRUE 
                     WHERE Tag_ID = %s;
                 """, (tag_id,))
+                self._touch_last_updated(cur, "portfolio")
                 
                 self.temp_list.add(symbol_upper)
                 return {"message": f"Symbol '{symbol_upper}' activated in portfolio"}
-                
-        finally:
-            conn.close()
     
     def remove_symbol(self, symbol):
         """Remove symbol from portfolio"""
         symbol_upper = symbol.upper()
         
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn, conn.cursor() as cur:
                 # Find the first record with this symbol
                 cur.execute("""
@@ -96,12 +88,10 @@ class PortfolioService(DataService):
                     SET Status = FALSE 
                     WHERE Tag_ID = %s;
                 """, (tag_id,))
+                self._touch_last_updated(cur, "portfolio")
                 
                 self.temp_list.discard(symbol_upper)
                 return {"message": f"Symbol '{symbol_upper}' deactivated from portfolio"}
-                
-        finally:
-            conn.close()
     
     def apply_changes(self):
         """Apply portfolio changes by scraping company data"""
@@ -113,17 +103,16 @@ class PortfolioService(DataService):
         def scrape_task():
             """Background task to scrape company data"""
             try:
-                # Import here to avoid circular imports
-                from python.scrapers.company_data import scrape_company_data
-                
-                for symbol in symbols_to_scrape:
-                    try:
-                        scrape_company_data(symbol)
-                        self.temp_list.discard(symbol)
-                    except Exception as e:
-                        print(f"Failed to scrape {symbol}: {str(e)}")
-                        
-                print("Company data scraping completed")
+                company_data = self._import_company_scraper()
+                # Owns its browser pool and database connections, closing both when done
+                failed = company_data.scrape_companies(symbols_to_scrape)
+                # Symbols that could not be scraped stay pending for the next apply
+                self.temp_list.difference_update(set(symbols_to_scrape) - set(failed))
+                self.set_last_updated("company")
+                if failed:
+                    print(f"[ERROR] Company data scraping failed for: {', '.join(sorted(failed))}")
+                else:
+                    print("Company data scraping completed")
             except Exception as e:
                 print(f"Scraping task failed: {str(e)}")
         
@@ -135,10 +124,16 @@ class PortfolioService(DataService):
             "symbols": symbols_to_scrape
         }
     
+    def _import_company_scraper(self):
+        """Import scrapers.company_data the way scraper scripts see it, with the scripts directory on sys.path"""
+        if Config.PYTHON_SCRIPTS_DIR not in sys.path:
+            sys.path.append(Config.PYTHON_SCRIPTS_DIR)
+        from scrapers import company_data
+        return company_data
+    
     def get_scraper_status(self):
         """Get current scraper status"""
-        conn = self.get_db_connection()
-        try:
+        with self.get_db_connection() as conn:
             with conn.cursor() as cur:
                 # Check company scraper status
                 cur.execute("""
@@ -158,6 +153,4 @@ class PortfolioService(DataService):
                         "last_scraped_time": stats[2].isoformat() if stats[2] else None,
                         "pending_symbols": list(self.temp_list)
                     }
-                }
-        finally:
-            conn.close()
\ No newline at end of file
+                }
\ No newline at end of file
@@ -0,0 +1,143 @@
+import re
+import threading
+from collections import Counter
+
+INSERT_TABLE_PATTERN = re.compile(r'^\s*INSERT\s+INTO\s+"?([\w.]+)"?', re.IGNORECASE)
+
+_lock = threading.Lock()
+_rows_inserted = Counter()
+_bytes_downloaded = 0
+_installed = False
+_metered_classes = {}
+
+
+def reset():
+    """Zero the counters before a script runs"""
+    global _bytes_downloaded
+    with _lock:
+        _rows_inserted.clear()
+        _bytes_downloaded = 0
+
+
+def snapshot():
+    """Get rows inserted per table and bytes downloaded since the last reset"""
+    with _lock:
+        return {"rows_inserted": dict(_rows_inserted), "bytes_downloaded": _bytes_downloaded}
+
+
+def _count_insert(cursor, query):
+    if cursor.rowcount is None or cursor.rowcount <= 0:
+        return
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", errors="replace")
+    elif not isinstance(query, str):
+        query = query.as_string(cursor)  # psycopg2.sql.Composed
+    match = INSERT_TABLE_PATTERN.match(query)
+    if match:
+        with _lock:
+            _rows_inserted[match.group(1).lower()] += cursor.rowcount
+
+
+def _count_bytes(amount):
+    global _bytes_downloaded
+    with _lock:
+        _bytes_downloaded += amount
+
+
+def _metered_subclass(base, mixin):
+    # Scripts pick their own cursor/connection classes (DictCursor, RealDictCursor...),
+    # so the meter is mixed into whichever class they asked for
+    if issubclass(base, mixin):
+        return base
+    if base not in _metered_classes:
+        _metered_classes[base] = type(f"Metered{base.__name__}", (mixin, base), {})
+    return _metered_classes[base]
+
+
+class _MeteredCursor:
+    def execute(self, query, vars=None):
+        result = super().execute(query, vars)
+        _count_insert(self, query)
+        return result
+
+    def executemany(self, query, vars_list):
+        result = super().executemany(query, vars_list)
+        _count_insert(self, query)
+        return result
+
+
+class _MeteredConnection:
+    def cursor(self, *args, **kwargs):
+        import psycopg2.extensions
+        factory = kwargs.get("cursor_factory") or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs["cursor_factory"] = _metered_subclass(factory, _MeteredCursor)
+        return super().cursor(*args, **kwargs)
+
+
+# Bytes Chrome transferred for the current document and its subresources,
+# as of when the page finished loading
+PAGE_TRANSFER_SCRIPT = (
+    "return performance.getEntriesByType('navigation')"
+    ".concat(performance.getEntriesByType('resource'))"
+    ".reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);"
+)
+
+
+def install():
+    """Count rows inserted through psycopg2 and bytes downloaded through requests and Selenium
+
+    Meant for script processes only (script hosts and script subprocesses);
+    patches are process-wide.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    try:
+        import psycopg2
+        import psycopg2.extensions
+    except ImportError:
+        psycopg2 = None
+    if psycopg2 is not None:
+        original_connect = psycopg2.connect
+
+        def metered_connect(*args, **kwargs):
+            factory = kwargs.get("connection_factory") or psycopg2.extensions.connection
+            kwargs["connection_factory"] = _metered_subclass(factory, _MeteredConnection)
+            return original_connect(*args, **kwargs)
+
+        psycopg2.connect = metered_connect
+
+    try:
+        import requests
+    except ImportError:
+        requests = None
+    if requests is not None:
+        original_send = requests.Session.send
+
+        def metered_send(session, request, **kwargs):
+            response = original_send(session, request, **kwargs)
+            # Streamed bodies are left unread rather than buffered for counting
+            if not kwargs.get("stream"):
+                _count_bytes(len(response.content or b""))
+            return response
+
+        requests.Session.send = metered_send
+
+    try:
+        from selenium.webdriver.remote.webdriver import WebDriver
+    except ImportError:
+        WebDriver = None
+    if WebDriver is not None:
+        original_get = WebDriver.get
+
+        def metered_get(driver, url):
+            result = original_get(driver, url)
+            try:
+                _count_bytes(int(driver.execute_script(PAGE_TRANSFER_SCRIPT) or 0))
+            except Exception:
+                pass  # about:blank, closed windows and the like have nothing to count
+            return result
+
+        WebDriver.get = metered_get
@@ -1,9 +1,18 @@
 import os
-import subprocess
+import time
 import threading
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from services.data_service import DataService
+from services.leader_service import LeaderElector
+from services.job_service import JobService
+from services.script_runner import ScriptRunner
+from services.pipeline import Pipeline, logs_failed
+from services.watchdog import ScriptWatchdog
+from services.job_log_service import JobLogWriter
+from services.news_polling_service import NewsPollingService
+from services.trading_calendar import TradingCalendar, EXCHANGE_TZ
 
 class SchedulerService(DataService):
     """Service for managing background scheduled jobs"""
@@ -21,9 +30,35 @@ class SchedulerService(DataService):
             for script in config['NEWS_SCRIPTS_WHITELIST']
         }
         
+        # Bound concurrent scripts across news and data jobs, with a tighter
+        # cap on Chrome-driven ones
+        concurrency = config['NEWS_CONCURRENCY']
+        self.script_slots = {
+            "selenium": threading.BoundedSemaphore(concurrency['selenium']),
+            "requests": threading.BoundedSemaphore(concurrency['requests'])
+        }
+        
         # Job IDs
         self.DATA_JOB_ID = "data_refresh_job"
         self.NEWS_JOB_ID = "news_refresh_job"
+        self.SETTINGS_JOB_ID = "scheduler_settings_sync_job"
+        self.DISPATCH_JOB_ID = "refresh_job_dispatch_job"
+        
+        self.elector = None
+        self.job_service = JobService()
+        self.script_runner = ScriptRunner(config)
+        self.data_pipeline = Pipeline.from_config(config['DATA_PIPELINE'])
+        self._step_context = threading.local()  # (job_id, step) of the step running on this thread
+        self.watchdog = None
+        log_config = config['JOB_LOG_CONFIG']
+        self.job_logs = JobLogWriter(
+            self.job_service,
+            capacity=log_config['ring_capacity'],
+            flush_interval=log_config['flush_interval']
+        )
+        self._cancel_events = {}  # job_id -> Event set when the job is cancelled
+        self.news_polling = NewsPollingService(config)
+        self.trading_calendar = TradingCalendar(**config['TRADING_CALENDAR_CONFIG'])
     
     def start(self):
         """Start the scheduler"""
@@ -34,24 +69,144 @@ class SchedulerService(DataService):
     def stop(self):
         """Stop the scheduler"""
         if self.scheduler.running:
-            self.scheduler.shutdown()
+            self.scheduler.shutdown(wait=False)
+    
+    # === Leader Election ===
+    
+    def start_leader_election(self):
+        """Campaign for the scheduler leader lock; only the leader runs jobs
+        
+        Call once per process after any fork (under gunicorn, from scheduler.py).
+        """
+        if self.elector is None:
+            leader_config = self.config['LEADER_CONFIG']
+            self.elector = LeaderElector(
+                leader_config['lock_key'],
+                on_elected=self._on_elected,
+                on_demoted=self._on_demoted,
+                retry_interval=leader_config['retry_interval'],
+                heartbeat_interval=leader_config['heartbeat_interval']
+            )
+        self.elector.start()
+    
+    def shutdown(self):
+        """Stop campaigning and release leadership (registered with atexit)"""
+        if self.elector is not None:
+            self.elector.stop()
+        else:
+            self.stop()
+            self.script_runner.shutdown()
+    
+    def is_leader(self):
+        return self.elector is not None and self.elector.is_leader
+    
+    def _on_elected(self):
+        # Jobs still marked running were owned by a leader that is gone now
+        orphaned = self.job_service.fail_orphaned("Leader process exited while the job was running")
+        if orphaned:
+            print(f"[WARNING] Marked {orphaned} orphaned refresh job(s) as failed")
+        # A scheduler cannot be restarted after shutdown, so every term gets a new one
+        self.scheduler = BackgroundScheduler()
+        self.scheduler_enabled.update(self._load_scheduler_settings())
+        self.start()
+        watchdog_config = self.config['WATCHDOG_CONFIG']
+        self.watchdog = ScriptWatchdog(
+            self.script_runner,
+            self.job_service,
+            owner=self.elector.identity,
+            on_cancel=self.cancel_running_job,
+            interval=watchdog_config['interval'],
+            orphan_sweep_interval=watchdog_config['orphan_sweep_interval']
+        )
+        self.watchdog.start()
+        self.job_logs.start()
+        try:
+            self.job_service.prune_log_lines(self.config['JOB_LOG_CONFIG']['retention_days'])
+        except Exception as e:
+            print(f"[ERROR] Failed to prune old job logs: {str(e)}")
+        self.run_initial_jobs()
+    
+    def _on_demoted(self):
+        self.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.script_runner.shutdown()
+        self.job_logs.stop()
+    
+    def _load_scheduler_settings(self):
+        """Read the shared enabled/disabled state of each scheduled job"""
+        with self.get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT key, enabled FROM scheduler_settings;")
+                return {key: enabled for key, enabled in cur.fetchall() if key in self.scheduler_enabled}
+    
+    def _save_scheduler_setting(self, key, enabled):
+        with self.get_db_connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO scheduler_settings (key, enabled, updated_at)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (key) DO UPDATE
+                    SET enabled = EXCLUDED.enabled, updated_at = EXCLUDED.updated_at;
+                """, (key, enabled, datetime.datetime.now()))
+    
+    def _sync_scheduler_settings(self):
+        """Apply toggles made through other workers to the leader's jobs"""
+        try:
+            settings = self._load_scheduler_settings()
+        except Exception as e:
+            print(f"[ERROR] Failed to read scheduler settings: {str(e)}")
+            return
+        for key, enabled in settings.items():
+            if self.scheduler_enabled.get(key) != enabled:
+                self.scheduler_enabled[key] = enabled
+                self._apply_job_state(key, enabled)
     
     def _schedule_jobs(self):
         """Schedule jobs based on current state"""
-        if self.scheduler_enabled["data"]:
+        self.scheduler.add_job(
+            self._sync_scheduler_settings,
+            'interval',
+            seconds=self.config['LEADER_CONFIG']['settings_sync_interval'],
+            id=self.SETTINGS_JOB_ID,
+            replace_existing=True
+        )
+        
+        self.scheduler.add_job(
+            self.dispatch_refresh_jobs,
+            'interval',
+            seconds=self.config['JOB_CONFIG']['poll_interval'],
+            id=self.DISPATCH_JOB_ID,
+            replace_existing=True
+        )
+        
+        for key in ("data", "news"):
+            if self.scheduler_enabled[key]:
+                self._add_refresh_job(key)
+    
+    def _add_refresh_job(self, key):
+        """Add the interval job that queues scheduled data or news refreshes"""
+        if key == "data":
+            # Once per weekday when the session's exchange files are expected;
+            # holidays are skipped when the job fires
+            ready_at = self.trading_calendar.files_ready_at
             self.scheduler.add_job(
-                self.run_all_data_scripts,
-                'interval',
-                minutes=self.config['SCHEDULER_CONFIG']['data_refresh_interval'],
+                self.request_scheduled_data_refresh,
+                'cron',
+                day_of_week='mon-fri',
+                hour=ready_at.hour,
+                minute=ready_at.minute,
+                timezone=EXCHANGE_TZ,
                 id=self.DATA_JOB_ID,
                 replace_existing=True
             )
-        
-        if self.scheduler_enabled["news"]:
+        else:
+            # Each news source has its own adaptive interval, so tick often
+            # and queue a job only when some source is due
             self.scheduler.add_job(
-                self.run_all_news_scripts,
+                self.request_due_news_refresh,
                 'interval',
-                minutes=self.config['SCHEDULER_CONFIG']['news_refresh_interval'],
+                minutes=self.config['NEWS_POLLING_CONFIG']['tick_minutes'],
                 id=self.NEWS_JOB_ID,
                 replace_existing=True
             )
@@ -61,11 +216,12 @@ class SchedulerService(DataService):
         print("[INFO] Checking whether initial data and news updates are needed...")
         now = datetime.datetime.now()
         
-        # Check if data needs update
+        # Data needs an update if the latest published session's files are
+        # newer than the last refresh
         last_data_str = self.get_last_updated("data")
+        last_files_ready = self.trading_calendar.last_files_ready().astimezone().replace(tzinfo=None)
         data_needs_update = not last_data_str or \
-            (now - datetime.datetime.strptime(last_data_str, "%Y-%m-%d %H:%M:%S")).total_seconds() > \
-            self.config['SCHEDULER_CONFIG']['initial_data_refresh_threshold'] * 60
+            datetime.datetime.strptime(last_data_str, "%Y-%m-%d %H:%M:%S") < last_files_ready
         
         # Check if news needs update
         last_news_str = self.get_last_updated("news")
@@ -73,125 +229,309 @@ class SchedulerService(DataService):
             (now - datetime.datetime.strptime(last_news_str, "%Y-%m-%d %H:%M:%S")).total_seconds() > \
             self.config['SCHEDULER_CONFIG']['initial_news_refresh_threshold'] * 60
         
-        def background_job():
-            logs = []
-            if data_needs_update:
-                logs.extend(self.run_all_data_scripts())
-            if news_needs_update:
-                logs.extend(self.run_all_news_scripts())
-            print("[INITIAL SCHEDULED RUN LOGS]")
-            print("\n".join(logs))
-        
-        if data_needs_update or news_needs_update:
-            threading.Thread(target=background_job, daemon=True).start()
-        else:
+        if data_needs_update:
+            self.request_refresh("data", "startup")
+        if news_needs_update:
+            self.request_refresh("news", "startup")
+        if not (data_needs_update or news_needs_update):
             print("[INFO] No initial refresh needed.")
     
+    # === Refresh Jobs ===
+    
+    def request_refresh(self, kind, requested_by="api", scope="all"):
+        """Queue a data or news refresh, joining an active one that covers scope
+
+        scope "due" refreshes only the news sources whose poll is due.
+        """
+        job, coalesced = self.job_service.enqueue(kind, requested_by, scope)
+        if coalesced:
+            print(f"[INFO] {kind} refresh requested by {requested_by} joined job {job['id']}")
+        else:
+            print(f"[INFO] {kind} refresh job {job['id']} queued by {requested_by}")
+            if self.is_leader():
+                self.dispatch_refresh_jobs()
+        return {
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "scope": job["scope"],
+            "status": job["status"],
+            "coalesced": coalesced,
+            "message": f"{kind.capitalize()} refresh {'already in progress' if coalesced else 'queued'}."
+        }
+    
+    def request_scheduled_data_refresh(self):
+        """Queue the day's data refresh unless the exchange is closed today"""
+        today = self.trading_calendar.now().date()
+        if not self.trading_calendar.covers(today):
+            print(f"[WARNING] Trading holiday list has no {today.year} entries; "
+                  f"update {self.trading_calendar.holidays_file}")
+        if not self.trading_calendar.is_trading_day(today):
+            holiday = self.trading_calendar.holiday_name(today) or "weekend"
+            print(f"[INFO] Skipping scheduled data refresh: {today} is not a trading day ({holiday})")
+            return None
+        return self.request_refresh("data", "scheduler")
+    
+    def request_due_news_refresh(self):
+        """Queue a scheduled news refresh if any news source's next run is due"""
+        try:
+            due = self.news_polling.get_due_scripts(self.config['NEWS_SCRIPTS_WHITELIST'])
+        except Exception as e:
+            print(f"[ERROR] Could not read news polling schedule: {str(e)}")
+            return None
+        if not due:
+            return None
+        return self.request_refresh("news", "scheduler", scope="due")
+    
+    def dispatch_refresh_jobs(self):
+        """Start every queued refresh job (leader only)"""
+        if not self.is_leader():
+            return
+        while True:
+            try:
+                job = self.job_service.claim_next(self.elector.identity)
+            except Exception as e:
+                print(f"[ERROR] Failed to claim refresh job: {str(e)}")
+                return
+            if job is None:
+                return
+            threading.Thread(
+                target=self._execute_refresh_job,
+                args=(job["id"], job["kind"], job["scope"]),
+                name=f"refresh-job-{job['id']}",
+                daemon=True
+            ).start()
+    
+    def _execute_refresh_job(self, job_id, kind, scope="all"):
+        print(f"[INFO] Running {kind} refresh job {job_id}")
+        cancel_event = self._cancel_events[job_id] = threading.Event()
+        try:
+            if kind == "data":
+                self.run_all_data_scripts(job_id)
+            else:
+                # Scheduled news jobs poll only the sources that are due;
+                # requested ones refresh every source
+                self.run_all_news_scripts(job_id, only_due=scope == "due")
+            # Streamed lines must all be stored before clients see the job finish
+            self.job_logs.flush()
+            if cancel_event.is_set():
+                self.job_service.finish(job_id, "cancelled", "Cancelled by request")
+                print(f"[INFO] {kind} refresh job {job_id} cancelled")
+                return
+            # Steps catch their own errors, so the job's outcome is its steps'
+            unsuccessful = self.job_service.get_unsuccessful_steps(job_id)
+            if unsuccessful:
+                error = "Steps did not succeed: " + ", ".join(
+                    f"{step} ({status})" for step, status in unsuccessful.items()
+                )
+                self.job_service.finish(job_id, "failed", error)
+                print(f"[ERROR] {kind} refresh job {job_id} failed: {error}")
+            else:
+                self.job_service.finish(job_id, "succeeded")
+                print(f"[INFO] {kind} refresh job {job_id} finished")
+        except Exception as e:
+            print(f"[ERROR] {kind} refresh job {job_id} failed: {str(e)}")
+            self.job_logs.write(job_id, f"[ERROR] {str(e)}")
+            self.job_logs.flush()
+            self.job_service.finish(job_id, "failed", str(e))
+        finally:
+            self._cancel_events.pop(job_id, None)
+    
+    def cancel_job(self, job_id):
+        """Request cancellation of a queued or running job
+        
+        Queued jobs are cancelled at once; running ones are stopped by the
+        leader's watchdog, which kills the script in progress.
+        """
+        job = self.job_service.request_cancel(job_id)
+        if job is not None and job["status"] == "running":
+            self.cancel_running_job(job_id)
+        return job
+    
+    def cancel_running_job(self, job_id):
+        """Stop a job running in this process: kill its current scripts and skip the rest"""
+        event = self._cancel_events.get(job_id)
+        if event is not None and not event.is_set():
+            print(f"[INFO] Cancelling refresh job {job_id}")
+            event.set()
+    
+    def _job_cancelled(self, job_id):
+        event = self._cancel_events.get(job_id)
+        return event is not None and event.is_set()
+    
+    def _run_step(self, job_id, step, func, *args):
+        """Run one job step, recording its status and logs on the job if there is one"""
+        if job_id is None:
+            return func(*args)
+        if self._job_cancelled(job_id):
+            logs = [f"[WARNING] {step} not run: job cancelled"]
+            self.job_logs.write_lines(job_id, logs)
+            self.job_service.update_step(job_id, step, "cancelled")
+            self.job_service.record_run(job_id, step, "cancelled", 0.0)
+            return logs
+        self.job_service.update_step(job_id, step, "running")
+        self._step_context.step = (job_id, step)
+        self._step_context.metrics = {}
+        started = time.time()
+        try:
+            logs = func(*args)
+        except Exception as e:
+            logs = [f"[ERROR] {step} failed: {str(e)}"]
+        finally:
+            self._step_context.step = None
+        seconds = round(time.time() - started, 3)
+        metrics = self._step_context.metrics
+        
+        if metrics.get("timed_out"):
+            status = "timed_out"
+        elif metrics.get("cancelled"):
+            status = "cancelled"
+        else:
+            status = "failed" if logs_failed(logs) else "succeeded"
+        self.job_logs.write_lines(job_id, logs)
+        self.job_service.update_step(job_id, step, status, details=dict(metrics, seconds=seconds))
+        try:
+            self.job_service.record_run(job_id, step, status, seconds, metrics)
+        except Exception as e:
+            print(f"[ERROR] Could not record run of {step}: {str(e)}")
+        return logs
+    
     def run_cleaner(self):
         """Run the cleaner script"""
-        logs = []
         cleaner_path = os.path.join(self.config['PYTHON_SCRIPTS_DIR'], 'cleaner.py')
         
-        if os.path.exists(cleaner_path):
-            logs.append("[INFO] Running cleaner.py...")
-            try:
-                result = subprocess.run(
-                    ['python', 'cleaner.py'],
-                    cwd=self.config['PYTHON_SCRIPTS_DIR'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    check=True
-                )
-                logs.append("[SUCCESS] cleaner.py completed.")
-                if result.stdout:
-                    logs.append(result.stdout)
-                if result.stderr:
-                    logs.append(f"[STDERR] {result.stderr}")
-            except subprocess.CalledProcessError as e:
-                logs.append(f"[ERROR] cleaner.py failed with code {e.returncode}")
-                logs.append(e.stdout or "")
-                logs.append(f"[STDERR] {e.stderr or ''}")
-        else:
-            logs.append("[WARNING] cleaner.py not found.")
+        if not os.path.exists(cleaner_path):
+            return ["[WARNING] cleaner.py not found."]
         
-        return logs
+        return ["[INFO] Running cleaner.py..."] + self._run_script(cleaner_path, label="cleaner.py")
     
     def run_python_script(self, script_path):
         """Run a Python script with proper logging"""
-        logs = []
         script_name = os.path.basename(script_path)
         
         if not os.path.exists(script_path):
-            logs.append(f"[ERROR] Script not found: {script_path}")
-            return logs
+            return [f"[ERROR] Script not found: {script_path}"]
         
         # Use appropriate lock
         lock = self.news_script_locks.get(script_name, self.script_lock)
         
         with lock:
-            logs.append(f"[INFO] Running: {script_path}")
-            try:
-                script_dir = os.path.dirname(script_path)
-                result = subprocess.run(
-                    ['python', script_name],
-                    cwd=script_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    check=True
-                )
-                logs.append(f"[SUCCESS] {script_path} completed.")
-                if result.stdout:
-                    logs.append(result.stdout)
-                if result.stderr:
-                    logs.append(f"[STDERR] {result.stderr}")
-            except subprocess.CalledProcessError as e:
-                logs.append(f"[ERROR] {script_path} failed with code {e.returncode}.")
-                logs.append(e.stdout or "")
-                logs.append(f"[STDERR] {e.stderr or ''}")
-        
-        return logs
+            return [f"[INFO] Running: {script_path}"] + self._run_script(script_path)
     
-    def run_all_data_scripts(self):
-        """Run all data collection scripts"""
-        logs = []
+    def _run_script(self, script_path, args=(), label=None):
+        """Run a script through the script runner, returning summary log lines
         
-        # Run bulk/block scrapers
-        logs.append("[INFO] Running bulk/block scrapers...")
+        Inside a job step the script's output is streamed line by line to the
+        job log as it is printed, rather than returned. Startup and run times
+        are logged; inside a job step, the run's timings,
+        exit code and row/byte counts are kept for the step's job_runs row.
+        The script gets the time budget of its step (or file name) from
+        SCRIPT_TIMEOUTS and is killed if its job is cancelled.
+        """
+        label = label or script_path
+        step = getattr(self._step_context, "step", None)
+        budget_key = step[1] if step else os.path.basename(script_path)
+        timeout = self.config['SCRIPT_TIMEOUTS'].get(budget_key)
+        cancel_event = self._cancel_events.get(step[0]) if step else None
+        on_line = None
+        if step:
+            job_id = step[0]
+            on_line = lambda stream, line: self.job_logs.write(
+                job_id, f"[STDERR] {line}" if stream == "stderr" else line
+            )
+        logs = []
         try:
-            result = subprocess.run(
-                ['python', 'scraper.py', 'all'],
-                cwd=self.config['PYTHON_SCRIPTS_DIR'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            result = self.script_runner.run(
+                script_path, args, timeout=timeout, cancel_event=cancel_event, on_line=on_line
             )
-            logs.append("[SUCCESS] Bulk/Block scraping completed.")
-            logs.append(result.stdout)
-            if result.stderr:
-                logs.append(f"[STDERR] {result.stderr}")
         except Exception as e:
-            logs.append(f"[ERROR] Bulk/Block scraping failed: {str(e)}")
+            return [f"[ERROR] {label} could not be started: {str(e)}"]
         
-        # Run other data scripts
-        for script in filter(os.path.exists, self.config['DATA_SCRIPTS']):
-            logs.extend(self.run_python_script(script))
+        if result["returncode"] == 0:
+            logs.append(f"[SUCCESS] {label} completed.")
+        elif result["cancelled"]:
+            logs.append(f"[WARNING] {label} cancelled; process tree killed.")
+        elif result["timed_out"]:
+            logs.append(f"[ERROR] {label} timed out after {timeout or self.script_runner.timeout}s; process tree killed.")
+        else:
+            logs.append(f"[ERROR] {label} failed with code {result['returncode']}.")
+            if result["error"]:
+                logs.append(f"[STDERR] {result['error']}")
         
-        # Run company scrapers asynchronously
-        self._run_company_scrapers_async()
+        metrics = {
+            "mode": result["mode"],
+            "returncode": result["returncode"],
+            "timed_out": result["timed_out"],
+            "cancelled": result["cancelled"],
+            "startup_seconds": round(result.get("startup_seconds") or 0.0, 3),
+            "run_seconds": round(result.get("run_seconds") or 0.0, 3),
+            "rows_inserted": result["rows_inserted"],
+            "bytes_downloaded": result["bytes_downloaded"]
+        }
+        boot = ""
+        if result.get("host_boot_seconds") is not None:
+            boot = f" incl. host boot {result['host_boot_seconds']:.3f}s"
+        logs.append(
+            f"[INFO] {label} startup {metrics['startup_seconds']}s{boot}, "
+            f"run {metrics['run_seconds']}s ({metrics['mode']})"
+        )
+        if getattr(self._step_context, "step", None):
+            self._step_context.metrics = metrics
+        return logs
+    
+    def run_all_data_scripts(self, job_id=None):
+        """Run the data pipeline, reporting per-stage status and timings to job_id"""
+        if job_id is not None:
+            self.job_service.set_steps(job_id, [stage.name for stage in self.data_pipeline.order])
+        
+        def on_skipped(stage, reason):
+            if job_id is not None:
+                self.job_service.update_step(job_id, stage.name, "skipped")
+                self.job_logs.write(job_id, f"[WARNING] {reason}")
+                self.job_service.record_run(job_id, stage.name, "skipped", 0.0)
+        
+        logs, results = self.data_pipeline.run(
+            lambda stage: self._run_step(job_id, stage.name, self._run_stage, stage),
+            max_workers=self.config['DATA_PIPELINE_CONCURRENCY'],
+            on_skipped=on_skipped
+        )
+        timings = ", ".join(f"{name} {result['seconds']}s ({result['status']})" for name, result in results.items())
+        logs.append(f"[INFO] Data pipeline stages: {timings}")
         
         # Update timestamp
-        self.set_last_updated("data")
+        if not self._job_cancelled(job_id):
+            self.set_last_updated("data")
         return logs
     
-    def run_all_news_scripts(self):
-        """Run all news collection scripts"""
+    def _run_stage(self, stage):
+        """Run one pipeline stage's script in its Selenium or requests slot"""
+        script_path = os.path.join(self.config['PYTHON_SCRIPTS_DIR'], stage.script)
+        if not os.path.exists(script_path):
+            return [f"[ERROR] Script not found: {script_path}"]
+        
+        with self.script_slots[stage.resource]:
+            logs = [f"[INFO] Running stage {stage.name}..."]
+            logs.extend(self._run_script(script_path, stage.args, label=stage.name))
+        if stage.marks and not logs_failed(logs):
+            self.set_last_updated(stage.marks)
+        return logs
+    
+    def run_all_news_scripts(self, job_id=None, only_due=False):
+        """Run the news collection scripts, reporting per-script status to job_id
+        
+        With only_due, only the scripts whose adaptive polling interval has
+        elapsed are run.
+        """
         logs = []
         news_folder = os.path.join(self.config['PYTHON_SCRIPTS_DIR'], 'news')
         
+        names = self.config['NEWS_SCRIPTS_WHITELIST']
+        if only_due:
+            try:
+                names = self.news_polling.get_due_scripts(names)
+            except Exception as e:
+                logs.append(f"[WARNING] Could not read news polling schedule, running every source: {str(e)}")
         scripts = [
-            os.path.join(news_folder, s) for s in self.config['NEWS_SCRIPTS_WHITELIST']
+            os.path.join(news_folder, s) for s in names
             if os.path.exists(os.path.join(news_folder, s))
         ]
         
@@ -200,62 +540,87 @@ class SchedulerService(DataService):
             return logs
         
         logs.append(f"[INFO] Found {len(scripts)} news scripts to run.")
+        if job_id is not None:
+            self.job_service.set_steps(job_id, [os.path.basename(s) for s in scripts] + ["cleaner.py"])
         
-        for script in scripts:
-            logs.append(f"[INFO] Running news script: {script}")
-            logs.extend(self.run_python_script(script))
-            
-            logs.append("[INFO] Running cleaner after news script.")
-            logs.extend(self.run_cleaner())
+        # Each script hits a different site, so run them side by side
+        max_workers = min(self.config['NEWS_CONCURRENCY']['max_workers'], len(scripts))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news-script") as pool:
+            futures = [
+                pool.submit(self._run_step, job_id, os.path.basename(script), self._run_news_script, script)
+                for script in scripts
+            ]
+            for script, future in zip(scripts, futures):
+                logs.append(f"[INFO] Ran news script: {script}")
+                logs.extend(future.result())
+        
+        # One incremental cleaning pass over everything the batch inserted
+        logs.extend(self._run_step(job_id, "cleaner.py", self.run_cleaner))
         
         # Update timestamp
-        self.set_last_updated("news")
+        if not self._job_cancelled(job_id):
+            self.set_last_updated("news")
         logs.append("[INFO] All news scripts (and cleaning) complete.")
         return logs
     
-    def _run_company_scrapers_async(self):
-        """Run company data scrapers asynchronously"""
-        def target():
-            try:
-                logs = []
-                logs.append("[INFO] Running company data scrapers...")
-                # Import here to avoid circular imports
-                from python.scrapers.company_data import run_company_scrapers
-                run_company_scrapers()
-                logs.append("[SUCCESS] Company data scraping completed")
-                print("\n".join(logs))
-            except Exception as e:
-                print(f"[ERROR] Company scraping failed: {str(e)}")
+    def _run_news_script(self, script):
+        """Run one news script in its Selenium or requests slot"""
+        script_name = os.path.basename(script)
+        kind = "selenium" if script_name in self.config['NEWS_SELENIUM_SCRIPTS'] else "requests"
+        source = self.config['NEWS_SOURCES'].get(script_name)
+        if source is None:
+            with self.script_slots[kind]:
+                return self.run_python_script(script)
         
-        threading.Thread(target=target, daemon=True).start()
-    
-    def refresh_data_sync(self):
-        """Synchronously refresh data"""
-        logs = self.run_all_data_scripts()
-        return {
-            "status": "success",
-            "message": "Data refresh complete.",
-            "logs": logs,
-            "last_updated_data": self.get_last_updated("data")
-        }
-    
-    def refresh_news_sync(self):
-        """Synchronously refresh news"""
-        logs = self.run_all_news_scripts()
-        return {
-            "status": "success",
-            "message": "News refresh complete.",
-            "logs": logs,
-            "last_updated_news": self.get_last_updated("news")
-        }
+        try:
+            after_id = self.news_polling.max_news_id()
+        except Exception as e:
+            after_id = None
+            print(f"[ERROR] Could not read latest news id before {script_name}: {str(e)}")
+        with self.script_slots[kind]:
+            logs = self.run_python_script(script)
+        metrics = getattr(self._step_context, "metrics", None) or {}
+        if after_id is None or metrics.get("cancelled"):
+            return logs
+        
+        # Yield is the articles this run added for its source, which steers
+        # how soon the source is polled again
+        try:
+            new_articles = self.news_polling.count_new_articles(source, after_id)
+            schedule = self.news_polling.record_run(
+                script_name, source, new_articles, succeeded=not logs_failed(logs)
+            )
+            logs.append(
+                f"[INFO] {script_name}: {new_articles} new article(s); "
+                f"next run in {schedule['interval_minutes']:g} min"
+            )
+        except Exception as e:
+            logs.append(f"[WARNING] Could not update polling schedule for {script_name}: {str(e)}")
+        return logs
     
     def get_status(self):
         """Get scheduler status"""
-        return self.scheduler_enabled.copy()
+        status = self.scheduler_enabled.copy()
+        status.update(self._load_scheduler_settings())
+        return status
     
     def toggle_job(self, key, enable):
-        """Toggle scheduler job for data or news"""
+        """Toggle scheduler job for data or news
+        
+        The setting is shared through the database; the leader applies it
+        immediately if it served the request, otherwise on its next sync.
+        """
+        self._save_scheduler_setting(key, bool(enable))
         self.scheduler_enabled[key] = bool(enable)
+        if self.is_leader():
+            self._apply_job_state(key, bool(enable))
+        
+        return {"message": f"{key.capitalize()} scheduler {'enabled' if enable else 'disabled'}."}
+    
+    def _apply_job_state(self, key, enable):
+        """Add or remove the interval job for data or news on the local scheduler"""
+        if not self.scheduler.running:
+            return
         job_id = self.DATA_JOB_ID if key == "data" else self.NEWS_JOB_ID
         
         # Remove existing job if present
@@ -264,11 +629,4 @@ class SchedulerService(DataService):
         
         # Add job if enabling
         if enable:
-            job_func = self.run_all_data_scripts if key == "data" else self.run_all_news_scripts
-            interval = (self.config['SCHEDULER_CONFIG']['data_refresh_interval'] 
-                       if key == "data" 
-                       else self.config['SCHEDULER_CONFIG']['news_refresh_interval'])
-            
-            self.scheduler.add_job(job_func, 'interval', minutes=interval, id=job_id)
-        
-        return {"message": f"{key.capitalize()} scheduler {'enabled' if enable else 'disabled'}."}
\ No newline at end of file
+            self._add_refresh_job(key)
\ No newline at end of file
@@ -0,0 +1,527 @@
+import os
+import io
+import json
+import gc
+import sys
+import time
+import queue
+import runpy
+import logging
+import threading
+import importlib
+import traceback
+import subprocess
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+import psutil
+from config import Config
+from services import run_meters
+
+START_MARKER = "__ENAM_SCRIPT_START__"
+METERS_MARKER = "__ENAM_SCRIPT_METERS__"
+
+# Set in the environment of every script process, and so inherited by the
+# Chrome/chromedriver processes scripts start; the value is the runner's pid
+OWNER_ENV = "ENAM_SCRIPT_RUNNER"
+
+# Seconds between checks for cancellation while a script runs
+CANCEL_POLL_INTERVAL = 1
+
+# Runs a script like `python script.py args`, first reporting when the
+# interpreter is up and, as it exits, what run_meters counted
+SUBPROCESS_BOOTSTRAP = f"""
+import os, sys, json, time, atexit, runpy, importlib.util
+started = time.time()
+spec = importlib.util.spec_from_file_location("run_meters", sys.argv[1])
+meters = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(meters)
+meters.install()
+
+def report_meters():
+    sys.stderr.write("{METERS_MARKER} " + json.dumps(meters.snapshot()) + "\\n")
+    sys.stderr.flush()
+
+atexit.register(report_meters)
+path = os.path.abspath(sys.argv[2])
+sys.argv = sys.argv[2:]
+sys.path[0] = os.path.dirname(path)
+sys.stderr.write("{START_MARKER} %r\\n" % started)
+sys.stderr.flush()
+runpy.run_path(path, run_name="__main__")
+"""
+
+
+def _print_line(stream, line):
+    print(f"[STDERR] {line}" if stream == "stderr" else line)
+
+
+def kill_process_tree(pid, timeout=5):
+    """Kill a process and all of its descendants; returns how many were killed"""
+    try:
+        root = psutil.Process(pid)
+        processes = root.children(recursive=True) + [root]
+    except psutil.NoSuchProcess:
+        return 0
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(processes, timeout=timeout)
+    return len(processes)
+
+
+def _kill_new_children(before):
+    """Kill child processes a script left behind, such as a Chrome it never quit"""
+    leftovers = [p for p in psutil.Process().children(recursive=True) if p.pid not in before]
+    for process in leftovers:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(leftovers, timeout=5)
+    return len(leftovers)
+
+
+class _LineWriter(io.TextIOBase):
+    """A stdout/stderr replacement that sends each complete line to the parent as it is written"""
+
+    def __init__(self, send_line, stream):
+        self._send_line = send_line
+        self._stream = stream
+        self._partial = ""
+        self._lock = threading.Lock()  # scripts print from worker threads too
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        with self._lock:
+            self._partial += text
+            *lines, self._partial = self._partial.split("\n")
+            for line in lines:
+                self._send_line(self._stream, line)
+        return len(text)
+
+    def finish(self):
+        with self._lock:
+            if self._partial:
+                self._send_line(self._stream, self._partial)
+            self._partial = ""
+
+
+def _host_main(conn, preload_modules, scripts_root, owner_pid):
+    """Entry point of a script host process: preload heavy imports, then run scripts on request"""
+    os.environ[OWNER_ENV] = str(owner_pid)
+    # Shared script-side modules are imported from the scripts directory
+    sys.path.append(scripts_root)
+    boot_started = time.time()
+    for name in preload_modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[WARNING] Script host could not preload {name}: {str(e)}")
+    run_meters.install()
+    baseline_modules = set(sys.modules)
+    conn.send({"pid": os.getpid(), "preload_seconds": time.time() - boot_started})
+
+    send_lock = threading.Lock()
+
+    def send_line(stream, line):
+        with send_lock:
+            conn.send(("line", stream, line))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        started = time.time()
+        result = _run_in_host(request["path"], request["args"], scripts_root, baseline_modules, send_line)
+        result["startup_seconds"] = max(started - request["sent_at"], 0.0)
+        result["run_seconds"] = time.time() - started
+        with send_lock:
+            conn.send(("result", result))
+
+
+def _run_in_host(path, args, scripts_root, baseline_modules, send_line):
+    """Execute one script as __main__ with its own cwd, argv and sys.path, streaming its output"""
+    saved_cwd, saved_argv, saved_path = os.getcwd(), sys.argv, list(sys.path)
+    saved_handlers = list(logging.root.handlers)
+    saved_children = {p.pid for p in psutil.Process().children(recursive=True)}
+    stdout, stderr = _LineWriter(send_line, "stdout"), _LineWriter(send_line, "stderr")
+    script_dir = os.path.dirname(path)
+    returncode = 0
+    run_meters.reset()
+
+    try:
+        os.chdir(script_dir)
+        sys.argv = [path] + list(args)
+        sys.path.insert(0, script_dir)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                runpy.run_path(path, run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except BaseException:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        os.chdir(saved_cwd)
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        # Handlers from logging.basicConfig would keep writing to this run's buffers
+        for handler in list(logging.root.handlers):
+            if handler not in saved_handlers:
+                logging.root.removeHandler(handler)
+        # Scripts' own helper modules are re-imported fresh by the next run;
+        # third-party packages stay loaded, which is the point of the host
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None) or ""
+            if name not in baseline_modules and os.path.abspath(module_file).startswith(scripts_root):
+                del sys.modules[name]
+        gc.collect()
+        leftovers = _kill_new_children(saved_children)
+        if leftovers:
+            stderr.write(f"[WARNING] Killed {leftovers} process(es) left running by {os.path.basename(path)}\n")
+        stdout.finish()
+        stderr.finish()
+
+    result = {"returncode": returncode, "error": None}
+    result.update(run_meters.snapshot())
+    return result
+
+
+class ScriptHost:
+    """A long-lived process that runs scripts in-process with heavy modules already imported"""
+
+    def __init__(self, preload_modules, scripts_root, boot_timeout=120):
+        self.owner_pid = os.getpid()
+        self.preload_modules = preload_modules
+        self.scripts_root = scripts_root
+        self.boot_timeout = boot_timeout
+        self.process = None
+        self.conn = None
+        self.jobs_run = 0
+        self.boot_seconds = None
+        self.preload_seconds = None
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        # spawn, not fork: the parent is a threaded web worker
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        started = time.time()
+        self.process = ctx.Process(
+            target=_host_main,
+            args=(child_conn, self.preload_modules, self.scripts_root, self.owner_pid),
+            name="enam-script-host"
+        )
+        self.process.start()
+        child_conn.close()
+
+        if not self.conn.poll(self.boot_timeout):
+            self.stop()
+            raise RuntimeError(f"Script host did not start within {self.boot_timeout}s")
+        ready = self.conn.recv()
+        self.boot_seconds = time.time() - started
+        self.preload_seconds = ready["preload_seconds"]
+        self.jobs_run = 0
+        print(f"[INFO] Script host {ready['pid']} ready in {self.boot_seconds:.2f}s "
+              f"(preload {self.preload_seconds:.2f}s)")
+
+    def run(self, path, args, timeout, on_line, cancel_event=None):
+        """Run a script, passing each output line to on_line(stream, line) as it is printed
+
+        The host and its process tree are killed if the script overruns
+        timeout seconds or cancel_event is set. A job that had to wait for
+        the host to (re)start reports the boot time as host_boot_seconds,
+        included in its startup_seconds.
+        """
+        boot_seconds = None
+        if not self.is_alive():
+            self.start()
+            boot_seconds = self.boot_seconds
+        self.conn.send({"path": path, "args": list(args), "sent_at": time.time()})
+
+        deadline = time.time() + timeout
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                self.kill()
+                return {"returncode": -9, "cancelled": True, "error": "Cancelled; script host killed"}
+            if time.time() >= deadline:
+                self.kill()
+                return {"returncode": -9, "timed_out": True,
+                        "error": f"Timed out after {timeout}s; script host killed"}
+            if not self.conn.poll(CANCEL_POLL_INTERVAL):
+                continue
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                self.stop()
+                return {"returncode": -1, "error": "Script host exited unexpectedly"}
+            if message[0] == "line":
+                on_line(message[1], message[2])
+            else:
+                self.jobs_run += 1
+                result = message[1]
+                if boot_seconds is not None:
+                    result["host_boot_seconds"] = boot_seconds
+                    result["startup_seconds"] = boot_seconds + result.get("startup_seconds", 0.0)
+                return result
+
+    def stop(self):
+        if self.process is not None:
+            if self.process.is_alive():
+                try:
+                    self.conn.send(None)
+                except (OSError, ValueError):
+                    pass
+                self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.kill()
+                return
+        self._close()
+
+    def kill(self):
+        """Kill the host together with any Chrome/chromedriver it started"""
+        if self.process is not None:
+            kill_process_tree(self.process.pid)
+            self.process.join(timeout=5)
+        self._close()
+
+    def _close(self):
+        if self.conn is not None:
+            self.conn.close()
+        self.process, self.conn = None, None
+
+
+class ScriptRunner:
+    """Runs scraper scripts either in a pool of preloaded script hosts or as subprocesses"""
+
+    def __init__(self, config=None):
+        config = config or {}
+        runner_config = config.get('SCRIPT_RUNNER_CONFIG', Config.SCRIPT_RUNNER_CONFIG)
+        self.mode = runner_config['mode']
+        self.timeout = runner_config['timeout']
+        self.max_jobs_per_host = runner_config['max_jobs_per_host']
+        self.preload_modules = runner_config['preload']
+        self.scripts_root = os.path.abspath(config.get('PYTHON_SCRIPTS_DIR', Config.PYTHON_SCRIPTS_DIR))
+
+        self._idle_hosts = queue.LifoQueue()
+        self._host_slots = threading.BoundedSemaphore(runner_config['hosts'])
+        self._all_hosts = []
+        self._subprocesses = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "runs": 0, "timeouts": 0, "cancelled": 0, "startup_seconds": 0.0, "run_seconds": 0.0,
+            "host_boots": 0, "host_boot_seconds": 0.0
+        }
+
+    def run(self, script_path, args=(), timeout=None, cancel_event=None, on_line=None):
+        """Run a script to completion and return its exit code and timings
+
+        Output is not collected: each line goes to on_line(stream, line) as
+        the script prints it (printed here if no on_line is given). The script
+        is killed, with its whole process tree, once it overruns timeout
+        seconds or cancel_event is set.
+        """
+        path = os.path.abspath(script_path)
+        timeout = timeout or self.timeout
+        on_line = on_line or _print_line
+        if self.mode == "inprocess":
+            result = self._run_in_host(path, args, timeout, on_line, cancel_event)
+        else:
+            result = self._run_subprocess(path, args, timeout, on_line, cancel_event)
+
+        result.setdefault("timed_out", False)
+        result.setdefault("cancelled", False)
+        # Scripts killed before they exit report no counts
+        result.setdefault("rows_inserted", None)
+        result.setdefault("bytes_downloaded", None)
+        result["mode"] = self.mode
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["timeouts"] += int(result["timed_out"])
+            self._stats["cancelled"] += int(result["cancelled"])
+            self._stats["startup_seconds"] += result.get("startup_seconds") or 0.0
+            self._stats["run_seconds"] += result.get("run_seconds") or 0.0
+            if result.get("host_boot_seconds") is not None:
+                self._stats["host_boots"] += 1
+                self._stats["host_boot_seconds"] += result["host_boot_seconds"]
+        return result
+
+    def _run_in_host(self, path, args, timeout, on_line, cancel_event):
+        # Time spent waiting for a free host counts against the script's timeout
+        waited_from = time.time()
+        deadline = waited_from + timeout
+        while not self._host_slots.acquire(timeout=CANCEL_POLL_INTERVAL):
+            if cancel_event is not None and cancel_event.is_set():
+                return {"returncode": -9, "cancelled": True,
+                        "error": "Cancelled while waiting for a script host",
+                        "startup_seconds": time.time() - waited_from}
+            if time.time() >= deadline:
+                return {"returncode": -9, "timed_out": True,
+                        "error": f"Timed out after {timeout}s waiting for a script host",
+                        "startup_seconds": time.time() - waited_from}
+        try:
+            try:
+                host = self._idle_hosts.get_nowait()
+            except queue.Empty:
+                host = ScriptHost(self.preload_modules, self.scripts_root)
+                with self._lock:
+                    self._all_hosts.append(host)
+            try:
+                return host.run(path, args, max(deadline - time.time(), 0), on_line, cancel_event)
+            finally:
+                # Recycle long-lived hosts so leaks in scraper code cannot accumulate
+                if host.jobs_run >= self.max_jobs_per_host:
+                    host.stop()
+                self._idle_hosts.put(host)
+        finally:
+            self._host_slots.release()
+
+    def _run_subprocess(self, path, args, timeout, on_line, cancel_event):
+        spawned = time.time()
+        process = subprocess.Popen(
+            [sys.executable, "-c", SUBPROCESS_BOOTSTRAP, run_meters.__file__, path] + list(args),
+            cwd=os.path.dirname(path),
+            # Unbuffered, so lines reach on_line as they are printed
+            env=dict(os.environ, PYTHONUNBUFFERED="1", **{OWNER_ENV: str(os.getpid())}),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        with self._lock:
+            self._subprocesses.add(process.pid)
+
+        started = []
+        meters = {}
+
+        def pump(pipe, stream):
+            for line in pipe:
+                line = line.rstrip("\n")
+                if stream == "stderr" and not started and line.startswith(START_MARKER):
+                    started.append(float(line.split()[1]))
+                    continue
+                if stream == "stderr" and line.startswith(METERS_MARKER):
+                    meters.update(json.loads(line[len(METERS_MARKER):]))
+                    continue
+                on_line(stream, line)
+            pipe.close()
+
+        readers = [
+            threading.Thread(target=pump, args=(process.stdout, "stdout"), daemon=True),
+            threading.Thread(target=pump, args=(process.stderr, "stderr"), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+
+        deadline = spawned + timeout
+        try:
+            while True:
+                try:
+                    process.wait(timeout=CANCEL_POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    cancelled = cancel_event is not None and cancel_event.is_set()
+                    if cancelled or time.time() >= deadline:
+                        kill_process_tree(process.pid)
+                        process.wait()
+                        return {
+                            "returncode": -9,
+                            "timed_out": not cancelled, "cancelled": cancelled,
+                            "error": "Cancelled" if cancelled else f"Timed out after {timeout}s",
+                            "run_seconds": time.time() - spawned
+                        }
+        finally:
+            for reader in readers:
+                reader.join(timeout=5)
+            with self._lock:
+                self._subprocesses.discard(process.pid)
+
+        finished = time.time()
+        started = started[0] if started else spawned
+        result = {
+            "returncode": process.returncode,
+            "error": None,
+            "startup_seconds": started - spawned,
+            "run_seconds": finished - started
+        }
+        result.update(meters)
+        return result
+
+    def get_metrics(self):
+        """Get run counts, average per-job startup time, host boot time and script host details
+
+        avg_startup_seconds includes host boots, which are also reported on
+        their own as host_boots and host_boot_seconds.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            hosts = [
+                {
+                    "pid": host.process.pid if host.is_alive() else None,
+                    "boot_seconds": round(host.boot_seconds, 3) if host.boot_seconds else None,
+                    "preload_seconds": round(host.preload_seconds, 3) if host.preload_seconds else None,
+                    "jobs_run": host.jobs_run
+                }
+                for host in self._all_hosts
+            ]
+        runs = stats["runs"]
+        return {
+            "mode": self.mode,
+            "runs": runs,
+            "timeouts": stats["timeouts"],
+            "cancelled": stats["cancelled"],
+            "avg_startup_seconds": round(stats["startup_seconds"] / runs, 4) if runs else None,
+            "avg_run_seconds": round(stats["run_seconds"] / runs, 4) if runs else None,
+            "host_boots": stats["host_boots"],
+            "host_boot_seconds": round(stats["host_boot_seconds"], 3),
+            "hosts": hosts
+        }
+
+    def shutdown(self):
+        """Stop every script host process"""
+        with self._lock:
+            hosts = list(self._all_hosts)
+        for host in hosts:
+            host.stop()
+
+    def reap_orphans(self):
+        """Kill script-started processes (Chrome, chromedriver...) that outlived their script
+
+        A process is an orphan if it carries this runner's OWNER_ENV marker, or
+        that of a runner that is no longer alive, but no live script host or
+        script subprocess is among its ancestors.
+        """
+        with self._lock:
+            roots = {host.process.pid for host in self._all_hosts if host.is_alive()}
+            roots |= self._subprocesses
+        own_pid = os.getpid()
+        killed = 0
+
+        for process in psutil.process_iter(["pid", "name"]):
+            if process.pid in roots or process.pid == own_pid:
+                continue
+            try:
+                owner = process.environ().get(OWNER_ENV)
+                if owner is None:
+                    continue
+                if int(owner) != own_pid and psutil.pid_exists(int(owner)):
+                    continue  # another live runner's process
+                if any(parent.pid in roots for parent in process.parents()):
+                    continue
+                process.kill()
+                killed += 1
+                print(f"[WARNING] Killed orphaned script process {process.pid} ({process.info['name']})")
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, ValueError):
+                continue
+        return killed
@@ -0,0 +1,78 @@
+import os
+from datetime import datetime, time, timedelta, timezone
+
+# NSE runs on IST, which has no daylight saving, so a fixed offset is exact
+EXCHANGE_TZ = timezone(timedelta(hours=5, minutes=30), "IST")
+
+DEFAULT_HOLIDAYS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'extras', 'trading_holidays.txt'
+)
+
+
+def load_holidays(path):
+    """Read exchange holidays from a file of 'YYYY-MM-DD description' lines
+
+    Blank lines and lines starting with # are ignored.
+    """
+    holidays = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            day, _, name = line.partition(" ")
+            holidays[datetime.strptime(day, "%Y-%m-%d").date()] = name.strip()
+    return holidays
+
+
+class TradingCalendar:
+    """NSE trading days from a local holiday list, and when each day's files are published
+
+    Weekends and listed holidays are non-trading days. A session's exchange
+    files (bhavcopy, bulk/block deals) are expected files_ready_at, exchange
+    time, on the session day.
+    """
+
+    def __init__(self, holidays_file=DEFAULT_HOLIDAYS_FILE, files_ready_at="18:30"):
+        self.holidays_file = holidays_file
+        self.holidays = load_holidays(holidays_file)
+        self.files_ready_at = time.fromisoformat(files_ready_at)
+
+    def now(self):
+        return datetime.now(EXCHANGE_TZ)
+
+    def covers(self, day):
+        """Whether the holiday list has entries for day's year"""
+        return any(holiday.year == day.year for holiday in self.holidays)
+
+    def is_trading_day(self, day=None):
+        day = day or self.now().date()
+        return day.weekday() < 5 and day not in self.holidays
+
+    def holiday_name(self, day):
+        return self.holidays.get(day)
+
+    def files_ready_time(self, day):
+        """When the exchange files for session day are expected, as an aware datetime"""
+        return datetime.combine(day, self.files_ready_at, tzinfo=EXCHANGE_TZ)
+
+    def previous_trading_day(self, day):
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def latest_sessions(self, count, now=None):
+        """The last count trading days whose files are expected to be published by now, newest first"""
+        now = (now or self.now()).astimezone(EXCHANGE_TZ)
+        day = now.date()
+        if not (self.is_trading_day(day) and now >= self.files_ready_time(day)):
+            day = self.previous_trading_day(day)
+        sessions = [day]
+        while len(sessions) < count:
+            sessions.append(self.previous_trading_day(sessions[-1]))
+        return sessions
+
+    def last_files_ready(self, now=None):
+        """When the most recently published session's files were expected"""
+        return self.files_ready_time(self.latest_sessions(1, now)[0])
@@ -0,0 +1,63 @@
+import time
+import threading
+
+
+class ScriptWatchdog:
+    """Leader-side watchdog for running refresh jobs
+
+    Relays cancellation requests stored in refresh_jobs to the jobs running in
+    this process, and periodically kills Chrome/chromedriver and other script
+    processes that outlived the script that started them.
+    """
+
+    def __init__(self, script_runner, job_service, owner, on_cancel, interval=5, orphan_sweep_interval=60):
+        self.script_runner = script_runner
+        self.job_service = job_service
+        self.owner = owner
+        self.on_cancel = on_cancel
+        self.interval = interval
+        self.orphan_sweep_interval = orphan_sweep_interval
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_sweep = 0.0
+
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._last_sweep = 0.0
+        self._thread = threading.Thread(target=self._run, name="script-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval + 5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_cancellations()
+            if time.time() - self._last_sweep >= self.orphan_sweep_interval:
+                self.sweep_orphans()
+            self._stop.wait(self.interval)
+
+    def check_cancellations(self):
+        try:
+            job_ids = self.job_service.get_cancel_requests(self.owner)
+        except Exception as e:
+            print(f"[ERROR] Watchdog could not read cancellation requests: {str(e)}")
+            return
+        for job_id in job_ids:
+            self.on_cancel(job_id)
+
+    def sweep_orphans(self):
+        self._last_sweep = time.time()
+        try:
+            killed = self.script_runner.reap_orphans()
+        except Exception as e:
+            print(f"[ERROR] Watchdog orphan sweep failed: {str(e)}")
+            return
+        if killed:
+            print(f"[WARNING] Watchdog killed {killed} orphaned script process(es)")
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Tests import the app modules (config, services, routes) and the scraper
+# scripts (python/) the same way the app and the script runner do
+ENAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ENAM_DIR, os.path.join(ENAM_DIR, "python")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,128 @@
+import pytest
+
+pytest.importorskip("psutil")
+
+from scrapers import admission as admission_module
+from scrapers.admission import AdmissionController
+from scrapers.driver_pool import DriverPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module.time, "time", clock.time)
+    monkeypatch.setattr(admission_module.time, "sleep", clock.sleep)
+    monkeypatch.setattr(admission_module.gc, "collect", lambda: 0)
+    return clock
+
+
+def controller(readings, **kwargs):
+    """An admission controller whose headroom checks return readings in turn (the last one repeats)"""
+    ctl = AdmissionController(poll_interval=5, settle_seconds=0, **kwargs)
+    readings = list(readings)
+    ctl.headroom = lambda: readings.pop(0) if len(readings) > 1 else readings[0]
+    return ctl
+
+
+def test_first_session_is_admitted_without_checking(clock):
+    ctl = controller([(False, 99.0, 99.0)])
+    ctl.admit(lambda: 0)
+    assert ctl.waits == 0
+
+
+def test_waits_for_headroom(clock):
+    ctl = controller([(False, 95.0, 50.0), (False, 90.0, 50.0), (True, 40.0, 50.0)])
+    ctl.admit(lambda: 2)
+    assert ctl.waits == 1
+    assert ctl.wait_seconds == 10
+
+
+def test_proceeds_once_nothing_else_is_running(clock, capsys):
+    running = iter([1, 1, 0])
+    ctl = controller([(False, 95.0, 90.0)])
+    ctl.admit(lambda: next(running))
+    assert "no other browser is running" in capsys.readouterr().out
+
+
+def test_wait_is_bounded(clock):
+    ctl = controller([(False, 95.0, 90.0)], max_wait=30)
+    with pytest.raises(RuntimeError, match="after 30s"):
+        ctl.admit(lambda: 3)
+    assert ctl.refused == 1
+    assert ctl.wait_seconds == 30
+
+
+def test_settle_time_between_admissions(clock):
+    ctl = AdmissionController(settle_seconds=3)
+    ctl.headroom = lambda: (True, 10.0, 10.0)
+    ctl.admit(lambda: 0)
+    ctl.admit(lambda: 1)
+    assert clock.now == 1003.0
+
+
+class FakeDriver:
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script):
+        return 1
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        pass
+
+
+class RecordingAdmission:
+    waits = refused = 0
+
+    def __init__(self):
+        self.calls = []
+
+    def admit(self, running):
+        self.calls.append(running())
+
+
+def test_pool_admits_only_new_browsers():
+    admission = RecordingAdmission()
+    pool = DriverPool(FakeDriver, size=2, max_rss_mb=0, admission=admission)
+
+    first = pool.acquire()
+    second = pool.acquire()
+    assert admission.calls == [0, 1]
+
+    pool.release(first)
+    reused = pool.acquire()
+    assert reused is first
+    assert admission.calls == [0, 1]
+    assert pool.metrics["drivers_started"] == 2
+
+    pool.release(second)
+    pool.release(reused)
+    assert pool.in_use() == 0
+
+
+def test_refused_admission_frees_the_slot():
+    class Refusing:
+        waits = refused = 0
+
+        def admit(self, running):
+            raise RuntimeError("no headroom")
+
+    pool = DriverPool(FakeDriver, size=1, admission=Refusing())
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+    assert pool.in_use() == 0
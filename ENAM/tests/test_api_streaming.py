@@ -0,0 +1,41 @@
+import json
+import pytest
+
+flask = pytest.importorskip("flask")
+pytest.importorskip("psycopg2")
+pytest.importorskip("apscheduler")
+
+from routes.api_routes import _stream_json_array
+
+
+@pytest.fixture
+def app():
+    app = flask.Flask(__name__)
+    app.config["API_STREAM_CONFIG"] = {"itersize": 2}
+    app.config["API_CACHE_CONFIG"] = {"max_body_bytes": 1024 * 1024, "max_entries": 10}
+    with app.app_context():
+        yield app
+
+
+def failing_rows(count):
+    for i in range(count):
+        yield {"id": i}
+    raise RuntimeError("connection lost")
+
+
+def test_complete_stream_is_a_json_array(app):
+    body = "".join(_stream_json_array([{"id": 1}, {"id": 2}, {"id": 3}], ("news", ()), "etag"))
+    assert json.loads(body) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_failure_before_any_chunk_is_an_error_object(app):
+    body = "".join(_stream_json_array(failing_rows(1), ("news", ()), "etag"))
+    assert json.loads(body) == {"error": "Streaming news failed: connection lost"}
+
+
+def test_failure_mid_stream_never_parses_as_a_result(app):
+    body = "".join(_stream_json_array(failing_rows(5), ("news", ()), "etag"))
+    with pytest.raises(ValueError):
+        json.loads(body)
+    assert body.rstrip().endswith('{"error": "Streaming news failed: connection lost"}') or \
+        body.rstrip().endswith('{"error":"Streaming news failed: connection lost"}')
@@ -0,0 +1,104 @@
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+from html import escape
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("selenium")
+pytest.importorskip("bs4")
+pytest.importorskip("psutil")
+
+from scrapers import company_data
+from scrapers.nse_client import NSEQuoteClient, DEFAULT_FIXTURES_DIR
+
+
+def test_convert_nse_datetime():
+    assert company_data.convert_nse_datetime("18-Oct-2026 19:02:41") == datetime(2026, 10, 18, 19, 2, 41)
+    assert company_data.convert_nse_datetime("not a date") is None
+    assert company_data.convert_nse_datetime(None) is None
+
+
+def test_rows_without_time_are_dropped():
+    rows = [
+        ["ABC", "Board Meeting", "text", None, datetime(2026, 10, 18, 19, 2, 41)],
+        ["ABC", "Board Meeting", "text", None, None]
+    ]
+    assert company_data.drop_untimed_rows("announcements", rows) == rows[:1]
+
+
+def test_append_unique_rows_skips_db_when_no_row_has_a_time(monkeypatch):
+    def no_connection():
+        raise AssertionError("no rows should reach the database")
+    monkeypatch.setattr(company_data, "get_db_connection", no_connection)
+    company_data.append_unique_rows("announcements", [["ABC", "s", "a", None, None]])
+
+
+def test_normalize_insider_row():
+    row = ["ABC", "7(2)", "X", "Promoter", "1,000", "12,345.555", "Buy", None, None]
+    normalized = company_data.normalize_insider_row(row)
+    assert normalized[4] == 1000
+    assert normalized[5] == Decimal("12345.56")
+    assert company_data.normalize_insider_row(["ABC", "", "", "", "-", "Nil", "", None, None])[4:6] == [None, None]
+
+
+def test_db_pool_never_opens_more_than_its_size(monkeypatch):
+    opened = []
+    monkeypatch.setattr(company_data, "connect_db", lambda: opened.append(object()) or opened[-1])
+    monkeypatch.setattr(company_data, "_db_conn_pool", [])
+    monkeypatch.setattr(company_data, "_db_slots", company_data.BoundedSemaphore(company_data.DB_POOL_SIZE))
+    monkeypatch.setattr(company_data, "DB_POOL_TIMEOUT", 0.05)
+
+    borrowed = [company_data.get_db_connection() for _ in range(company_data.DB_POOL_SIZE)]
+    with pytest.raises(RuntimeError, match="No database connection free"):
+        company_data.get_db_connection()
+    assert len(opened) == company_data.DB_POOL_SIZE
+
+    company_data.return_db_connection(borrowed.pop())
+    assert company_data.get_db_connection() in opened
+    assert len(opened) == company_data.DB_POOL_SIZE
+
+
+
+def load_fixture(name):
+    with open(os.path.join(DEFAULT_FIXTURES_DIR, name), encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("data", []) if isinstance(data, dict) else data
+
+
+def quote_page_table(table_id, rows):
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f'<div id="{table_id}"><table><tbody>{body}</tbody></table></div>'
+
+
+def link(href):
+    return f'<a href="{escape(href)}">PDF</a>' if href else ""
+
+
+def test_api_and_selenium_rows_agree_for_the_same_filings():
+    # The quote page renders these tables from the same records the API
+    # returns; both paths must store the same subject and time for a filing,
+    # or the (stock, subject, time) conflict keys would not dedupe them
+    client = NSEQuoteClient(mode="replay")
+    announcements = load_fixture("announcements_INFY.json")
+    html = quote_page_table("corpAnnouncementTable", [
+        [escape(r["desc"]),
+         f'<span>{escape(r["attchmntText"] or "")}</span><a class="readMore">Read less</a>',
+         link(r["attchmntFile"]),
+         f'{r.get("an_dt") or r.get("sort_date") or "-"}<div>Exchange Disseminated Time</div>']
+        for r in announcements
+    ])
+    assert company_data.parse_announcements_table("INFY", html) == client.announcements("INFY")
+
+    trades = load_fixture("insider_trading_INFY.json")
+    html = quote_page_table("corpInsiderTradingTable", [
+        [r["anex"], escape(r["acqName"]), r["personCategory"], r["secAcq"], r["secVal"],
+         r["tdpTransactionType"], link(r["xbrl"]), r["date"]]
+        for r in trades
+    ])
+    selenium_rows = company_data.parse_insider_table("INFY", html)
+    api_rows = client.insider_trading("INFY")
+    assert [row[-1] for row in selenium_rows] == [row[-1] for row in api_rows]
+    assert ([company_data.normalize_insider_row(row) for row in selenium_rows]
+            == [company_data.normalize_insider_row(row) for row in api_rows])
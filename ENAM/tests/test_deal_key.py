@@ -0,0 +1,80 @@
+import hashlib
+import uuid
+from datetime import date
+from decimal import Decimal
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("selenium")
+pytest.importorskip("bs4")
+pytest.importorskip("psutil")
+
+from scrapers import bulk_block
+
+
+def sql_deal_key(source, deal_date, security_name, client_name, deal_type, quantity, price):
+    """The deal_key expression of extras/migrations/004_typed_deals_and_insider.sql, step by step
+
+    md5(concat_ws('|', coalesce(...), ...))::uuid over typed columns:
+    to_char(date, 'YYYY-MM-DD'), UPPER(TRIM(text)) (TRIM strips spaces only),
+    BIGINT::text and NUMERIC(14, 2)::text (always two decimals).
+    """
+    def text(value):
+        return "" if value is None else value.strip(" ").upper()
+
+    parts = [
+        source or "",
+        deal_date.strftime("%Y-%m-%d") if deal_date else "",
+        text(security_name),
+        text(client_name),
+        text(deal_type),
+        "" if quantity is None else str(int(quantity)),
+        "" if price is None else str(Decimal(price).quantize(Decimal("0.01")))
+    ]
+    return str(uuid.UUID(hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()))
+
+
+@pytest.mark.parametrize("row", [
+    ("NSE", date(2026, 10, 16), "Reliance Industries", "ABC Fund", "BUY", 150000, Decimal("1234.50")),
+    ("BSE", date(2026, 1, 2), "  tata steel ", " xyz capital  ", "sell", 1, Decimal("0.05")),
+    ("NSE", date(2026, 3, 31), "INFY", "Some Trust", "BUY", 10, Decimal("1500")),
+    ("NSE", None, None, None, None, None, None),
+])
+def test_python_key_matches_migration_key(row):
+    assert bulk_block.deal_key(*row) == sql_deal_key(*row)
+
+
+def test_normalized_rows_get_the_migration_key():
+    row = ["NSE", date(2026, 10, 16), "Reliance Industries", "ABC Fund", "BUY", "1,50,000", "1,234.5"]
+    normalized = bulk_block.normalize_deal_row(row)
+    assert normalized[5] == 150000
+    assert normalized[6] == Decimal("1234.50")
+    assert normalized[7] == sql_deal_key(*normalized[:7])
+
+
+def test_formatting_differences_share_a_key():
+    a = bulk_block.normalize_deal_row(["NSE", date(2026, 10, 16), "Reliance", "ABC Fund", "BUY", "150000", "1234.5"])
+    b = bulk_block.normalize_deal_row(["NSE", date(2026, 10, 16), "reliance ", "ABC Fund", "BUY", "1,50,000.00", "1234.50"])
+    assert a[7] == b[7]
+
+
+BSE_BULK_PAGE = """
+<html><body>
+<span name="ctl00_ContentPlaceHolder1_notedate">Deals as on 16/10/2026</span>
+<table name="ctl00_ContentPlaceHolder1_gvbulkdeals"><tbody>
+<tr><td>16/10/2026</td><td>500325</td><td>RELIANCE INDUSTRIES LTD</td><td>ABC FUND</td><td>B</td><td>1,50,000</td><td>1,234.50</td></tr>
+<tr><td colspan="7">No Records Found</td></tr>
+<tr><td>16/10/2026</td><td>500180</td><td>HDFC BANK</td></tr>
+<tr><td>not a date</td><td>532540</td><td>TCS</td><td>XYZ</td><td>S</td><td>10</td><td>3,000.00</td></tr>
+</tbody></table>
+</body></html>
+"""
+
+
+def test_bse_deal_pages_skip_short_and_undated_rows():
+    date_text, deals = bulk_block.parse_bse_deals(BSE_BULK_PAGE, "bulk")
+    assert date_text == "Deals as on 16/10/2026"
+    assert deals == [
+        ["BSE", date(2026, 10, 16), "RELIANCE INDUSTRIES LTD", "ABC FUND", "BUY", "1,50,000", "1,234.50"]
+    ]
+    assert bulk_block.normalize_deal_row(deals[0])[5:7] == [150000, Decimal("1234.50")]
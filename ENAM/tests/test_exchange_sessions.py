@@ -0,0 +1,118 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+
+import exchange_sessions
+from exchange_sessions import ExchangeSession, get_session
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeHTTP:
+    """Stands in for requests.Session, answering each URL with queued status codes"""
+
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(url)
+        queued = self.statuses.get(url, [])
+        return FakeResponse(queued.pop(0) if queued else 200)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+        slept = []
+
+        def time(self):
+            return self.now
+
+        def sleep(self, seconds):
+            self.slept.append(round(seconds, 3))
+            self.now += seconds
+
+    clock = Clock()
+    monkeypatch.setattr(exchange_sessions.time, "time", clock.time)
+    monkeypatch.setattr(exchange_sessions.time, "sleep", clock.sleep)
+    return clock
+
+
+def nse_session(http, **kwargs):
+    session = ExchangeSession("nse", **dict(exchange_sessions.EXCHANGES["nse"], **kwargs))
+    session.session = http
+    return session
+
+
+API = "https://www.nseindia.com/api/corporate-announcements"
+HOME = "https://www.nseindia.com/"
+
+
+def test_warms_up_once_while_cookies_are_fresh(clock):
+    http = FakeHTTP()
+    session = nse_session(http, cookie_ttl=1800)
+    session.get(API)
+    session.get(API)
+    assert http.calls == [HOME, API, API]
+    assert session.warmups == 1
+
+    clock.now += 1801
+    session.get(API)
+    assert http.calls[-2:] == [HOME, API]
+    assert session.warmups == 2
+
+
+def test_rejected_request_refreshes_cookies_and_retries_once(clock):
+    http = FakeHTTP({API: [403, 401]})
+    session = nse_session(http)
+    response = session.get(API)
+    assert response.status_code == 401
+    assert http.calls == [HOME, API, HOME, API]
+    assert session.warmups == 2
+
+
+def test_failed_cookie_refresh_returns_the_rejected_response(clock):
+    class HomeDown(FakeHTTP):
+        def request(self, method, url, **kwargs):
+            if url == HOME and HOME in self.calls:
+                self.calls.append(url)
+                raise requests.ConnectionError("home page unreachable")
+            return super().request(method, url, **kwargs)
+
+    http = HomeDown({API: [403]})
+    session = nse_session(http)
+    response = session.get(API)
+    assert response.status_code == 403
+    assert http.calls == [HOME, API, HOME]
+
+
+def test_requests_to_a_host_are_spaced(clock):
+    http = FakeHTTP()
+    session = nse_session(http)
+    for _ in range(3):
+        session.get(API)
+    # Home page and three API calls on www.nseindia.com, 0.35s apart
+    assert clock.slept == [0.35, 0.35, 0.35]
+
+
+def test_bse_needs_no_warm_up(clock):
+    http = FakeHTTP({"https://api.bseindia.com/x": [403]})
+    session = ExchangeSession("bse", **exchange_sessions.EXCHANGES["bse"])
+    session.session = http
+    assert session.get("https://api.bseindia.com/x").status_code == 403
+    assert http.calls == ["https://api.bseindia.com/x"]
+
+
+def test_one_session_per_exchange():
+    assert get_session("nse") is get_session("nse")
+    assert get_session("nse") is not get_session("bse")
+    with pytest.raises(ValueError):
+        get_session("mcx")
@@ -0,0 +1,44 @@
+from services.job_log_service import JobLogWriter
+
+
+class FlakyJobService:
+    def __init__(self, failures):
+        self.failures = failures
+        self.written = []
+
+    def append_log_lines(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.written.extend(rows)
+
+
+def test_failed_batch_is_written_on_the_next_flush():
+    service = FlakyJobService(failures=1)
+    writer = JobLogWriter(service, capacity=10)
+    writer.write_lines(1, ["a", "b"])
+
+    writer.flush()
+    assert service.written == []
+    writer.write(1, "c")
+    writer.flush()
+    assert service.written == [(1, "a"), (1, "b"), (1, "c")]
+
+
+def test_requeued_batch_keeps_within_capacity_and_counts_overflow():
+    service = FlakyJobService(failures=1)
+    writer = JobLogWriter(service, capacity=3, batch_size=3)
+    writer.write_lines(1, ["a", "b", "c", "d"])  # "a" is dropped
+
+    def append_while_failing(rows, append=service.append_log_lines):
+        if service.failures:
+            writer.write_lines(2, ["x", "y"])  # a script keeps printing meanwhile
+        append(rows)
+
+    service.append_log_lines = append_while_failing
+    writer.flush()
+    writer.flush()
+    assert service.written == [
+        (1, "[WARNING] 3 log line(s) dropped; the log buffer was full"),
+        (1, "d"), (2, "x"), (2, "y")
+    ]
@@ -0,0 +1,174 @@
+from contextlib import contextmanager
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("pandas")
+pytest.importorskip("apscheduler")
+
+from services.job_service import JobService
+
+
+class FakeJobTable:
+    """Just enough of refresh_jobs for enqueue's select-then-insert"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self, cursor_factory=None):
+        return self
+
+    def execute(self, sql, params):
+        if sql.strip().startswith("SELECT"):
+            kind, scopes = params
+            self.result = next(
+                (job for job in self.jobs
+                 if job["kind"] == kind and job["scope"] in scopes and job["status"] in ("queued", "running")),
+                None
+            )
+        else:
+            kind, scope, requested_by = params
+            active = [job for job in self.jobs
+                      if (job["kind"], job["scope"]) == (kind, scope) and job["status"] in ("queued", "running")]
+            self.result = None
+            if not active:
+                self.result = {"id": len(self.jobs) + 1, "kind": kind, "scope": scope,
+                               "status": "queued", "requested_by": requested_by}
+                self.jobs.append(self.result)
+
+    def fetchone(self):
+        return self.result
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    table = FakeJobTable()
+    service = JobService()
+
+    @contextmanager
+    def connection():
+        yield table
+
+    monkeypatch.setattr(service, "get_db_connection", connection)
+    service.table = table
+    return service
+
+
+def test_requests_of_the_same_scope_coalesce(jobs):
+    first, coalesced = jobs.enqueue("news", "api")
+    assert not coalesced
+    second, coalesced = jobs.enqueue("news", "api")
+    assert coalesced and second["id"] == first["id"]
+
+
+def test_full_refresh_does_not_join_a_due_only_job(jobs):
+    due, _ = jobs.enqueue("news", "scheduler", scope="due")
+    full, coalesced = jobs.enqueue("news", "api")
+    assert not coalesced
+    assert full["id"] != due["id"] and full["scope"] == "all"
+
+
+def test_due_refresh_joins_a_full_job(jobs):
+    full, _ = jobs.enqueue("news", "api")
+    due, coalesced = jobs.enqueue("news", "scheduler", scope="due")
+    assert coalesced and due["id"] == full["id"]
+
+
+def test_finished_jobs_are_not_joined(jobs):
+    first, _ = jobs.enqueue("data", "api")
+    first["status"] = "succeeded"
+    second, coalesced = jobs.enqueue("data", "api")
+    assert not coalesced and second["id"] != first["id"]
+
+
+def test_unknown_kind_and_scope_are_rejected(jobs):
+    with pytest.raises(ValueError):
+        jobs.enqueue("weather")
+    with pytest.raises(ValueError):
+        jobs.enqueue("news", scope="some")
+
+
+def test_job_logs_come_from_job_log_lines(jobs, monkeypatch):
+    class JobRow:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def cursor(self, cursor_factory=None):
+            return self
+
+        def execute(self, sql, params):
+            self.sql = sql
+
+        def fetchone(self):
+            assert "logs" not in self.sql
+            return {"id": 7, "kind": "data", "status": "running",
+                    "steps": {"volume": {"status": "succeeded"}, "tagging": {"status": "running"}}}
+
+    @contextmanager
+    def connection():
+        yield JobRow()
+
+    monkeypatch.setattr(jobs, "get_db_connection", connection)
+    monkeypatch.setattr(jobs, "get_log_tail", lambda job_id: [f"[INFO] line of job {job_id}"])
+
+    job = jobs.get_job(7)
+    assert job["progress"] == {"done": 1, "total": 2}
+    assert job["logs"] == ["[INFO] line of job 7"]
+
+
+def test_claim_conflict_on_running_kind_means_nothing_to_claim(jobs, monkeypatch):
+    from psycopg2 import errors
+
+    class ConcurrentClaim(FakeJobTable):
+        def execute(self, sql, params):
+            raise errors.UniqueViolation("idx_refresh_jobs_running_kind")
+
+    @contextmanager
+    def connection():
+        yield ConcurrentClaim()
+
+    monkeypatch.setattr(jobs, "get_db_connection", connection)
+    assert jobs.claim_next("leader") is None
+
+
+class RecordingJobs:
+    def __init__(self, unsuccessful):
+        self.unsuccessful = unsuccessful
+        self.finished = None
+
+    def get_unsuccessful_steps(self, job_id):
+        return self.unsuccessful
+
+    def finish(self, job_id, status, error=None):
+        self.finished = (status, error)
+
+
+class QuietLogs:
+    def flush(self):
+        pass
+
+
+@pytest.mark.parametrize("unsuccessful, expected", [
+    ({}, ("succeeded", None)),
+    ({"volume": "failed", "tagging": "skipped"},
+     ("failed", "Steps did not succeed: volume (failed), tagging (skipped)")),
+])
+def test_refresh_job_outcome_rolls_up_its_steps(unsuccessful, expected):
+    from services.scheduler_service import SchedulerService
+
+    scheduler = SchedulerService.__new__(SchedulerService)
+    scheduler._cancel_events = {}
+    scheduler.job_service = RecordingJobs(unsuccessful)
+    scheduler.job_logs = QuietLogs()
+    scheduler.run_all_data_scripts = lambda job_id: ["[ERROR] volume failed"]
+
+    scheduler._execute_refresh_job(7, "data")
+    assert scheduler.job_service.finished == expected
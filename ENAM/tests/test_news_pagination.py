@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("pandas")
+pytest.importorskip("apscheduler")
+
+from services.data_service import DataService
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        # Stands in for ORDER BY time DESC, id DESC with the keyset condition and LIMIT
+        sql, params = self.executed[-1]
+        rows = sorted(self.rows, key=lambda r: (r["time"], r["id"]), reverse=True)
+        if "(time, id) < (%s, %s)" in sql:
+            time_value, row_id = params[-3], params[-2]
+            position = (datetime.fromisoformat(time_value), row_id)
+            rows = [r for r in rows if (r["time"], r["id"]) < position]
+        return rows[:params[-1]]
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, cursor_factory=None):
+        return self._cursor
+
+
+@pytest.fixture
+def news_service(monkeypatch):
+    start = datetime(2026, 10, 17, 9, 0)
+    # Pairs of rows share a timestamp so the id tie-breaker matters
+    rows = [
+        {"id": i, "source": "S", "headline": f"h{i}", "link": None, "category": None,
+         "time": start + timedelta(minutes=i // 2)}
+        for i in range(1, 12)
+    ]
+    cursor = FakeCursor(rows)
+    service = DataService()
+
+    @contextmanager
+    def connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(service, "get_db_connection", connection)
+    service.fake_cursor = cursor
+    return service
+
+
+def test_pages_cover_every_row_once_in_order(news_service):
+    seen = []
+    before = None
+    while True:
+        page = news_service.get_news(before=before, limit=4)
+        seen.extend(item["id"] for item in page["items"])
+        before = page["next_cursor"]
+        if before is None:
+            break
+    assert seen == sorted(seen, key=lambda i: (i // 2, i), reverse=True)
+    assert sorted(seen) == list(range(1, 12))
+
+
+def test_last_page_has_no_cursor(news_service):
+    page = news_service.get_news(limit=11)
+    assert len(page["items"]) == 11
+    assert page["next_cursor"] is None
+
+
+def test_query_fetches_one_row_past_the_limit_without_offset(news_service):
+    news_service.get_news(limit=5)
+    sql, params = news_service.fake_cursor.executed[-1]
+    assert params[-1] == 6
+    assert "OFFSET" not in sql.upper()
+
+
+def test_cursor_round_trip(news_service):
+    when = datetime(2026, 10, 17, 9, 30, 15)
+    cursor = news_service._encode_news_cursor(when, 42)
+    assert "=" not in cursor
+    assert news_service._decode_news_cursor(cursor) == (str(when), 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", "MjAyNnx4"])
+def test_invalid_cursor_is_rejected(news_service, cursor):
+    with pytest.raises(ValueError, match="Invalid news cursor"):
+        news_service.get_news(before=cursor)
+
+
+@pytest.mark.parametrize("limit", [0, DataService.NEWS_MAX_LIMIT + 1])
+def test_limit_is_bounded(news_service, limit):
+    with pytest.raises(ValueError):
+        news_service.get_news(limit=limit)
+
+
+def test_search_escapes_like_wildcards(news_service):
+    news_service.get_news(q="50%_off", source="S", category="Markets")
+    sql, params = news_service.fake_cursor.executed[-1]
+    assert "source = %s" in sql and "category = %s" in sql
+    assert params[:3] == ["S", "Markets", "%50\\%\\_off%"]
@@ -0,0 +1,104 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+
+pytest.importorskip("requests")
+
+from scrapers import nse_client
+from scrapers.nse_client import NSEClientError, NSEQuoteClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def no_network(exchange):
+        raise AssertionError("replay mode must not open an NSE session")
+    monkeypatch.setattr(nse_client, "get_session", no_network)
+    return NSEQuoteClient(mode="replay")
+
+
+def test_announcement_rows(client):
+    rows = client.announcements("INFY")
+    assert rows[0] == [
+        "INFY",
+        "Outcome of Board Meeting",
+        "Infosys Limited has informed the Exchange regarding Board meeting held on October 16, 2026.",
+        "https://nsearchives.nseindia.com/corporate/INFY_16102026185512_Outcome.pdf",
+        datetime(2026, 10, 16, 18, 55, 12)
+    ]
+    # an_dt missing: sort_date is used instead
+    assert rows[1][4] == datetime(2026, 10, 14, 9, 15, 3)
+    # No parseable time at all
+    assert rows[2][4] is None
+
+
+def test_insider_trading_rows(client):
+    rows = client.insider_trading("INFY")
+    assert rows == [
+        ["INFY", "7(2)", "Salil Parekh", "Key Managerial Personnel", "25000", "38125000", "Buy",
+         "https://nsearchives.nseindia.com/corporate/xbrl/IT_5489321_15102026.xml",
+         datetime(2026, 10, 15, 17, 42)],
+        ["INFY", "7(2)", "Jayesh Sanghrajka", "Key Managerial Personnel", "1,200", "18,60,000", "Sell",
+         "https://nsearchives.nseindia.com/corporate/xbrl/IT_5471150_09102026.xml",
+         datetime(2026, 10, 9, 16, 5)]
+    ]
+
+
+def test_empty_responses(client):
+    assert client.fetch("NEWCO") == ([], [])
+
+
+def test_fetch_many_reports_missing_fixtures_per_symbol(client):
+    results = list(client.fetch_many(["INFY", "MISSING", "NEWCO"]))
+    assert [r[0] for r in results] == ["INFY", "MISSING", "NEWCO"]
+    assert results[0][3] is None and len(results[0][1]) == 3 and len(results[0][2]) == 2
+    assert isinstance(results[1][3], NSEClientError)
+    assert results[2][1:] == ([], [], None)
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        NSEQuoteClient(mode="offline")
+
+
+def test_replayed_rows_reach_the_database_normalized(monkeypatch):
+    pytest.importorskip("psycopg2")
+    pytest.importorskip("selenium")
+    pytest.importorskip("bs4")
+    pytest.importorskip("psutil")
+    from scrapers import company_data
+
+    monkeypatch.setattr(company_data, "NSE_CLIENT_MODE", "replay")
+    monkeypatch.setattr(nse_client, "get_session", lambda exchange: pytest.fail("network used in replay mode"))
+    written = {}
+
+    class FakeConnection:
+        def cursor(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def commit(self):
+            pass
+
+    def capture(cur, query, rows):
+        table = "announcements" if "INTO announcements" in query else "insider_trading"
+        written.setdefault(table, []).extend(rows)
+
+    monkeypatch.setattr(company_data, "get_db_connection", FakeConnection)
+    monkeypatch.setattr(company_data, "return_db_connection", lambda conn: None)
+    monkeypatch.setattr(company_data, "execute_values", capture)
+
+    failed = company_data.scrape_companies_api(["INFY", "MISSING"])
+
+    assert failed == ["MISSING"]
+    # The announcement without a time is not inserted
+    assert [row[1] for row in written["announcements"]] == [
+        "Outcome of Board Meeting", "Analysts/Institutional Investor Meet/Con. Call Updates"
+    ]
+    assert [row[4:6] for row in written["insider_trading"]] == [
+        [25000, Decimal("38125000.00")], [1200, Decimal("1860000.00")]
+    ]
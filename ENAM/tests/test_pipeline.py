@@ -0,0 +1,76 @@
+import threading
+import pytest
+
+from config import Config
+from services.pipeline import Pipeline, PipelineStage
+
+
+def stages(*edges):
+    return [PipelineStage(name, f"{name}.py", after=after) for name, after in edges]
+
+
+def test_configured_pipeline_orders_dependencies_first():
+    pipeline = Pipeline.from_config(Config.DATA_PIPELINE)
+    order = [stage.name for stage in pipeline.order]
+    assert sorted(order) == sorted(entry["name"] for entry in Config.DATA_PIPELINE)
+    for stage in pipeline.order:
+        for name in stage.after:
+            assert order.index(name) < order.index(stage.name)
+    assert "bulk_block" in pipeline.stages["volume"].after
+
+
+def test_unknown_dependency_and_cycles_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline(stages(("a", ["missing"])))
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline(stages(("a", ["b"]), ("b", ["a"])))
+    with pytest.raises(ValueError, match="unique"):
+        Pipeline(stages(("a", []), ("a", [])))
+
+
+def test_stages_start_only_after_their_dependencies_succeed():
+    pipeline = Pipeline(stages(("fetch", []), ("report", ["fetch"]), ("other", [])))
+    finished = []
+    lock = threading.Lock()
+
+    def execute(stage):
+        with lock:
+            if stage.name == "report":
+                assert "fetch" in finished
+            finished.append(stage.name)
+        return [f"[INFO] {stage.name} done"]
+
+    logs, results = pipeline.run(execute, max_workers=3)
+    assert {name: r["status"] for name, r in results.items()} == {
+        "fetch": "succeeded", "report": "succeeded", "other": "succeeded"
+    }
+    assert len(logs) == 3
+
+
+def test_failed_stage_skips_everything_after_it():
+    pipeline = Pipeline(stages(("fetch", []), ("report", ["fetch"]), ("tag", ["report"]), ("other", [])))
+    skipped = []
+
+    def execute(stage):
+        if stage.name == "fetch":
+            return ["[ERROR] fetch failed"]
+        return [f"[INFO] {stage.name} done"]
+
+    logs, results = pipeline.run(execute, on_skipped=lambda stage, reason: skipped.append(stage.name))
+    assert results["fetch"]["status"] == "failed"
+    assert results["report"]["status"] == "skipped"
+    assert results["tag"]["status"] == "skipped"
+    assert results["other"]["status"] == "succeeded"
+    assert skipped == ["report", "tag"]
+
+
+def test_raising_stage_counts_as_failed():
+    pipeline = Pipeline(stages(("fetch", []), ("report", ["fetch"])))
+
+    def execute(stage):
+        raise RuntimeError("boom")
+
+    logs, results = pipeline.run(execute)
+    assert results["fetch"]["status"] == "failed"
+    assert results["report"]["status"] == "skipped"
+    assert "[ERROR] fetch failed: boom" in logs
@@ -0,0 +1,96 @@
+import sys
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("selenium")
+pytest.importorskip("bs4")
+pytest.importorskip("psutil")
+
+from config import Config
+from services import portfolio_service
+from services.portfolio_service import PortfolioService
+
+
+class InlineThread:
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+@pytest.fixture
+def company_data(monkeypatch):
+    # Import the scraper the way the web app must: without the scripts directory on sys.path
+    monkeypatch.setattr(sys, "path", [p for p in sys.path if p != Config.PYTHON_SCRIPTS_DIR])
+    for name in [name for name in sys.modules if name == "scrapers" or name.startswith("scrapers.")]:
+        monkeypatch.delitem(sys.modules, name)
+    module = PortfolioService()._import_company_scraper()
+    monkeypatch.setattr(module, "init_db_pool", lambda: None)
+    monkeypatch.setattr(module, "close_all_connections", lambda: None)
+    return module
+
+
+def test_apply_changes_scrapes_new_symbols(company_data, monkeypatch):
+    scraped, marked = [], []
+    monkeypatch.setattr(company_data, "scrape_companies", lambda symbols: scraped.append(sorted(symbols)) or [])
+    monkeypatch.setattr(portfolio_service.threading, "Thread", InlineThread)
+    service = PortfolioService()
+    monkeypatch.setattr(service, "set_last_updated", marked.append)
+    service.temp_list.update({"NEWCO", "OTHERCO"})
+
+    result = service.apply_changes()
+
+    assert sorted(result["symbols"]) == ["NEWCO", "OTHERCO"]
+    assert scraped == [["NEWCO", "OTHERCO"]]
+    assert marked == ["company"]
+    assert service.temp_list == set()
+
+
+
+def test_companies_that_were_not_scraped_stay_pending(company_data, monkeypatch):
+    monkeypatch.setattr(company_data, "scrape_companies", lambda symbols: ["OTHERCO"])
+    monkeypatch.setattr(portfolio_service.threading, "Thread", InlineThread)
+    service = PortfolioService()
+    monkeypatch.setattr(service, "set_last_updated", lambda key: None)
+    service.temp_list.update({"NEWCO", "OTHERCO"})
+
+    service.apply_changes()
+
+    assert service.temp_list == {"OTHERCO"}
+
+def test_failed_scrape_keeps_symbols_pending(company_data, monkeypatch):
+    def fail(symbols):
+        raise RuntimeError("NSE unreachable")
+
+    monkeypatch.setattr(company_data, "scrape_companies", fail)
+    monkeypatch.setattr(portfolio_service.threading, "Thread", InlineThread)
+    service = PortfolioService()
+    service.temp_list.add("NEWCO")
+
+    service.apply_changes()
+
+    assert service.temp_list == {"NEWCO"}
+
+
+def test_scrape_companies_closes_its_browser_pool(company_data, monkeypatch):
+    pools = []
+
+    class FakePool:
+        def __init__(self, *args, **kwargs):
+            self.closed = False
+            pools.append(self)
+
+        def close(self):
+            self.closed = True
+
+    def scrape(company, pool):
+        raise RuntimeError("page did not load")
+
+    monkeypatch.setattr(company_data, "SCRAPE_MODE", "selenium")
+    monkeypatch.setattr(company_data, "DriverPool", FakePool)
+    monkeypatch.setattr(company_data, "scrape_company_data", scrape)
+
+    assert company_data.scrape_companies(["NEWCO"]) == ["NEWCO"]
+
+    assert len(pools) == 1 and pools[0].closed
@@ -0,0 +1,77 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("psycopg2")
+pytest.importorskip("pandas")
+pytest.importorskip("apscheduler")
+
+from services.script_runner import ScriptRunner
+
+BODY = b"x" * 4096
+
+
+class FixedBodyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def runner(tmp_path):
+    return ScriptRunner({"SCRIPT_RUNNER_CONFIG": {
+        "mode": "subprocess", "timeout": 60, "max_jobs_per_host": 5, "preload": [], "hosts": 1
+    }, "PYTHON_SCRIPTS_DIR": str(tmp_path)})
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), FixedBodyHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/"
+    httpd.shutdown()
+
+
+def test_subprocess_runs_report_bytes_downloaded(runner, server, tmp_path):
+    pytest.importorskip("requests")
+    script = tmp_path / "download.py"
+    script.write_text(f"import requests\nrequests.get({server!r})\nrequests.get({server!r})\nprint('done')\n")
+    lines = []
+
+    result = runner.run(str(script), on_line=lambda stream, line: lines.append((stream, line)))
+
+    assert result["returncode"] == 0
+    assert result["bytes_downloaded"] == 2 * len(BODY)
+    assert result["rows_inserted"] == {}
+    assert lines == [("stdout", "done")]
+
+
+def test_failed_subprocess_runs_still_report_meters(runner, tmp_path):
+    script = tmp_path / "fail.py"
+    script.write_text("print('failing')\nraise SystemExit(2)\n")
+    lines = []
+
+    result = runner.run(str(script), on_line=lambda stream, line: lines.append((stream, line)))
+
+    assert result["returncode"] == 2
+    assert result["rows_inserted"] == {}
+    assert result["bytes_downloaded"] == 0
+    assert lines == [("stdout", "failing")]
+
+
+def test_killed_subprocess_runs_report_no_meters(runner, tmp_path):
+    script = tmp_path / "slow.py"
+    script.write_text("import time\ntime.sleep(20)\n")
+
+    result = runner.run(str(script), timeout=1, on_line=lambda stream, line: None)
+
+    assert result["timed_out"]
+    assert result["rows_inserted"] is None
+    assert result["bytes_downloaded"] is None
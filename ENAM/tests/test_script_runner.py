@@ -0,0 +1,114 @@
+import threading
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("psycopg2")
+pytest.importorskip("pandas")
+pytest.importorskip("apscheduler")
+
+from services.script_runner import ScriptHost, ScriptRunner
+
+
+class FakeConn:
+    def __init__(self, result):
+        self.result = result
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def poll(self, timeout=None):
+        return True
+
+    def recv(self):
+        return ("result", dict(self.result))
+
+
+class FakeProcess:
+    pid = 4242
+
+    def is_alive(self):
+        return True
+
+
+def fake_host(monkeypatch, boot_seconds=2.5):
+    host = ScriptHost([], "/scripts")
+
+    def start():
+        host.process = FakeProcess()
+        host.conn = FakeConn({"returncode": 0, "error": None, "startup_seconds": 0.01, "run_seconds": 1.0})
+        host.boot_seconds = boot_seconds
+
+    monkeypatch.setattr(host, "start", start)
+    return host
+
+
+def test_first_job_after_a_boot_is_charged_the_boot(monkeypatch):
+    host = fake_host(monkeypatch)
+    first = host.run("/scripts/a.py", [], timeout=10, on_line=None)
+    assert first["host_boot_seconds"] == 2.5
+    assert first["startup_seconds"] == pytest.approx(2.51)
+
+    second = host.run("/scripts/a.py", [], timeout=10, on_line=None)
+    assert "host_boot_seconds" not in second
+    assert second["startup_seconds"] == pytest.approx(0.01)
+
+
+def test_runner_metrics_report_host_boots(monkeypatch):
+    runner = ScriptRunner({"SCRIPT_RUNNER_CONFIG": {
+        "mode": "inprocess", "timeout": 10, "max_jobs_per_host": 5, "preload": [], "hosts": 1
+    }, "PYTHON_SCRIPTS_DIR": "/scripts"})
+    host = fake_host(monkeypatch)
+    runner._all_hosts.append(host)
+    runner._idle_hosts.put(host)
+
+    runner.run("/scripts/a.py")
+    runner.run("/scripts/b.py")
+
+    metrics = runner.get_metrics()
+    assert metrics["runs"] == 2
+    assert metrics["host_boots"] == 1
+    assert metrics["host_boot_seconds"] == 2.5
+    assert metrics["avg_startup_seconds"] == pytest.approx((2.51 + 0.01) / 2)
+
+
+
+@pytest.mark.parametrize("cancel, timeout, expected", [(True, 10, "cancelled"), (False, 0.2, "timed_out")])
+def test_waiting_for_a_busy_host_stops_on_cancel_or_timeout(monkeypatch, cancel, timeout, expected):
+    monkeypatch.setattr("services.script_runner.CANCEL_POLL_INTERVAL", 0.05)
+    runner = ScriptRunner({"SCRIPT_RUNNER_CONFIG": {
+        "mode": "inprocess", "timeout": 10, "max_jobs_per_host": 5, "preload": [], "hosts": 1
+    }, "PYTHON_SCRIPTS_DIR": "/scripts"})
+    host = fake_host(monkeypatch)
+    runner._idle_hosts.put(host)
+    cancel_event = threading.Event()
+    if cancel:
+        cancel_event.set()
+
+    runner._host_slots.acquire()  # another job holds the only host
+    result = runner.run("/scripts/a.py", timeout=timeout, cancel_event=cancel_event)
+
+    assert result[expected] and result["returncode"] == -9
+    assert host.conn is None  # the script was never sent to a host
+
+
+def test_preloaded_script_modules_keep_state_across_runs(tmp_path):
+    (tmp_path / "shared.py").write_text("runs = []\n")
+    (tmp_path / "helper.py").write_text("runs = []\n")
+    script = tmp_path / "count.py"
+    script.write_text(
+        "import shared, helper\n"
+        "shared.runs.append(1)\n"
+        "helper.runs.append(1)\n"
+        "print(len(shared.runs), len(helper.runs))\n"
+    )
+    host = ScriptHost(["shared"], str(tmp_path))
+    lines = []
+    try:
+        for _ in range(2):
+            result = host.run(str(script), [], timeout=60, on_line=lambda stream, line: lines.append(line))
+            assert result["returncode"] == 0
+    finally:
+        host.stop()
+    # The preloaded module is kept; the script's own helper is imported fresh each run
+    assert lines == ["1 1", "2 1"]
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+
+from services.trading_calendar import EXCHANGE_TZ, DEFAULT_HOLIDAYS_FILE, TradingCalendar, load_holidays
+
+
+@pytest.fixture
+def calendar(tmp_path):
+    holidays = tmp_path / "holidays.txt"
+    holidays.write_text(
+        "# NSE holidays\n"
+        "\n"
+        "2026-10-02 Mahatma Gandhi Jayanti\n"
+        "2026-10-20 Diwali Laxmi Pujan\n"
+    )
+    return TradingCalendar(str(holidays), files_ready_at="18:30")
+
+
+def ist(*args):
+    return datetime(*args, tzinfo=EXCHANGE_TZ)
+
+
+def test_load_holidays_skips_comments_and_blank_lines(calendar):
+    assert calendar.holidays == {
+        date(2026, 10, 2): "Mahatma Gandhi Jayanti",
+        date(2026, 10, 20): "Diwali Laxmi Pujan"
+    }
+
+
+def test_weekends_and_holidays_are_not_trading_days(calendar):
+    assert calendar.is_trading_day(date(2026, 10, 16))        # Friday
+    assert not calendar.is_trading_day(date(2026, 10, 17))    # Saturday
+    assert not calendar.is_trading_day(date(2026, 10, 18))    # Sunday
+    assert not calendar.is_trading_day(date(2026, 10, 20))    # Diwali, a Tuesday
+    assert calendar.holiday_name(date(2026, 10, 20)) == "Diwali Laxmi Pujan"
+
+
+def test_previous_trading_day_skips_weekends_and_holidays(calendar):
+    assert calendar.previous_trading_day(date(2026, 10, 19)) == date(2026, 10, 16)
+    assert calendar.previous_trading_day(date(2026, 10, 21)) == date(2026, 10, 19)
+    assert calendar.previous_trading_day(date(2026, 10, 5)) == date(2026, 10, 1)
+
+
+def test_latest_sessions_wait_for_the_files(calendar):
+    # Before 18:30 IST the day's files are not out yet
+    assert calendar.latest_sessions(1, ist(2026, 10, 19, 18, 29)) == [date(2026, 10, 16)]
+    assert calendar.latest_sessions(1, ist(2026, 10, 19, 18, 30)) == [date(2026, 10, 19)]
+    assert calendar.latest_sessions(3, ist(2026, 10, 21, 20, 0)) == [
+        date(2026, 10, 21), date(2026, 10, 19), date(2026, 10, 16)
+    ]
+
+
+def test_latest_sessions_convert_to_exchange_time(calendar):
+    # 13:15 UTC is 18:45 IST, after the files are ready
+    assert calendar.latest_sessions(1, datetime(2026, 10, 19, 13, 15, tzinfo=timezone.utc)) == [date(2026, 10, 19)]
+
+
+def test_last_files_ready(calendar):
+    ready = calendar.last_files_ready(ist(2026, 10, 18, 12, 0))
+    assert ready == ist(2026, 10, 16, 18, 30)
+    assert ready.utcoffset() == timedelta(hours=5, minutes=30)
+
+
+def test_covers_only_listed_years(calendar):
+    assert calendar.covers(date(2026, 1, 1))
+    assert not calendar.covers(date(2027, 1, 1))
+
+
+def test_shipped_holiday_list_parses():
+    assert load_holidays(DEFAULT_HOLIDAYS_FILE)